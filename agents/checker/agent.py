@@ -1,6 +1,10 @@
 import json
 import re
 from typing import Dict, List
+from agents.checker.index import TermIndex
+from agents.checker.symbols import SymbolTable
+from agents.coder.parallel import function_names
+from utils.artifacts import parse_files
 
 
 class RequirementCheckerAgent:
@@ -20,7 +24,9 @@ class RequirementCheckerAgent:
         code: output of Agent 2 (parsed JSON)
         """
 
-        requirements = self._extract_requirements(plan)
+        # ---- NORMALIZE PLAN INPUT ----
+        if hasattr(plan, "model_dump"):
+            plan = plan.model_dump()
 
             # ---- NORMALIZE CODE INPUT ----
         if hasattr(code, "dict"):
@@ -31,55 +37,123 @@ class RequirementCheckerAgent:
 
         files = code.get("files", {})
 
+        # Tokenize and parse every file once; each requirement is answered
+        # from the symbol table (code structure) or the term index (free text)
+        parsed = parse_files(files)
+        index = TermIndex(parsed)
+        symbols = SymbolTable(parsed)
+
         missing = []
+        evidence = {}
+
+        for func in self._extract_functions(plan):
+            req = f"function {func}()"
+            match = self._match_function(func, symbols)
+            evidence[req] = match
+            if not match["matched"]:
+                missing.append(req)
 
-        for req in requirements:
-            if not self._requirement_implemented(req, files):
+        for req in self._extract_features(plan):
+            match = self._match_feature(req, symbols, index)
+            evidence[req] = match
+            if not match["matched"]:
+                missing.append(req)
+
+        for req in self._extract_requirements(plan):
+            match = self._match_requirement(req, index)
+            evidence[req] = match
+            if not match["matched"]:
                 missing.append(req)
 
         if missing:
             return {
                 "complete": False,
                 "missing_requirements": missing,
-                "feedback": self._build_feedback(missing)
+                "feedback": self._build_feedback(missing, evidence),
+                "evidence": evidence
             }
 
-        return {"complete": True}
+        return {"complete": True, "evidence": evidence}
 
     # ----------------- Helpers -----------------
 
+    def _extract_functions(self, plan: Dict) -> List[str]:
+        """
+        Function names listed per file in the plan, e.g. "add_task()".
+        """
+        names = []
+        for items in plan.get("files", {}).values():
+            for name in function_names(items):
+                if name not in names:
+                    names.append(name)
+        return names
+
+    def _extract_features(self, plan: Dict) -> List[str]:
+        return [f.lower() for f in plan.get("features", [])]
+
     def _extract_requirements(self, plan: Dict) -> List[str]:
         """
-        Normalize requirements from planner output.
+        Normalize free-text requirements from planner output.
         """
         reqs = []
 
         if "requirements" in plan:
             reqs.extend(plan["requirements"])
 
-        if "features" in plan:
-            reqs.extend(plan["features"])
-
         if "success_criteria" in plan:
             reqs.extend(plan["success_criteria"])
 
         return [r.lower() for r in reqs]
 
-    def _requirement_implemented(self, requirement: str, files: Dict) -> bool:
+    def _match_function(self, name: str, symbols: SymbolTable) -> Dict:
         """
-        Heuristic check:
-        - Keyword presence in any file
-        - Function/class names
+        A planned function must be defined (in any naming convention) and
+        reachable from the entry point.
         """
+        definition = symbols.find(name)
+        if definition is None:
+            return {"matched": [], "locations": [], "reason": "not defined"}
+        if not symbols.is_reachable(name):
+            return {
+                "matched": [],
+                "locations": [{"term": definition["name"], "file": definition["file"], "line": definition["line"]}],
+                "reason": "defined but never called from the entry point"
+            }
+        return {
+            "matched": [name],
+            "locations": [{"term": definition["name"], "file": definition["file"], "line": definition["line"]}]
+        }
 
-        keywords = self._keywords_from_requirement(requirement)
+    def _match_feature(self, feature: str, symbols: SymbolTable, index: TermIndex) -> Dict:
+        """
+        A feature is implemented by a reachable definition of the same name,
+        or by reachable code whose identifiers/strings contain its words.
+        Comments do not count. Falls back to the term index when files
+        could not be parsed.
+        """
+        if symbols.unparsed:
+            return self._match_requirement(feature, index)
 
-        for filename, content in files.items():
-            content_lower = content.lower()
-            if any(k in content_lower for k in keywords):
-                return True
+        definition = symbols.find(feature)
+        if definition and symbols.is_reachable(feature):
+            return {
+                "matched": [feature],
+                "locations": [{"term": definition["name"], "file": definition["file"], "line": definition["line"]}]
+            }
 
-        return False
+        keywords = self._keywords_from_requirement(feature)
+        matched = [k for k in keywords if symbols.has_terms(k)]
+        return {"matched": matched, "locations": []}
+
+    def _match_requirement(self, requirement: str, index: TermIndex) -> Dict:
+        """
+        Heuristic check against the term index:
+        - Any keyword (stemmed, identifier-split) present in any file
+        - Returns the matched keywords and where they occur
+        """
+
+        keywords = self._keywords_from_requirement(requirement)
+        return index.match(keywords)
 
     def _keywords_from_requirement(self, requirement: str) -> List[str]:
         """
@@ -92,11 +166,13 @@ class RequirementCheckerAgent:
         }
         return [t for t in tokens if t not in stopwords]
 
-    def _build_feedback(self, missing: List[str]) -> str:
+    def _build_feedback(self, missing: List[str], evidence: Dict = None) -> str:
         """
         Human-readable feedback for Agent 2.
         """
+        evidence = evidence or {}
         lines = ["The following requirements are not implemented:"]
         for req in missing:
-            lines.append(f"- {req}")
+            reason = evidence.get(req, {}).get("reason")
+            lines.append(f"- {req} ({reason})" if reason else f"- {req}")
         return "\n".join(lines)
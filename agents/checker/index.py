@@ -0,0 +1,76 @@
+import re
+import tokenize
+from collections import defaultdict
+from typing import Dict, List
+from utils.artifacts import ParsedCodeSet, ParsedFile
+from utils.text import split_identifier, stem
+
+
+IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+INDEXED_TOKENS = (tokenize.NAME, tokenize.STRING, tokenize.COMMENT)
+
+
+class TermIndex:
+    """
+    Inverted index over generated files, built once per check.
+
+    Every identifier and word is split (snake_case / camelCase), lowercased
+    and stemmed; the index maps each term to the (file, line) locations
+    where it occurs.
+    """
+
+    def __init__(self, parsed: ParsedCodeSet):
+        self.postings: Dict[str, List[tuple]] = defaultdict(list)
+        for pf in parsed.files.values():
+            self._add_file(pf)
+
+    def lookup(self, term: str) -> List[tuple]:
+        return self.postings.get(term, [])
+
+    def match(self, keywords: List[str], max_locations: int = 3) -> Dict:
+        """
+        Match requirement keywords against the index.
+
+        Returns: {
+            "matched": [keyword, ...],
+            "locations": [{"term", "file", "line"}, ...]
+        }
+        """
+        matched = []
+        locations = []
+        for keyword in keywords:
+            terms = normalize_terms(keyword)
+            hits = [(t, loc) for t in terms for loc in self.lookup(t)]
+            if terms and all(self.lookup(t) for t in terms):
+                matched.append(keyword)
+                for term, (fname, line) in hits[:max_locations]:
+                    locations.append({"term": term, "file": fname, "line": line})
+        return {"matched": matched, "locations": locations}
+
+    def _add_file(self, pf: ParsedFile):
+        # Python files reuse the shared token stream; anything else is
+        # scanned line by line
+        if pf.tokens:
+            words = (
+                (tok.start[0], word)
+                for tok in pf.tokens if tok.type in INDEXED_TOKENS
+                for word in IDENTIFIER.findall(tok.string)
+            )
+        else:
+            words = (
+                (line_no, word)
+                for line_no, line in enumerate(pf.source.split("\n"), 1)
+                for word in IDENTIFIER.findall(line)
+            )
+
+        seen = set()
+        for line_no, word in words:
+            for term in normalize_terms(word):
+                if (term, line_no) not in seen:
+                    seen.add((term, line_no))
+                    self.postings[term].append((pf.name, line_no))
+
+
+def normalize_terms(text: str) -> List[str]:
+    """Split, lowercase and stem a keyword or identifier."""
+    return [stem(w) for w in split_identifier(text)]
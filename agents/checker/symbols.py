@@ -0,0 +1,174 @@
+import ast
+from collections import defaultdict, deque
+from typing import Dict, List, Optional, Set
+from utils.artifacts import ParsedCodeSet
+from utils.text import split_identifier, stem
+
+
+MODULE = "<module>"
+
+
+def canonical_name(name: str) -> str:
+    """
+    Naming-convention independent form: "add_task", "addTask" and
+    "AddTask" all become "addtask".
+    """
+    return "".join(split_identifier(name))
+
+
+class SymbolTable:
+    """
+    Symbols defined by the generated files, built from their ASTs.
+
+    - functions / classes: canonical name -> [{"name", "file", "line"}]
+      (functions include methods and functions nested in functions)
+    - scopes: nested function -> the function it is defined in; it is
+      only reachable through that function
+    - calls: caller -> names it calls or references (module-level code
+      is the caller MODULE)
+    - reachable: definitions reachable from module-level code, i.e. from
+      the entry point
+    - terms: stemmed words of identifiers and string literals in
+      reachable code (comments are not part of the AST)
+    """
+
+    def __init__(self, parsed: ParsedCodeSet):
+        self.functions: Dict[str, List[Dict]] = defaultdict(list)
+        self.classes: Dict[str, List[Dict]] = defaultdict(list)
+        self.methods: Dict[str, Set[str]] = defaultdict(set)
+        self.calls: Dict[str, Set[str]] = defaultdict(set)
+        self.scopes: Dict[str, str] = {}
+        self._top_level: Set[str] = set()
+        self.unparsed: List[str] = []
+        self._bodies: Dict[str, List[ast.AST]] = defaultdict(list)
+
+        for pf in parsed.python_files():
+            if pf.tree is None:
+                self.unparsed.append(pf.name)
+                continue
+            self._collect(pf.name, pf.tree)
+
+        self.reachable = self._reachable()
+        self.terms = self._reachable_terms()
+
+    def find(self, name: str) -> Optional[Dict]:
+        """
+        Definition of a function or class by name, in any naming convention.
+        """
+        key = canonical_name(name)
+        for table in (self.functions, self.classes):
+            if table.get(key):
+                return table[key][0]
+        return None
+
+    def is_reachable(self, name: str) -> bool:
+        return canonical_name(name) in self.reachable
+
+    def has_terms(self, text: str) -> bool:
+        """
+        Whether every word of `text` occurs in reachable code.
+        """
+        words = [stem(w) for w in split_identifier(text)]
+        return bool(words) and all(w in self.terms for w in words)
+
+    # ----------------- Construction -----------------
+
+    def _collect(self, fname: str, tree: ast.Module):
+        for node in tree.body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                self._top_level.add(canonical_name(node.name))
+                self._define(self.functions, node, fname)
+            elif isinstance(node, ast.ClassDef):
+                self._define(self.classes, node, fname)
+                for item in node.body:
+                    if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                        self._top_level.add(canonical_name(item.name))
+                        self._define(self.functions, item, fname)
+                        self.methods[canonical_name(node.name)].add(canonical_name(item.name))
+                    else:
+                        self._bodies[canonical_name(node.name)].append(item)
+            else:
+                self._bodies[MODULE].append(node)
+
+    def _define(self, table: Dict, node: ast.AST, fname: str):
+        key = canonical_name(node.name)
+        table[key].append({"name": node.name, "file": fname, "line": node.lineno})
+        if isinstance(node, ast.ClassDef):
+            self._bodies[key].extend(node.decorator_list)
+        else:
+            self._bodies[key].append(node)
+            self._define_nested(key, node, fname)
+
+    def _define_nested(self, parent: str, node: ast.AST, fname: str):
+        """Functions defined anywhere inside function `node`, scoped to it."""
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                self.scopes[canonical_name(child.name)] = parent
+                self._define(self.functions, child, fname)
+            elif not isinstance(child, (ast.ClassDef, ast.Lambda)):
+                self._define_nested(parent, child, fname)
+
+    def _references(self, owner: str) -> Set[str]:
+        """
+        Canonical names a definition calls or references.
+        """
+        refs = set()
+        for body in self._bodies.get(owner, []):
+            for node in ast.walk(body):
+                if isinstance(node, ast.Name):
+                    refs.add(canonical_name(node.id))
+                elif isinstance(node, ast.Attribute):
+                    refs.add(canonical_name(node.attr))
+        return refs
+
+    def _reachable(self) -> Set[str]:
+        defined = set(self.functions) | set(self.classes)
+        for owner in list(self._bodies):
+            self.calls[owner] = {
+                target for target in self._references(owner) & defined
+                if self._visible(target, owner)
+            }
+
+        seen = {MODULE}
+        queue = deque([MODULE])
+        while queue:
+            owner = queue.popleft()
+            targets = set(self.calls.get(owner, set()))
+            # Instantiating a class makes its methods available
+            targets |= self.methods.get(owner, set())
+            for target in targets - seen:
+                seen.add(target)
+                queue.append(target)
+        seen.discard(MODULE)
+        return seen
+
+    def _visible(self, target: str, owner: str) -> bool:
+        """Whether `owner` can call `target`: top-level, or nested in it."""
+        if target in self._top_level:
+            return True
+        scope = self.scopes.get(target)
+        while scope is not None:
+            if scope == owner:
+                return True
+            scope = self.scopes.get(scope)
+        return target not in self.scopes
+
+    def _reachable_terms(self) -> Set[str]:
+        terms = set()
+        for owner in self.reachable | {MODULE}:
+            for body in self._bodies.get(owner, []):
+                for node in ast.walk(body):
+                    if isinstance(node, ast.Name):
+                        text = node.id
+                    elif isinstance(node, ast.Attribute):
+                        text = node.attr
+                    elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                        text = node.name
+                    elif isinstance(node, ast.arg):
+                        text = node.arg
+                    elif isinstance(node, ast.Constant) and isinstance(node.value, str):
+                        text = node.value
+                    else:
+                        continue
+                    terms.update(stem(w) for w in split_identifier(text))
+        return terms
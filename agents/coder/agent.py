@@ -1,68 +1,107 @@
 import json
+from concurrent.futures import ThreadPoolExecutor
 from agents.coder.schema import CodeOutput
 from agents.coder.prompt import (
     CODER_SYSTEM_PROMPT,
-    CODER_INSTRUCTIONS
+    CODER_INSTRUCTIONS,
+    CODER_UNIT_INSTRUCTIONS,
+    CODER_ENTRY_RULE,
+    CODER_NO_ENTRY_RULE,
+    CODER_WARM_START_INSTRUCTIONS
 )
-from agents.coder.config import AGENT_NAME
+from agents.coder.config import (
+    AGENT_NAME,
+    PARALLEL_GENERATION,
+    PARALLEL_UNIT,
+    PARALLEL_MIN_UNITS,
+    PARALLEL_MAX_WORKERS,
+    LIBRARY_ENABLED,
+    LIBRARY_PATH,
+    LIBRARY_MAX_ENTRIES,
+    LIBRARY_MIN_SIMILARITY
+)
+from agents.coder.parallel import (
+    build_interface_stub,
+    build_units,
+    merge_fragments,
+    missing_functions
+)
+from agents.coder.library import ProgramLibrary
 from llm.registry import get_model
+from llm.prompt import PromptAssembler
 from utils.logger import setup_logger
 
 
 
 class CoderAgent:
 
-    def __init__(self):
+    def __init__(self, parallel: bool = PARALLEL_GENERATION):
         self.llm = get_model(AGENT_NAME)
         self.logger = setup_logger("CoderAgent", "coder.log")
+        self.parallel = parallel
+        self.library = ProgramLibrary(LIBRARY_PATH, LIBRARY_MAX_ENTRIES) if LIBRARY_ENABLED else None
 
-    def run(self, plan, debug_result=None) -> tuple:
+    def run(self, plan, debug_result=None, check_result=None, iteration: int = 0) -> tuple:
         """
+        debug_result: the debugger's verdict on the previous code, if any
+        check_result: the checker's verdict on the previous code, if any
+        iteration: retry count; the program library is only used on the
+                   first attempt, so a rejected program is not reused
         Returns: (CodeOutput or None, raw_output_string)
         """
         error_context = ""
-        if debug_result and not debug_result.get("correct"):
+        warm_start = ""
+        if check_result and not check_result.get("complete"):
+            self.logger.info("Retrying code generation with missing requirements")
+            missing = check_result.get("missing_requirements", [])
+            error_context = check_result.get("feedback") or (
+                "The following requirements are not implemented:\n" + "\n".join(f"- {req}" for req in missing)
+            )
+            error_context += "\nPlease implement them."
+        elif debug_result and not debug_result.get("correct"):
             self.logger.info("Retrying code generation with debug feedback")
-            error_context = f"\n\nPrevious code had errors:\n{json.dumps(debug_result.get('errors', []), indent=2)}\nPlease fix these errors."
+            error_context = self._format_debug_feedback(debug_result)
         else:
             self.logger.info(f"Generating code for: {plan.project_name}")
 
-        messages = [
-            {
-                "role": "user",
-                "content": f"""
-Specification:
-{plan.model_dump_json(indent=2)}
-{error_context}
+            if self.library and iteration == 0:
+                entry, similarity, exact = self.library.lookup(plan)
+                if exact:
+                    self.logger.info(f"Reusing validated program: {entry['project_name']}")
+                    files = dict(entry["files"])
+                    return CodeOutput(files=files), json.dumps({"files": files})
+                if entry and similarity >= LIBRARY_MIN_SIMILARITY:
+                    self.logger.info(f"Warm-starting from {entry['project_name']} (similarity {similarity:.2f})")
+                    warm_start = CODER_WARM_START_INSTRUCTIONS.format(
+                        previous_plan=json.dumps(entry["plan"]),
+                        previous_files=json.dumps({"files": entry["files"]})
+                    )
 
-{CODER_INSTRUCTIONS}
-"""
-            }
-        ]
+            # Retries patch the merged program as a whole; only fresh
+            # generations are split across units.
+            if self.parallel and not warm_start:
+                parallel_result = self._run_parallel(plan)
+                if parallel_result is not None:
+                    return parallel_result
+
+        prompt = (
+            PromptAssembler(AGENT_NAME)
+            .system("system", CODER_SYSTEM_PROMPT)
+            .user("specification", "Specification:\n" + plan.model_dump_json())
+            .user("errors", error_context)
+            .user("warm_start", warm_start)
+            .user("instructions", CODER_INSTRUCTIONS)
+        )
+        system_prompt, messages = prompt.build()
+        self.logger.debug(f"Prompt size: {prompt.summary()}")
 
         raw_output = self.llm.generate(
-            system_prompt=CODER_SYSTEM_PROMPT,
+            system_prompt=system_prompt,
             messages=messages
         )
 
         try:
-            cleaned = raw_output.strip()
-
-            # Remove markdown code fences if present
-            if cleaned.startswith("```"):
-                lines = cleaned.split("\n")
-                if len(lines) > 2 and lines[-1].strip() == "```":
-                    cleaned = "\n".join(lines[1:-1])
-                else:
-                    cleaned = cleaned.split("```", 1)[1]
-                
-                if cleaned.strip().startswith("json"):
-                    cleaned = cleaned.strip()[4:].strip()
-
-            cleaned = cleaned.strip()
-
-            parsed = json.loads(cleaned)
-            result = CodeOutput(**parsed)
+            result = self._parse_output(raw_output)
             self.logger.info(f"Code generated successfully: {len(result.files)} files")
 
             return result, raw_output
@@ -70,7 +109,99 @@ Specification:
             # Return None for code, but pass raw output to debugger
             self.logger.error("Failed to parse code output")
             return None, raw_output
-        
+
+    def record_validated(self, plan, code: CodeOutput):
+        """
+        Store a program that passed validation for future warm starts.
+        """
+        if self.library:
+            self.library.add(plan, code.files)
+            self.logger.debug(f"Stored validated program: {plan.project_name}")
+
+    def _run_parallel(self, plan):
+        """
+        Generate each unit of the plan concurrently against a shared
+        interface stub, then merge. Returns (CodeOutput, raw_output) or
+        None when the plan is too small or the merge does not validate,
+        in which case the caller falls back to a single decode.
+        """
+        units = build_units(plan, PARALLEL_UNIT)
+        if len(units) < PARALLEL_MIN_UNITS:
+            self.logger.info(f"Plan has {len(units)} unit(s), using single decode")
+            return None
+
+        interface = build_interface_stub(plan)
+        self.logger.info(f"Generating {len(units)} {PARALLEL_UNIT}(s) in parallel")
+
+        workers = min(PARALLEL_MAX_WORKERS, len(units))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            raw_outputs = list(pool.map(
+                lambda unit: self._generate_unit(plan, unit, interface),
+                units
+            ))
+
+        try:
+            fragments = []
+            for unit, raw in zip(units, raw_outputs):
+                parsed = self._parse_output(raw)
+                fragments.append(parsed.files.get(unit["file"]) or next(iter(parsed.files.values())))
+
+            files = merge_fragments(units, fragments)
+            missing = missing_functions(units, files)
+        except Exception as e:
+            self.logger.warning(f"Parallel merge failed ({e}), falling back to single decode")
+            return None
+
+        if missing:
+            self.logger.warning(f"Merged code is missing {missing}, falling back to single decode")
+            return None
+
+        result = CodeOutput(files=files)
+        self.logger.info(f"Code generated successfully: {len(result.files)} files from {len(units)} units")
+
+        # Downstream JSON validation expects a single document
+        return result, json.dumps({"files": files})
+
+    def _generate_unit(self, plan, unit: dict, interface: str) -> str:
+        self.logger.debug(f"Generating unit: {unit['name']}")
+        content = CODER_UNIT_INSTRUCTIONS.format(
+            interface=interface,
+            unit_name=unit["name"],
+            items="\n".join(f"- {item}" for item in unit["items"]),
+            functions=", ".join(unit["functions"]) or "(helpers only)",
+            entry_rule=CODER_ENTRY_RULE if unit["entry"] else CODER_NO_ENTRY_RULE,
+            file=unit["file"]
+        )
+        prompt = (
+            PromptAssembler(AGENT_NAME)
+            .system("system", CODER_SYSTEM_PROMPT)
+            .user("specification", "Specification:\n" + plan.model_dump_json())
+            .user("unit_instructions", content)
+        )
+        system_prompt, messages = prompt.build()
+        return self.llm.generate(
+            system_prompt=system_prompt,
+            messages=messages
+        )
+
+    def _parse_output(self, raw_output: str) -> CodeOutput:
+        cleaned = raw_output.strip()
+
+        # Remove markdown code fences if present
+        if cleaned.startswith("```"):
+            lines = cleaned.split("\n")
+            if len(lines) > 2 and lines[-1].strip() == "```":
+                cleaned = "\n".join(lines[1:-1])
+            else:
+                cleaned = cleaned.split("```", 1)[1]
+            
+            if cleaned.strip().startswith("json"):
+                cleaned = cleaned.strip()[4:].strip()
+
+        cleaned = cleaned.strip()
+
+        parsed = json.loads(cleaned)
+        return CodeOutput(**parsed)
 
     def _format_debug_feedback(self, debug_result: dict) -> str:
         """Format debug errors into clear, actionable feedback"""
@@ -93,6 +224,18 @@ Specification:
                 feedback += f"  Line: {error['line']}\n"
             
             feedback += f"  Issue: {error.get('error', 'Unknown error')}\n"
+
+            if 'frames' in error:
+                feedback += "  Call chain (innermost last):\n"
+                for frame in error['frames']:
+                    feedback += f"    {frame}\n"
+            if 'locals' in error:
+                values = ", ".join(f"{name}={value}" for name, value in error['locals'].items())
+                feedback += f"  Local variables: {values}\n"
+            if 'frames' not in error and error.get('traceback'):
+                # Unlocated errors: the end of the traceback or the run's transcript
+                tail = "\n".join("    " + line for line in error['traceback'].strip()[-800:].splitlines())
+                feedback += f"  Output:\n{tail}\n"
             
             if 'suggestion' in error:
                 feedback += f"  Fix: {error['suggestion']}\n"
@@ -1 +1,15 @@
 AGENT_NAME = "coder"
+
+# Component-parallel generation: each unit of the plan is generated
+# concurrently against a shared interface stub, then merged and validated.
+PARALLEL_GENERATION = False
+PARALLEL_UNIT = "component"     # "component" or "file"
+PARALLEL_MIN_UNITS = 2          # smaller plans use a single decode
+PARALLEL_MAX_WORKERS = 4
+
+# Warm start from previously validated programs: an identical plan reuses
+# the stored program, a similar one seeds the coder with it as a base to edit.
+LIBRARY_ENABLED = True
+LIBRARY_PATH = ".cache/programs.json"
+LIBRARY_MAX_ENTRIES = 200
+LIBRARY_MIN_SIMILARITY = 0.6
@@ -0,0 +1,85 @@
+import hashlib
+import json
+from typing import Dict, Optional, Tuple
+from agents.coder.parallel import function_names
+from utils.store import LRUStore
+from utils.text import STOPWORDS, tokenize
+
+
+class ProgramLibrary:
+    """
+    Local library of (plan, validated CodeOutput files) pairs.
+
+    Entries are indexed by plan features, function names and project
+    type. `lookup` returns the closest entry and its similarity in [0, 1];
+    a similarity of 1.0 with `exact` set means the plans are identical.
+    Entries are kept in an LRUStore keyed on the plan, so programs that
+    keep being reused outlive ones that are not.
+    """
+
+    FEATURE_WEIGHT = 0.45
+    FUNCTION_WEIGHT = 0.45
+    TYPE_WEIGHT = 0.10
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 200):
+        self.store = LRUStore(path, max_entries)
+
+    def lookup(self, plan) -> Tuple[Optional[Dict], float, bool]:
+        """
+        Returns: (entry or None, similarity, exact)
+        """
+        entry = self.store.get(self.plan_key(plan))
+        if entry is not None:
+            return entry, 1.0, True
+
+        features = self._feature_terms(plan)
+        functions = self._functions(plan)
+
+        best, best_score = None, 0.0
+        for entry in self.store.values():
+            score = (
+                self.FEATURE_WEIGHT * _jaccard(features, set(entry["features"]))
+                + self.FUNCTION_WEIGHT * _jaccard(functions, set(entry["functions"]))
+                + self.TYPE_WEIGHT * (entry["project_type"] == plan.project_type)
+            )
+            if score > best_score:
+                best, best_score = entry, score
+
+        return best, best_score, False
+
+    def add(self, plan, files: Dict[str, str]):
+        key = self.plan_key(plan)
+        self.store.put(key, {
+            "plan_key": key,
+            "project_name": plan.project_name,
+            "project_type": plan.project_type,
+            "features": sorted(self._feature_terms(plan)),
+            "functions": sorted(self._functions(plan)),
+            "plan": plan.model_dump(),
+            "files": dict(files)
+        })
+
+    @staticmethod
+    def plan_key(plan) -> str:
+        canonical = json.dumps(plan.model_dump(), sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    # ----------------- Helpers -----------------
+
+    def _feature_terms(self, plan) -> set:
+        terms = set()
+        for feature in plan.features:
+            terms.update(t for t in tokenize(feature) if t not in STOPWORDS)
+        return terms
+
+    def _functions(self, plan) -> set:
+        names = set()
+        for items in plan.files.values():
+            names.update(function_names(items))
+        return names
+
+
+def _jaccard(a: set, b: set) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
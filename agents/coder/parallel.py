@@ -0,0 +1,204 @@
+import ast
+import re
+from typing import Dict, List, Optional
+
+
+ENTRY_COMPONENT_HINTS = ("interface", "cli", "ui", "menu", "main")
+
+
+def function_names(items: List[str]) -> List[str]:
+    """
+    Extract function names from plan file entries such as "add()" or
+    "remove_task(index)". Free-form entries ("main CLI loop") are ignored.
+    """
+    names = []
+    for item in items:
+        match = re.match(r"\s*([A-Za-z_]\w*)\s*\(", item)
+        if match and match.group(1) not in names:
+            names.append(match.group(1))
+    return names
+
+
+def build_interface_stub(plan) -> str:
+    """
+    Shared interface every unit is generated against: one stub per
+    function named in plan.files, grouped by file.
+    """
+    lines = [f"# Interface for {plan.project_name}"]
+    for fname, items in plan.files.items():
+        names = function_names(items)
+        if not names:
+            continue
+        lines.append(f"# {fname}")
+        for name in names:
+            lines.append(f"def {name}(*args, **kwargs): ...")
+    return "\n".join(lines)
+
+
+def build_units(plan, unit_type: str = "component") -> List[Dict]:
+    """
+    Split a plan into independently generated units.
+
+    Each unit is a dict:
+        {"name": str, "items": List[str], "functions": List[str],
+         "file": str, "entry": bool}
+
+    "file" mode yields one unit per plan file. "component" mode yields one
+    unit per plan component; every function from plan.files is assigned to
+    the component whose descriptions share the most words with its name,
+    and exactly one unit owns the entry point.
+    """
+    if unit_type == "file":
+        units = []
+        for fname, items in plan.files.items():
+            units.append({
+                "name": fname,
+                "items": list(items),
+                "functions": function_names(items),
+                "file": fname,
+                "entry": False
+            })
+        entry = _pick_entry_unit([u["name"] for u in units], preferred=["main.py", "app.py", "run.py"])
+        if units:
+            units[entry]["entry"] = True
+        return units
+
+    target_file = next(iter(plan.files), "main.py")
+    units = [
+        {
+            "name": name,
+            "items": list(items),
+            "functions": [],
+            "file": target_file,
+            "entry": False
+        }
+        for name, items in plan.components.items()
+    ]
+    if not units:
+        return []
+
+    all_functions = []
+    for items in plan.files.values():
+        for name in function_names(items):
+            if name not in all_functions:
+                all_functions.append(name)
+
+    for func in all_functions:
+        best = max(range(len(units)), key=lambda i: _overlap(func, units[i]["items"] + [units[i]["name"]]))
+        units[best]["functions"].append(func)
+
+    entry = _pick_entry_unit([u["name"] for u in units])
+    units[entry]["entry"] = True
+    return units
+
+
+def merge_fragments(units: List[Dict], fragments: List[str]) -> Dict[str, str]:
+    """
+    Merge per-unit code fragments into files.
+
+    Imports are hoisted and de-duplicated, top-level definitions are kept
+    from the first unit that defines them, and only the entry unit may
+    contribute an `if __name__ == "__main__"` block.
+
+    Raises SyntaxError if a fragment does not parse.
+    """
+    by_file: Dict[str, List[tuple]] = {}
+    for unit, fragment in zip(units, fragments):
+        by_file.setdefault(unit["file"], []).append((unit, fragment))
+
+    merged = {}
+    for fname, parts in by_file.items():
+        imports: List[str] = []
+        body: List[str] = []
+        entry_block: Optional[str] = None
+        defined = set()
+
+        for unit, fragment in parts:
+            tree = ast.parse(fragment)
+            for node in tree.body:
+                segment = ast.get_source_segment(fragment, node)
+                if segment is None:
+                    continue
+
+                if isinstance(node, (ast.Import, ast.ImportFrom)):
+                    if segment not in imports:
+                        imports.append(segment)
+                    continue
+
+                if _is_main_guard(node):
+                    if unit["entry"] and entry_block is None:
+                        entry_block = segment
+                    continue
+
+                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                    if node.name in defined:
+                        continue
+                    defined.add(node.name)
+
+                body.append(segment)
+
+        sections = []
+        if imports:
+            sections.append("\n".join(imports))
+        sections.extend(body)
+        if entry_block:
+            sections.append(entry_block)
+        merged[fname] = "\n\n\n".join(sections) + "\n"
+
+    return merged
+
+
+def missing_functions(units: List[Dict], files: Dict[str, str]) -> List[str]:
+    """
+    Interface functions that no merged file defines.
+    """
+    defined = set()
+    for content in files.values():
+        for node in ast.walk(ast.parse(content)):
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                defined.add(node.name)
+    return [f for unit in units for f in unit["functions"] if f not in defined]
+
+
+# ----------------- Helpers -----------------
+
+def _words(text: str) -> set:
+    return {w for w in re.split(r"[^a-z0-9]+", text.lower()) if w}
+
+
+def _overlap(func: str, descriptions: List[str]) -> int:
+    """
+    Score how well a function name matches a component's descriptions.
+    Prefix matches count so that "add" matches "addition function".
+    """
+    func_words = _words(func.replace("_", " "))
+    score = 0
+    for desc in descriptions:
+        for word in _words(desc):
+            for fw in func_words:
+                if word == fw:
+                    score += 2
+                elif len(fw) >= 3 and (word.startswith(fw) or fw.startswith(word)):
+                    score += 1
+    return score
+
+
+def _pick_entry_unit(names: List[str], preferred: Optional[List[str]] = None) -> int:
+    for candidate in preferred or []:
+        if candidate in names:
+            return names.index(candidate)
+    for i, name in enumerate(names):
+        if any(hint in name.lower() for hint in ENTRY_COMPONENT_HINTS):
+            return i
+    return len(names) - 1
+
+
+def _is_main_guard(node: ast.stmt) -> bool:
+    if not isinstance(node, ast.If):
+        return False
+    test = node.test
+    return (
+        isinstance(test, ast.Compare)
+        and isinstance(test.left, ast.Name)
+        and test.left.id == "__name__"
+    )
@@ -24,15 +24,16 @@ IMPORTANT FOR INTERACTIVE PROGRAMS:
 - NEVER create infinite loops without exit conditions
 - Either break off from the loop when a condition is satisfied or always prompt users how to exit (e.g., "Enter 'q' to quit")
 
-Output format:
+Output format: ONLY valid JSON with this structure, with no markdown code
+blocks and no explanations or other text before or after it:
 {
   "files": {
-    "main.py": "<ACTUAL PYTHON CODE HERE>"
+    "<file name>": "<ACTUAL PYTHON CODE HERE>"
   }
 }
 
 IMPORTANT: The Python code goes inside a JSON string, so:
-- Escape quotes inside the code (use \\" for double quotes inside strings)
+- Escape special characters: \\n for newlines, \\" for double quotes inside strings
 - OR use single quotes for Python strings if the JSON uses double quotes
 - Ensure the entire Python code is one continuous string value
 
@@ -47,25 +48,47 @@ Requirements:
 3. Handle user input/output properly
 4. Include error handling where needed
 5. Make it user-friendly with clear prompts
-6. Use proper string quoting (escape quotes or use single quotes in Python)
-7. **CRITICAL**: For CLI applications with loops, always include an exit option (e.g., 'q' to quit)
-8. Clearly prompt the user about how to exit the program
+6. **CRITICAL**: For CLI applications with loops, always include an exit option (e.g., 'q' to quit)
+7. Clearly prompt the user about how to exit the program
 
+Write the program to main.py, in the output format given above.
+"""
 
+CODER_UNIT_INSTRUCTIONS = """
+You are generating ONE PART of a larger program. Other parts are generated
+at the same time by other developers and merged with yours afterwards.
 
-Output ONLY valid JSON with this structure:
-{
-  "files": {
-    "main.py": "actual python code as a string"
-  }
-}
+Shared interface (functions provided by the whole program):
+{interface}
+
+Your part: {unit_name}
+Responsibilities:
+{items}
+
+Functions YOU must define: {functions}
 
-CRITICAL JSON FORMATTING:
-- The entire Python code must be a single string value
-- Escape special characters: \\n for newlines, \\" for quotes
-- OR write Python code using single quotes for strings
-- Do NOT include markdown code blocks
-- Do NOT include any text before or after the JSON
+Rules:
+1. Define ONLY the functions listed for your part, plus private helpers
+2. Call other interface functions by name; do NOT redefine them
+3. Put all imports you need at the top of your code
+4. {entry_rule}
 
-Do NOT include any explanations outside the JSON.
-"""
\ No newline at end of file
+Write your part to {file}, in the output format given above.
+"""
+
+CODER_ENTRY_RULE = "Your part owns the entry point: define main() and end with if __name__ == \"__main__\": main()"
+CODER_NO_ENTRY_RULE = "Do NOT add a main() function or an if __name__ == \"__main__\" block"
+
+
+CODER_WARM_START_INSTRUCTIONS = """
+A previously validated program for a similar specification is shown below.
+Use it as your starting point: keep what already satisfies the new
+specification and edit only what differs. Output the COMPLETE updated
+program, not a diff.
+
+Previous specification:
+{previous_plan}
+
+Validated program:
+{previous_files}
+"""
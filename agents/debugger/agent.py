@@ -1,28 +1,85 @@
-import subprocess
-import tempfile
-import os
 import ast
 import json
-from typing import Dict, List
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from agents.debugger.cache import ValidationCache
+from agents.debugger.config import (
+    EXECUTION_TIMEOUT,
+    IMPORT_TARGET_PYTHON,
+    INTERACTIVE_READ_TIMEOUT,
+    INTERACTIVE_MAX_SCRIPTS,
+    INTERACTIVE_MAX_RESPONSES,
+    VALIDATION_CACHE_ENABLED,
+    VALIDATION_CACHE_PATH,
+    VALIDATION_CACHE_MAX_ENTRIES,
+    VALIDATOR_VERSION
+)
+from agents.debugger.imports import get_resolver
+from agents.debugger.loops import find_endless_loops
+from agents.debugger.names import find_name_errors
+from agents.debugger.scripts import build_responders
+from runtime.config import MAX_OUTPUT_BYTES, STALL_CPU_TIMEOUT
+from runtime.interactive import run_interactive
+from runtime.limits import describe_limit, rlimits
+from runtime.monitor import describe_stall, monitoring_available
+from runtime.pool import get_pool
+from runtime.workspace import Workspace, get_workspace
+from utils.artifacts import ParsedCodeSet, content_hash, parse_files
 from utils.logger import setup_logger
 
 
+def _settings() -> Dict:
+    """Everything besides the code that a validation result depends on."""
+    return {
+        "execution_timeout": EXECUTION_TIMEOUT,
+        "rlimits": rlimits({}, EXECUTION_TIMEOUT),
+        "max_output_bytes": MAX_OUTPUT_BYTES,
+        "stall_cpu_timeout": STALL_CPU_TIMEOUT,
+        "interactive_read_timeout": INTERACTIVE_READ_TIMEOUT,
+        "interactive_max_scripts": INTERACTIVE_MAX_SCRIPTS,
+        "interactive_max_responses": _max_responses(),
+        "import_target_python": IMPORT_TARGET_PYTHON
+    }
+
+
+def _max_responses() -> int:
+    """
+    Answers per interactive run. Without the stall monitor every answer
+    first waits out INTERACTIVE_READ_TIMEOUT of silence, so the count is
+    budgeted against the execution timeout.
+    """
+    if monitoring_available():
+        return INTERACTIVE_MAX_RESPONSES
+    return max(1, min(INTERACTIVE_MAX_RESPONSES, int(EXECUTION_TIMEOUT / 2 / INTERACTIVE_READ_TIMEOUT)))
+
+
 class DebuggerAgent:
     """
     Agent 4: Validates generated code through:
     1. JSON parsing validation (checks if coder output is valid)
     2. Syntax checking (AST parsing)
-    3. Static analysis (import checking, basic linting)
-    4. Runtime execution testing
+    3. Static analysis (imports, undefined names, endless loops)
+    4. Runtime execution testing (interactive programs get scripted input),
+       run concurrently with step 3
     """
 
     def __init__(self):
         self.logger = setup_logger("DebuggerAgent", "debugger.log")
+        # Cached results are only valid for the checks and settings that
+        # produced them
+        self.settings_hash = content_hash(json.dumps(_settings(), sort_keys=True))[:16]
+        self.cache = ValidationCache(
+            VALIDATION_CACHE_PATH,
+            VALIDATION_CACHE_MAX_ENTRIES,
+            version=f"v{VALIDATOR_VERSION}:{self.settings_hash}"
+        ) if VALIDATION_CACHE_ENABLED else None
 
-    def run(self, code, raw_coder_output=None) -> Dict:
+    def run(self, code, raw_coder_output=None, plan=None) -> Dict:
         """
         code: CodeOutput (Pydantic) or None if parsing failed
         raw_coder_output: Raw string output from coder (for JSON validation)
+        plan: PlannerOutput, used for sample input to interactive programs
         Returns: {
             "correct": bool,
             "errors": List[Dict] (if any)
@@ -61,63 +118,60 @@ class DebuggerAgent:
         
         files = code.files
         self.logger.info(f"Validating {len(files)} file(s): {list(files.keys())}")
+
+        # Parsed once per distinct file set and shared with the checker
+        parsed = parse_files(files)
         
-        with tempfile.TemporaryDirectory() as tmpdir:
-            self.logger.debug(f"Created temporary directory: {tmpdir}")
-            
-            # Write files temporarily
-            for fname, content in files.items():
-                path = os.path.join(tmpdir, fname)
-                with open(path, "w", encoding="utf-8") as f:
-                    f.write(content)
-                self.logger.debug(f"Written file: {fname} ({len(content)} chars)")
-
-            # Step 1: Syntax check ALL files
-            self.logger.info("Step 1: Checking syntax")
-            syntax_errors = self._check_syntax(files)
-            errors.extend(syntax_errors)
-
-            # If syntax errors exist, don't bother executing
-            if syntax_errors:
-                self.logger.error(f"Syntax check failed with {len(syntax_errors)} error(s)")
-                for err in syntax_errors:
-                    self.logger.error(f"  - {err['file']}:{err.get('line', '?')} {err['error_type']}: {err['error']}")
-                return {
-                    "correct": False,
-                    "errors": errors,
-                    "stage": "syntax_check"
-                }
-            self.logger.info("Syntax check passed")
+        # Step 1: Syntax check ALL files
+        self.logger.info("Step 1: Checking syntax")
+        syntax_errors = self._run_stage("syntax", parsed, lambda: self._check_syntax(parsed))
+        errors.extend(syntax_errors)
 
-            # Step 2: Check imports
-            self.logger.info("Step 2: Checking imports")
-            import_errors = self._check_imports(files, tmpdir)
-            errors.extend(import_errors)
-            
-            if import_errors:
-                self.logger.warning(f"Found {len(import_errors)} import issue(s)")
-                for err in import_errors:
-                    self.logger.warning(f"  - {err['file']}: {err['error']}")
-            else:
-                self.logger.info("Import check passed")
+        # If syntax errors exist, don't bother executing
+        if syntax_errors:
+            self.logger.error(f"Syntax check failed with {len(syntax_errors)} error(s)")
+            for err in syntax_errors:
+                self.logger.error(f"  - {err['file']}:{err.get('line', '?')} {err['error_type']}: {err['error']}")
+            return {
+                "correct": False,
+                "errors": errors,
+                "stage": "syntax_check"
+            }
+        self.logger.info("Syntax check passed")
 
-            # Step 3: Try executing main file
-            self.logger.info("Step 3: Attempting code execution")
-            main_file = self._find_entry_file(files)
-            
+        # Steps 2-4 (static analysis) run while the program executes (step
+        # 5): execution is mostly waiting on the sandbox. Errors are merged
+        # in step order, and a fatal static error stops the run.
+        main_file = self._find_entry_file(parsed)
+        cancel = threading.Event()
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            execution = None
             if main_file:
-                self.logger.info(f"Entry point identified: {main_file}")
-                exec_errors = self._execute_code(tmpdir, main_file)
+                self.logger.info(f"Step 5: Starting code execution of {main_file} alongside static checks")
+                execution = pool.submit(self._check_execution, files, parsed, main_file, plan, cancel)
+            else:
+                self.logger.warning("No entry point found, skipping execution test")
+
+            try:
+                failed = self._check_static(parsed, errors)
+            except BaseException:
+                cancel.set()
+                raise
+            if failed:
+                # Leaving the block waits for the (now killed) run to end
+                cancel.set()
+                return failed
+
+            if execution:
+                exec_errors = execution.result()
                 errors.extend(exec_errors)
-                
+
                 if exec_errors:
                     self.logger.error(f"Execution failed with {len(exec_errors)} error(s)")
                     for err in exec_errors:
                         self.logger.error(f"  - {err['error_type']}: {err['error']}")
                 else:
                     self.logger.info("Execution test passed")
-            else:
-                self.logger.warning("No entry point found, skipping execution test")
 
         if errors:
             self.logger.error(f"Validation FAILED with {len(errors)} total error(s)")
@@ -132,6 +186,97 @@ class DebuggerAgent:
             "message": "All validation checks passed"
         }
 
+    def _check_static(self, parsed: ParsedCodeSet, errors: List[Dict]) -> Optional[Dict]:
+        """
+        Imports, names and endless loops, adding findings to `errors`.
+        Returns the failed result when a finding rules out running the
+        code, else None.
+        """
+        # Step 2: Check imports
+        self.logger.info("Step 2: Checking imports")
+        # Cached results depend on which environment imports resolve against
+        imports_stage = "imports" if not IMPORT_TARGET_PYTHON else "imports:" + content_hash(IMPORT_TARGET_PYTHON)[:16]
+        import_errors = self._run_stage(imports_stage, parsed, lambda: self._check_imports(parsed))
+        errors.extend(import_errors)
+        
+        if import_errors:
+            self.logger.warning(f"Found {len(import_errors)} import issue(s)")
+            for err in import_errors:
+                self.logger.warning(f"  - {err['file']}: {err['error']}")
+        else:
+            self.logger.info("Import check passed")
+
+        # Step 3: Names, resolved statically instead of waiting for a NameError
+        self.logger.info("Step 3: Checking names")
+        name_errors = self._run_stage("names", parsed, lambda: self._check_names(parsed))
+        errors.extend(name_errors)
+
+        if name_errors:
+            self.logger.error(f"Name check failed with {len(name_errors)} error(s), stopping execution")
+            for err in name_errors:
+                self.logger.error(f"  - {err['file']}:{err['line']} {err['error_type']}: {err['error']}")
+            return {
+                "correct": False,
+                "errors": errors,
+                "stage": "name_check"
+            }
+        self.logger.info("Name check passed")
+
+        # Step 4: Endless loops would only surface as an execution timeout
+        self.logger.info("Step 4: Checking loops")
+        loop_errors = self._run_stage("loops", parsed, lambda: self._check_loops(parsed))
+        errors.extend(loop_errors)
+
+        if loop_errors:
+            self.logger.error(f"Loop check failed with {len(loop_errors)} error(s), stopping execution")
+            for err in loop_errors:
+                self.logger.error(f"  - {err['file']}:{err['line']} {err['error']}")
+            return {
+                "correct": False,
+                "errors": errors,
+                "stage": "loop_check"
+            }
+        self.logger.info("Loop check passed")
+        return None
+
+    def _check_execution(self, files: Dict[str, str], parsed: ParsedCodeSet, main_file: str, plan,
+                         cancel: threading.Event) -> List[Dict]:
+        """
+        Run the entry file (under scripted input if it is interactive) in
+        the code's workspace; stopped early once `cancel` is set.
+        """
+        # Written once; the executor reuses it if this code is accepted
+        workspace = get_workspace(files)
+        if self._is_interactive(parsed):
+            responders = build_responders(plan, parsed, INTERACTIVE_MAX_SCRIPTS, _max_responses())
+            # The scripts depend on the plan as well as the code
+            stage = "execution:" + content_hash(json.dumps(
+                [self.settings_hash, [[r.commands, r.exits, r.text_values] for r in responders]]
+            ))[:16]
+            return self._run_stage(stage, parsed, lambda: self._execute_interactive(workspace, main_file, responders, cancel), cancel)
+        stage = "execution:" + self.settings_hash
+        return self._run_stage(stage, parsed, lambda: self._execute_code(workspace, main_file, cancel), cancel)
+
+    def _run_stage(self, stage: str, parsed: ParsedCodeSet, check, cancel: Optional[threading.Event] = None) -> List[Dict]:
+        """
+        Run a validation stage unless its result for this exact file set
+        is already cached. Results of a cancelled stage are not cached.
+        """
+        if self.cache:
+            cached = self.cache.get(parsed.hash, stage)
+            if cached is not None:
+                self.logger.info(f"Using cached {stage} result for unchanged code")
+                return cached
+
+        errors = check()
+        if cancel is not None and cancel.is_set():
+            return errors
+
+        # Timeouts depend on machine load, not on the code alone
+        if self.cache and not any(e.get("error_type") == "TimeoutError" for e in errors):
+            self.cache.put(parsed.hash, stage, errors)
+        return errors
+
     # ==================== Validation Methods ====================
 
     def _check_json_parsing(self, raw_output: str) -> List[Dict]:
@@ -171,22 +316,19 @@ class DebuggerAgent:
         
         return errors
 
-    def _check_syntax(self, files: Dict[str, str]) -> List[Dict]:
+    def _check_syntax(self, parsed: ParsedCodeSet) -> List[Dict]:
         """
-        Parse each Python file using AST to catch syntax errors.
+        Report the syntax errors found when each Python file was parsed.
         """
         errors = []
         
-        for fname, content in files.items():
-            if not fname.endswith('.py'):
+        for fname, pf in parsed.files.items():
+            if not pf.is_python:
                 self.logger.debug(f"Skipping non-Python file: {fname}")
                 continue
             
-            self.logger.debug(f"Parsing {fname} with AST")
-            try:
-                ast.parse(content)
-                self.logger.debug(f"{fname} syntax is valid")
-            except SyntaxError as e:
+            if pf.syntax_error is not None:
+                e = pf.syntax_error
                 self.logger.error(f"Syntax error in {fname} at line {e.lineno}: {e.msg}")
                 errors.append({
                     "file": fname,
@@ -195,7 +337,8 @@ class DebuggerAgent:
                     "error": f"{e.msg} at line {e.lineno}",
                     "traceback": str(e)
                 })
-            except Exception as e:
+            elif pf.parse_error is not None:
+                e = pf.parse_error
                 self.logger.error(f"Failed to parse {fname}: {str(e)}")
                 errors.append({
                     "file": fname,
@@ -203,132 +346,173 @@ class DebuggerAgent:
                     "error": f"Failed to parse: {str(e)}",
                     "traceback": str(e)
                 })
+            else:
+                self.logger.debug(f"{fname} syntax is valid")
         
         return errors
 
-    def _check_imports(self, files: Dict[str, str], tmpdir: str) -> List[Dict]:
+    def _check_imports(self, parsed: ParsedCodeSet) -> List[Dict]:
         """
         Check if all imports can be resolved.
         This catches missing standard library or third-party imports.
         """
         errors = []
         
-        for fname, content in files.items():
-            if not fname.endswith('.py'):
+        for pf in parsed.python_files():
+            fname = pf.name
+            if pf.tree is None:
+                # Skip import checking if AST parsing failed
+                self.logger.debug(f"Skipping import check for {fname} due to parse error")
                 continue
+
+            imports_found = []
             
-            try:
-                tree = ast.parse(content)
-                imports_found = []
-                
-                for node in ast.walk(tree):
-                    if isinstance(node, ast.Import):
-                        for alias in node.names:
-                            imports_found.append(alias.name)
-                            if not self._can_import(alias.name, tmpdir):
-                                self.logger.warning(f"{fname}: Cannot import '{alias.name}'")
-                                errors.append({
-                                    "file": fname,
-                                    "error_type": "ImportError",
-                                    "error": f"Cannot import '{alias.name}' - module not available",
-                                    "suggestion": "Remove this import or ensure it's a standard library module"
-                                })
-                    
-                    elif isinstance(node, ast.ImportFrom):
-                        module = node.module
-                        if module:
-                            imports_found.append(module)
-                            if not self._can_import(module, tmpdir):
-                                self.logger.warning(f"{fname}: Cannot import from '{module}'")
-                                errors.append({
-                                    "file": fname,
-                                    "error_type": "ImportError",
-                                    "error": f"Cannot import from '{module}' - module not available",
-                                    "suggestion": "Use only standard library modules"
-                                })
+            for node in ast.walk(pf.tree):
+                if isinstance(node, ast.Import):
+                    for alias in node.names:
+                        imports_found.append(alias.name)
+                        if not self._can_import(alias.name, parsed, fname):
+                            self.logger.warning(f"{fname}: Cannot import '{alias.name}'")
+                            errors.append({
+                                "file": fname,
+                                "error_type": "ImportError",
+                                "error": f"Cannot import '{alias.name}' - module not available",
+                                "suggestion": "Remove this import or ensure it's a standard library module"
+                            })
                 
-                if imports_found:
-                    self.logger.debug(f"{fname} imports: {', '.join(set(imports_found))}")
-                            
-            except Exception as e:
-                # Skip import checking if AST parsing fails
-                self.logger.debug(f"Skipping import check for {fname} due to parse error")
-                pass
+                elif isinstance(node, ast.ImportFrom):
+                    module = node.module or ""
+                    target = "." * node.level + module
+                    imports_found.append(target)
+                    if not self._can_import(module, parsed, fname, node.level):
+                        self.logger.warning(f"{fname}: Cannot import from '{target}'")
+                        errors.append({
+                            "file": fname,
+                            "error_type": "ImportError",
+                            "error": f"Cannot import from '{target}' - module not available",
+                            "suggestion": "Use only standard library modules"
+                        })
+            
+            if imports_found:
+                self.logger.debug(f"{fname} imports: {', '.join(set(imports_found))}")
         
         return errors
 
-    def _can_import(self, module_name: str, tmpdir: str) -> bool:
+    def _can_import(self, module_name: str, parsed: ParsedCodeSet, importer: str = "", level: int = 0) -> bool:
         """
         Check if a module can be imported.
-        Allows standard library and local files.
+        Allows the standard library, local files and, if configured,
+        packages installed in the target environment.
+        """
+        resolution = get_resolver(IMPORT_TARGET_PYTHON).resolve(module_name, parsed, importer, level)
+        if resolution:
+            self.logger.debug(f"'{module_name}' resolves to {resolution}")
+        return resolution is not None
+
+    def _check_names(self, parsed: ParsedCodeSet) -> List[Dict]:
+        """
+        Undefined names, names used before assignment and missing stdlib
+        attributes, found from the ASTs. Unused imports are only logged.
         """
-        # Standard library and common built-ins
-        stdlib_modules = {
-            'os', 'sys', 'json', 'math', 'random', 'datetime', 'time',
-            'collections', 're', 'itertools', 'functools', 'pathlib',
-            'typing', 'dataclasses', 'enum', 'abc', 'copy', 'io'
+        errors = []
+        error_types = {
+            "undefined": "NameError",
+            "before_assignment": "UnboundLocalError",
+            "attribute": "AttributeError"
         }
-        
-        base_module = module_name.split('.')[0]
-        
-        if base_module in stdlib_modules:
-            return True
-        
-        # Check if it's a local file
-        if os.path.exists(os.path.join(tmpdir, f"{module_name}.py")):
-            return True
-        
-        return False
 
-    def _execute_code(self, tmpdir: str, main_file: str) -> List[Dict]:
+        for finding in find_name_errors(parsed):
+            if finding["kind"] == "unused_import":
+                self.logger.debug(f"{finding['file']}:{finding['line']} {finding['message']}")
+                continue
+
+            self.logger.warning(f"{finding['file']}:{finding['line']} {finding['message']}")
+            error = {
+                "file": finding["file"],
+                "line": finding["line"],
+                "error_type": error_types[finding["kind"]],
+                "error": f"{finding['message']} (line {finding['line']})"
+            }
+            if finding["suggestion"]:
+                error["suggestion"] = finding["suggestion"]
+            errors.append(error)
+
+        return errors
+
+    def _check_loops(self, parsed: ParsedCodeSet) -> List[Dict]:
+        """
+        Report `while` loops with no way out, before anything is executed.
+        """
+        errors = []
+
+        for loop in find_endless_loops(parsed):
+            if loop["reads_input"]:
+                error = "Input loop has no exit: no command or value ever leaves the loop"
+                suggestion = "Add a quit/exit command (e.g. 'q') that breaks out of the loop or returns"
+            else:
+                error = "Infinite loop: nothing in the loop body can end it"
+                suggestion = "Add a break, return or changing loop condition so the loop terminates"
+            self.logger.warning(f"{loop['file']}:{loop['line']} {error}")
+            errors.append({
+                "file": loop["file"],
+                "line": loop["line"],
+                "error_type": "InfiniteLoop",
+                "error": f"{error} (line {loop['line']})",
+                "suggestion": suggestion
+            })
+
+        return errors
+
+    def _execute_code(self, workspace: Workspace, main_file: str, cancel: Optional[threading.Event] = None) -> List[Dict]:
         """
-        Execute the main file and capture errors.
+        Execute the main file in a warm sandbox worker and capture errors.
         """
         errors = []
         
-        self.logger.debug(f"Executing {main_file} in {tmpdir}")
+        self.logger.debug(f"Executing {main_file} in sandbox pool")
         
-        main_path = os.path.join(tmpdir, main_file)
-        with open(main_path, "r", encoding="utf-8") as f:
-            code_content = f.read()
-            self.logger.debug(f"Main file content (first 200 chars): {code_content[:200]}")
-
-            if "input(" in code_content:
-                self.logger.warning("Code contains input() calls which may cause execution to hang")
-                return []
+        code_content = workspace.files[main_file]
+        self.logger.debug(f"Main file content (first 200 chars): {code_content[:200]}")
 
         try:
-            result = subprocess.run(
-                ["python", main_file],
-                cwd=tmpdir,
-                capture_output=True,
-                text=True,
-                timeout=5,
-                input=""  # Provide empty stdin to avoid hanging
+            result = get_pool().run(
+                workspace,
+                main=main_file,
+                stdin="",  # Provide empty stdin to avoid hanging
+                limits={"timeout": EXECUTION_TIMEOUT},
+                cancel=cancel
             )
 
-            if result.returncode != 0:
-                self.logger.error(f"Execution failed with return code {result.returncode}")
-                # Parse the error to provide better feedback
-                stderr = result.stderr.strip()
-                error_info = self._parse_execution_error(stderr, main_file)
+            if result.get("cancelled"):
+                self.logger.info("Execution stopped after a fatal static error")
+            elif result["timed_out"]:
+                message = self._timeout_message(result)
+                self.logger.error(message)
+                errors.append({
+                    "file": main_file,
+                    "error_type": "TimeoutError",
+                    "error": message,
+                    "suggestion": "Check for infinite loops or blocking input() calls"
+                })
+            elif result.get("limit"):
+                errors.append(self._limit_error(result, main_file))
+            elif result["exit_code"] != 0:
+                self.logger.error(f"Execution failed with return code {result['exit_code']}")
+                stderr = result["stderr"].strip()
+                if result.get("exception"):
+                    error_info = self._exception_error(result["exception"], stderr, main_file)
+                else:
+                    # No structured record (the worker itself failed): parse stderr
+                    error_info = self._parse_execution_error(stderr, main_file)
                 errors.append(error_info)
             else:
-                self.logger.info(f"Execution successful (return code 0)")
+                self.logger.info(f"Execution successful (return code 0, {result['duration']:.2f}s{self._usage_summary(result)})")
                 # Execution succeeded, but check for warnings
-                if result.stderr:
-                    self.logger.warning(f"Execution had warnings: {result.stderr[:200]}")
-                if result.stdout:
-                    self.logger.debug(f"Execution output: {result.stdout[:200]}")
+                if result["stderr"]:
+                    self.logger.warning(f"Execution had warnings: {result['stderr'][:200]}")
+                if result["stdout"]:
+                    self.logger.debug(f"Execution output: {result['stdout'][:200]}")
 
-        except subprocess.TimeoutExpired:
-            self.logger.error("Code execution timed out after 5 seconds")
-            errors.append({
-                "file": main_file,
-                "error_type": "TimeoutError",
-                "error": "Code execution timed out after 5 seconds",
-                "suggestion": "Check for infinite loops or blocking input() calls"
-            })
         except Exception as e:
             self.logger.error(f"Unexpected execution error: {str(e)}")
             errors.append({
@@ -340,6 +524,151 @@ class DebuggerAgent:
         
         return errors
 
+    def _is_interactive(self, parsed: ParsedCodeSet) -> bool:
+        """
+        Whether any file calls input() (or reads sys.stdin).
+        """
+        for pf in parsed.python_files():
+            if pf.tree is None:
+                continue
+            for node in ast.walk(pf.tree):
+                if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == "input":
+                    return True
+                if isinstance(node, ast.Attribute) and node.attr == "stdin":
+                    return True
+        return False
+
+    def _execute_interactive(self, workspace: Workspace, main_file: str, responders,
+                             cancel: Optional[threading.Event] = None) -> List[Dict]:
+        """
+        Run an interactive program once per input script, answering its
+        prompts under a pseudo-terminal. Reports the first script that
+        crashes, hangs, or does not exit when told to.
+        """
+        for i, responder in enumerate(responders, 1):
+            self.logger.debug(f"Interactive run {i}/{len(responders)}: commands={responder.commands} exits={responder.exits}")
+            try:
+                result = run_interactive(
+                    workspace,
+                    main_file,
+                    responder,
+                    read_timeout=INTERACTIVE_READ_TIMEOUT,
+                    timeout=EXECUTION_TIMEOUT,
+                    cancel=cancel
+                )
+            except Exception as e:
+                self.logger.error(f"Unexpected execution error: {str(e)}")
+                return [{
+                    "file": main_file,
+                    "error_type": "RuntimeError",
+                    "error": str(e),
+                    "traceback": ""
+                }]
+
+            if result.get("cancelled"):
+                self.logger.info("Interactive run stopped after a fatal static error")
+                return []
+
+            inputs = ", ".join(repr(line) for line in result["inputs"]) or "no input"
+            stderr = result["stderr"].strip()
+
+            if result["timed_out"]:
+                message = self._timeout_message(result)
+                self.logger.error(f"{message} (inputs: {inputs})")
+                return [{
+                    "file": main_file,
+                    "error_type": "TimeoutError",
+                    "error": f"{message} with inputs {inputs}",
+                    "suggestion": "Check for infinite loops, and make sure every prompt loop can be left",
+                    "traceback": result["transcript"][-1000:]
+                }]
+
+            if result.get("limit"):
+                error_info = self._limit_error(result, main_file)
+                error_info["error"] = f"{error_info['error']} (with inputs {inputs})"
+                return [error_info]
+
+            if result["input_exhausted"] or (result["exit_code"] != 0 and "EOFError" in stderr):
+                if responder.exit_sent:
+                    self.logger.error(f"Program kept reading input after exit commands (inputs: {inputs})")
+                    return [{
+                        "file": main_file,
+                        "error_type": "InteractiveError",
+                        "error": f"Program did not exit after receiving exit commands {inputs}",
+                        "suggestion": "Provide a menu option or command (e.g. 'q', 'quit' or 'exit') that ends the program",
+                        "traceback": result["transcript"][-1000:]
+                    }]
+                self.logger.warning(f"Input script ran out before the program finished (inputs: {inputs})")
+                continue
+
+            if result["exit_code"] != 0:
+                self.logger.error(f"Execution failed with return code {result['exit_code']} (inputs: {inputs})")
+                if result.get("exception"):
+                    error_info = self._exception_error(result["exception"], stderr, main_file)
+                else:
+                    error_info = self._parse_execution_error(stderr, main_file)
+                error_info["error"] = f"{error_info['error']} (with inputs {inputs})"
+                return [error_info]
+
+            self.logger.info(f"Interactive run {i} successful ({result['duration']:.2f}s{self._usage_summary(result)}, inputs: {inputs})")
+
+        return []
+
+    def _timeout_message(self, result: Dict) -> str:
+        if result.get("stalled"):
+            return describe_stall(result["stalled"], STALL_CPU_TIMEOUT)
+        return f"Code execution timed out after {EXECUTION_TIMEOUT} seconds"
+
+    def _limit_error(self, result: Dict, main_file: str) -> Dict:
+        message = describe_limit(result["limit"], rlimits({}, EXECUTION_TIMEOUT))
+        self.logger.error(f"{message}{self._usage_summary(result)}")
+        frames = (result.get("exception") or {}).get("frames") or [{}]
+        error_info = {
+            "file": frames[-1].get("file", main_file),
+            "error_type": "ResourceLimitError",
+            "error": message,
+            "suggestion": "Avoid unbounded loops, recursion, allocations and output; process data incrementally",
+            "traceback": result["stderr"].strip()[-2000:]
+        }
+        if frames[-1].get("line"):
+            error_info["line"] = frames[-1]["line"]
+        return error_info
+
+    def _usage_summary(self, result: Dict) -> str:
+        resources = result.get("resources") or {}
+        if not resources:
+            return ""
+        return f", {resources['peak_rss_mb']} MB peak, {resources['cpu_seconds']:.2f}s CPU"
+
+    def _exception_error(self, record: Dict, stderr: str, main_file: str) -> Dict:
+        """
+        Error entry from the worker's exception record: located at the
+        innermost frame in the generated files, with the call chain and
+        that frame's local variables.
+        """
+        frames = record.get("frames", [])
+        error_info = {
+            "file": main_file,
+            "error_type": record["type"],
+            "error": record["message"] or record["type"],
+            "traceback": stderr
+        }
+
+        if frames:
+            innermost = frames[-1]
+            error_info["file"] = innermost["file"]
+            error_info["line"] = innermost["line"]
+            error_info["frames"] = [
+                f"{f['file']}:{f['line']} in {f['function']}: {f['source']}" for f in frames
+            ]
+            if innermost["locals"]:
+                error_info["locals"] = innermost["locals"]
+            self.logger.debug(f"Error identified: {record['type']} at {innermost['file']}:{innermost['line']}")
+        else:
+            self.logger.debug(f"Error identified: {record['type']}")
+
+        return error_info
+
     def _parse_execution_error(self, stderr: str, filename: str) -> Dict:
         """
         Parse stderr to extract useful error information.
@@ -383,30 +712,14 @@ class DebuggerAgent:
         
         return result
 
-    def _find_entry_file(self, files: Dict[str, str]) -> str:
+    def _find_entry_file(self, parsed: ParsedCodeSet) -> str:
         """
         Find the main entry point file.
         Priority: main.py > app.py > any file with if __name__ == "__main__"
         """
-        # Check for common entry point names
-        for candidate in ["main.py", "app.py", "run.py"]:
-            if candidate in files:
-                self.logger.debug(f"Entry point found by convention: {candidate}")
-                return candidate
-        
-        # Look for file with __main__ block
-        for fname, content in files.items():
-            if not fname.endswith('.py'):
-                continue
-            if 'if __name__ == "__main__"' in content or "if __name__ == '__main__'" in content:
-                self.logger.debug(f"Entry point found by __main__ check: {fname}")
-                return fname
-        
-        # Fallback: return first .py file
-        for fname in files:
-            if fname.endswith('.py'):
-                self.logger.debug(f"Entry point fallback to first .py file: {fname}")
-                return fname
-        
-        self.logger.warning("No entry point file found")
-        return None
\ No newline at end of file
+        main_file = parsed.entry_file
+        if main_file:
+            self.logger.debug(f"Entry point found: {main_file}")
+        else:
+            self.logger.warning("No entry point file found")
+        return main_file
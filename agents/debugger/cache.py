@@ -0,0 +1,43 @@
+import sys
+import threading
+from typing import Dict, List, Optional
+from utils.store import LRUStore
+
+
+class ValidationCache:
+    """
+    Memoized validation results: file-set hash -> {stage: errors}.
+
+    Keys are salted with the interpreter version, since import and
+    execution results depend on it, and with `version` (the validator's
+    version and settings). File sets live in an LRUStore, persisted to
+    `path` if given. Safe to use from several threads (execution runs
+    alongside the static stages).
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 512, version: str = ""):
+        self.store = LRUStore(path, max_entries)
+        self.salt = "py{}.{}:{}".format(*sys.version_info[:2], version)
+        self.hits = 0
+        self.misses = 0
+        # Stages of one file set are stored together: read-modify-write
+        self._lock = threading.Lock()
+
+    def get(self, files_hash: str, stage: str) -> Optional[List[Dict]]:
+        with self._lock:
+            entry = self.store.get(self._key(files_hash))
+            if entry is None or stage not in entry:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[stage]
+
+    def put(self, files_hash: str, stage: str, errors: List[Dict]):
+        key = self._key(files_hash)
+        with self._lock:
+            entry = dict(self.store.peek(key) or {})
+            entry[stage] = errors
+            self.store.put(key, entry)
+
+    def _key(self, files_hash: str) -> str:
+        return f"{self.salt}:{files_hash}"
@@ -0,0 +1,27 @@
+EXECUTION_TIMEOUT = 5  # seconds
+
+# Validation results memoized by a hash of the file set, per stage
+# (syntax, imports, execution). Set VALIDATION_CACHE_PATH to None to keep
+# the cache in memory only.
+VALIDATION_CACHE_ENABLED = True
+VALIDATION_CACHE_PATH = ".cache/validation.json"
+VALIDATION_CACHE_MAX_ENTRIES = 512
+
+# Part of every cache key: bump it when a check changes what it reports, so
+# results from the older check are not reused
+VALIDATOR_VERSION = 3
+
+# Programs that call input() are run under a pseudo-terminal with scripted
+# answers (see agents/debugger/scripts.py). A prompt is seen as soon as the
+# program blocks reading (runtime/monitor.py); where that cannot be seen,
+# once it has been silent for INTERACTIVE_READ_TIMEOUT seconds, and there
+# the number of answers is capped so those waits take at most half of
+# EXECUTION_TIMEOUT.
+INTERACTIVE_READ_TIMEOUT = 0.3  # seconds
+INTERACTIVE_MAX_SCRIPTS = 2
+INTERACTIVE_MAX_RESPONSES = 25
+
+# Interpreter whose installed (third-party) packages generated code may
+# import, e.g. "/opt/venvs/target/bin/python". None allows only the
+# standard library and the generated files themselves.
+IMPORT_TARGET_PYTHON = None
@@ -0,0 +1,137 @@
+import importlib.util
+import json
+import os
+import pkgutil
+import subprocess
+import sys
+import sysconfig
+import threading
+from typing import Dict, Optional, Set
+from utils.artifacts import ParsedCodeSet
+
+
+# Resolutions, in the order they are tried
+STDLIB = "stdlib"
+LOCAL = "local"
+INSTALLED = "installed"
+
+_ENV_QUERY = (
+    "import json, pkgutil, sys; "
+    "print(json.dumps(sorted({m.name for m in pkgutil.iter_modules()} | set(sys.builtin_module_names))))"
+)
+
+
+class ImportResolver:
+    """
+    Decides whether an import in generated code will resolve when the
+    code runs: standard library (sys.stdlib_module_names), the generated
+    files themselves, or - only if `target_python` is configured - a
+    package installed in that interpreter's environment.
+
+    Stdlib and environment lookups are memoized for the life of the
+    process; local lookups are plain dict lookups on the file set.
+    """
+
+    def __init__(self, target_python: Optional[str] = None):
+        self.target_python = target_python
+        self.stdlib = _stdlib_modules()
+        self._installed: Optional[Set[str]] = None
+        self._memo: Dict[str, Optional[str]] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, module: str, parsed: ParsedCodeSet, importer: str = "", level: int = 0) -> Optional[str]:
+        """
+        Returns STDLIB, LOCAL, INSTALLED, or None if the import would fail.
+
+        importer: file containing the import (for relative imports)
+        level: number of leading dots of a relative import
+        """
+        if level > 0:
+            return LOCAL if self._is_local(_absolute(module, importer, level), parsed, relative=True) else None
+
+        if self._is_local(module, parsed):
+            return LOCAL
+
+        with self._lock:
+            if module not in self._memo:
+                self._memo[module] = self._resolve_external(module)
+            return self._memo[module]
+
+    # ----------------- Resolution -----------------
+
+    def _is_local(self, module: str, parsed: ParsedCodeSet, relative: bool = False) -> bool:
+        path = module.replace(".", "/")
+        if not path:
+            # `from . import x` at the top of the project
+            return relative
+        if f"{path}.py" in parsed.files or f"{path}/__init__.py" in parsed.files:
+            return True
+        # Namespace package: a directory of generated files
+        return any(name.startswith(path + "/") for name in parsed.files)
+
+    def _resolve_external(self, module: str) -> Optional[str]:
+        top = module.split(".")[0]
+        if top in self.stdlib:
+            if "." not in module or _has_spec(module):
+                return STDLIB
+            return None
+        if self.target_python and top in self._installed_modules():
+            return INSTALLED
+        return None
+
+    def _installed_modules(self) -> Set[str]:
+        """Top-level modules importable by the target interpreter, queried once."""
+        if self._installed is None:
+            self._installed = set()
+            try:
+                output = subprocess.run(
+                    [self.target_python, "-c", _ENV_QUERY],
+                    capture_output=True,
+                    text=True,
+                    timeout=30
+                ).stdout
+                self._installed = set(json.loads(output))
+            except (OSError, subprocess.SubprocessError, ValueError):
+                pass
+        return self._installed
+
+
+def _stdlib_modules() -> Set[str]:
+    names = getattr(sys, "stdlib_module_names", None)
+    if names:
+        return set(names)
+    # Python < 3.10: whatever lives in the stdlib directory
+    stdlib_dir = sysconfig.get_paths()["stdlib"]
+    found = {m.name for m in pkgutil.iter_modules([stdlib_dir, os.path.join(stdlib_dir, "lib-dynload")])}
+    return found | set(sys.builtin_module_names)
+
+
+def _has_spec(module: str) -> bool:
+    """Whether a stdlib submodule (e.g. "xml.etree.ElementTree") exists."""
+    try:
+        return importlib.util.find_spec(module) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def _absolute(module: Optional[str], importer: str, level: int) -> str:
+    """`from ..x import y` in "pkg/sub/mod.py" -> "pkg.x"."""
+    parts = importer.split("/")[:-1]
+    if level > 1:
+        parts = parts[:len(parts) - (level - 1)]
+    if module:
+        parts.append(module)
+    return ".".join(parts)
+
+
+_resolver: Optional[ImportResolver] = None
+_resolver_lock = threading.Lock()
+
+
+def get_resolver(target_python: Optional[str] = None) -> ImportResolver:
+    """Process-wide resolver, so the memoized lookups are shared."""
+    global _resolver
+    with _resolver_lock:
+        if _resolver is None or _resolver.target_python != target_python:
+            _resolver = ImportResolver(target_python)
+        return _resolver
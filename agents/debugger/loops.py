@@ -0,0 +1,383 @@
+import ast
+import builtins
+from typing import Dict, List, Optional, Set
+from utils.artifacts import ParsedCodeSet
+
+
+# Calls that end the program from anywhere
+EXIT_CALLS = {"exit", "quit", "sys.exit", "os._exit", "os.abort"}
+
+_SCOPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef)
+_LOOPS = (ast.For, ast.AsyncFor, ast.While)
+_TRIES = (ast.Try, ast.TryStar) if hasattr(ast, "TryStar") else (ast.Try,)
+
+
+def find_endless_loops(parsed: ParsedCodeSet) -> List[Dict]:
+    """
+    `while` loops that can never end, found without running the code.
+
+    A loop can end if its body (outside nested functions) contains a
+    break belonging to it, a return, a raise, a call that exits the
+    program or raises (directly, through a function that does, or through
+    an alias or lambda), a call of something picked at run time (e.g.
+    `COMMANDS[cmd]()`), a reference to an exiting function as a value,
+    or, for `while flag:` / `while self.flag:` loops, something that can
+    change the flag. Inside a `try` (its own, or one around a call of its
+    function) any call can end it, e.g. `next()` raising StopIteration.
+    Generators, async loops and thread targets are meant to run forever
+    and are skipped.
+
+    Returns: [{"file", "line", "reads_input": bool}]
+    """
+    trees = [(pf.name, pf.tree) for pf in parsed.python_files() if pf.tree is not None]
+    known = _known_callables(trees)
+    exit_functions = _exit_functions(trees, known)
+    thread_targets = _thread_targets(trees)
+    guarded_functions = _guarded_calls(trees)
+    stored_attrs = _stored_attributes(trees)
+    global_stores = _global_stores(trees)
+
+    findings = []
+    for fname, tree in trees:
+        aliases = _import_aliases(tree)
+        for owner, loop, guarded in _while_loops(tree):
+            if owner is not None and (owner.name in thread_targets or _is_generator(owner)):
+                continue
+            if isinstance(owner, ast.AsyncFunctionDef):
+                continue
+
+            flags = _loop_flags(loop.test)
+            if flags is None:
+                # Condition too complex to reason about
+                continue
+            if _can_exit(loop, owner, aliases, known, exit_functions):
+                continue
+            if (guarded or (owner is not None and owner.name in guarded_functions)) and _makes_calls(loop):
+                continue
+            if _flag_changes(flags, loop, stored_attrs, global_stores):
+                continue
+
+            findings.append({
+                "file": fname,
+                "line": loop.lineno,
+                "reads_input": _reads_input(loop)
+            })
+    return findings
+
+
+# ----------------- Loop bodies -----------------
+
+def _while_loops(tree: ast.Module):
+    """
+    Yields (enclosing function or None, while loop, whether it is inside
+    the body of a `try` with handlers in that function).
+    """
+    def visit(node, owner, guarded):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                yield from visit(child, child, False)
+            elif isinstance(child, ast.Lambda):
+                continue
+            elif isinstance(child, _TRIES) and child.handlers:
+                for stmt in child.body:
+                    yield from visit_stmt(stmt, owner, True)
+                for part in (child.handlers, child.orelse, child.finalbody):
+                    for stmt in part:
+                        yield from visit_stmt(stmt, owner, guarded)
+            else:
+                yield from visit_stmt(child, owner, guarded)
+
+    def visit_stmt(node, owner, guarded):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            yield from visit(node, node, False)
+            return
+        if isinstance(node, ast.While):
+            yield owner, node, guarded
+        yield from visit(node, owner, guarded)
+
+    yield from visit(tree, None, False)
+
+
+def _own_nodes(body: List[ast.stmt], skip_loops: bool):
+    """
+    Nodes of a loop body, not descending into nested functions or classes
+    (nor into nested loops if `skip_loops`, though their `else` clauses
+    still belong to the enclosing loop).
+    """
+    stack = list(body)
+    while stack:
+        node = stack.pop()
+        if skip_loops and isinstance(node, _LOOPS):
+            stack.extend(node.orelse)
+            continue
+        yield node
+        for child in ast.iter_child_nodes(node):
+            if not isinstance(child, _SCOPES):
+                stack.append(child)
+
+
+def _can_exit(loop: ast.While, owner, aliases: Dict[str, str], known: Set[str], exit_functions: Set[str]) -> bool:
+    # A break only leaves the innermost loop
+    for node in _own_nodes(loop.body, skip_loops=True):
+        if isinstance(node, ast.Break):
+            return True
+
+    for node in _own_nodes(loop.body, skip_loops=False):
+        if isinstance(node, ast.Return) and owner is not None:
+            return True
+        if isinstance(node, ast.Raise):
+            return True
+        if isinstance(node, ast.Call) and _call_may_exit(node.func, aliases, known, exit_functions):
+            return True
+        # An exiting function handed on as a value, e.g. {"q": quit_app}
+        if isinstance(node, (ast.Name, ast.Attribute)) and isinstance(node.ctx, ast.Load):
+            if _is_exit(_call_name(node), aliases, exit_functions):
+                return True
+    return False
+
+
+def _call_may_exit(func: ast.expr, aliases: Dict[str, str], known: Set[str], exit_functions: Set[str]) -> bool:
+    if isinstance(func, (ast.Subscript, ast.Call, ast.Lambda)):
+        # Picked at run time (`COMMANDS[cmd]()`, `COMMANDS.get(cmd)()`):
+        # could be anything
+        return True
+    if isinstance(func, ast.Attribute) and func.attr in exit_functions:
+        return True
+    name = _call_name(func)
+    if name is None:
+        # A method of a computed value, e.g. `input().strip()`
+        return False
+    if _is_exit(name, aliases, exit_functions):
+        return True
+    # A plain name that is not a function, class, import or builtin holds
+    # a callable chosen at run time (`action = COMMANDS[cmd]; action()`)
+    return "." not in name and name not in known
+
+
+def _is_exit(name: Optional[str], aliases: Dict[str, str], exit_functions: Set[str]) -> bool:
+    if name is None:
+        return False
+    return _qualify(name, aliases) in EXIT_CALLS or name.split(".")[-1] in exit_functions
+
+
+def _makes_calls(loop: ast.While) -> bool:
+    return any(isinstance(node, ast.Call) for node in _own_nodes(loop.body, skip_loops=False))
+
+
+def _reads_input(loop: ast.While) -> bool:
+    for node in _own_nodes(loop.body, skip_loops=False):
+        if isinstance(node, ast.Call) and _call_name(node.func) == "input":
+            return True
+    return False
+
+
+# ----------------- Loop conditions -----------------
+
+def _loop_flags(test: ast.expr) -> Optional[Dict[str, Set[str]]]:
+    """
+    What the condition depends on: {"names", "attrs"}. Empty for an
+    always-true constant; None when the condition is anything else.
+    """
+    if isinstance(test, ast.Constant):
+        return {"names": set(), "attrs": set()} if test.value else None
+    if isinstance(test, ast.UnaryOp) and isinstance(test.op, ast.Not):
+        test = test.operand
+    if isinstance(test, ast.Name):
+        return {"names": {test.id}, "attrs": set()}
+    if isinstance(test, ast.Attribute):
+        return {"names": set(), "attrs": {test.attr}}
+    return None
+
+
+def _flag_changes(flags: Dict[str, Set[str]], loop: ast.While, stored_attrs: Set[str], global_stores: Set[str]) -> bool:
+    if flags["attrs"] & stored_attrs:
+        return True
+    if flags["names"] & global_stores:
+        return True
+    for node in _own_nodes(loop.body, skip_loops=False):
+        if isinstance(node, ast.Name) and node.id in flags["names"] and not isinstance(node.ctx, ast.Load):
+            return True
+        # Mutating a collection the loop tests, e.g. `while queue: queue.pop()`
+        if (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Attribute)
+            and isinstance(node.func.value, ast.Name)
+            and node.func.value.id in flags["names"]
+        ):
+            return True
+        if isinstance(node, (ast.Subscript, ast.Delete)):
+            for target in ast.walk(node):
+                if isinstance(target, ast.Name) and target.id in flags["names"]:
+                    return True
+    return False
+
+
+# ----------------- Whole-program facts -----------------
+
+def _exit_functions(trees, known: Set[str]) -> Set[str]:
+    """
+    Names of functions that exit the program or raise (directly, by
+    calling another such function, or by calling something picked at run
+    time). Any exception counts: a caller may be the one catching it to
+    leave its loop. Names bound to a lambda or to another function
+    (`q = lambda: sys.exit(0)`, `bye = quit_app`) count as functions.
+    """
+    calls: Dict[str, Set[str]] = {}
+    exits: Set[str] = set()
+    for _, tree in trees:
+        aliases = _import_aliases(tree)
+        for name, body in _callable_definitions(tree):
+            callees = calls.setdefault(name, set())
+            if isinstance(body, (ast.Name, ast.Attribute)):
+                target = _call_name(body)
+                if target:
+                    callees.add(target.split(".")[-1])
+                    if _qualify(target, aliases) in EXIT_CALLS:
+                        exits.add(name)
+                continue
+            for n in ast.walk(body):
+                if isinstance(n, ast.Raise):
+                    exits.add(name)
+                elif isinstance(n, ast.Call):
+                    target = _call_name(n.func)
+                    if target:
+                        callees.add(target.split(".")[-1])
+                    if _call_may_exit(n.func, aliases, known, set()):
+                        exits.add(name)
+
+    changed = True
+    while changed:
+        changed = False
+        for name, callees in calls.items():
+            if name not in exits and callees & exits:
+                exits.add(name)
+                changed = True
+    return exits
+
+
+def _callable_definitions(tree: ast.Module):
+    """
+    Yields (name, node) for each function definition, and for each name
+    assigned a lambda or another name (`q = lambda: ...`, `bye = quit_app`).
+    """
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            yield node.name, node
+        elif (
+            isinstance(node, ast.Assign)
+            and len(node.targets) == 1
+            and isinstance(node.targets[0], ast.Name)
+            and isinstance(node.value, (ast.Lambda, ast.Name, ast.Attribute))
+        ):
+            yield node.targets[0].id, node.value
+
+
+def _known_callables(trees) -> Set[str]:
+    """Names that resolve to a definition: functions, classes, imports, builtins."""
+    names = set(dir(builtins))
+    for _, tree in trees:
+        names.update(_import_aliases(tree))
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ClassDef):
+                names.add(node.name)
+        names.update(name for name, _ in _callable_definitions(tree))
+    return names
+
+
+def _import_aliases(tree: ast.Module) -> Dict[str, str]:
+    """`import sys as s` -> {"s": "sys"}; `from sys import exit as bye` -> {"bye": "sys.exit"}."""
+    aliases = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.asname:
+                    aliases[alias.asname] = alias.name
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            for alias in node.names:
+                aliases[alias.asname or alias.name] = f"{node.module}.{alias.name}"
+    return aliases
+
+
+def _qualify(name: str, aliases: Dict[str, str]) -> str:
+    """`bye` -> "sys.exit", `s.exit` -> "sys.exit" under the file's imports."""
+    head, _, rest = name.partition(".")
+    head = aliases.get(head, head)
+    return f"{head}.{rest}" if rest else head
+
+
+def _guarded_calls(trees) -> Set[str]:
+    """Functions called inside the body of a `try` that has handlers."""
+    names = set()
+    for _, tree in trees:
+        for node in ast.walk(tree):
+            if isinstance(node, _TRIES) and node.handlers:
+                for stmt in node.body:
+                    for n in ast.walk(stmt):
+                        if isinstance(n, ast.Call):
+                            name = _call_name(n.func)
+                            if name:
+                                names.add(name.split(".")[-1])
+    return names
+
+
+def _thread_targets(trees) -> Set[str]:
+    """Functions handed to threads/processes as `target=`."""
+    targets = set()
+    for _, tree in trees:
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Call):
+                for kw in node.keywords:
+                    if kw.arg == "target":
+                        name = _call_name(kw.value)
+                        if name:
+                            targets.add(name.split(".")[-1])
+    return targets
+
+
+def _stored_attributes(trees) -> Set[str]:
+    """
+    Attributes assigned anywhere with something other than a true
+    constant (`self.running = False`, `self.done = check()`).
+    """
+    attrs = set()
+    for _, tree in trees:
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.Assign, ast.AnnAssign, ast.AugAssign)):
+                targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+                value = node.value
+                if isinstance(value, ast.Constant) and value.value and not isinstance(node, ast.AugAssign):
+                    continue
+                for target in targets:
+                    for t in ast.walk(target):
+                        if isinstance(t, ast.Attribute):
+                            attrs.add(t.attr)
+    return attrs
+
+
+def _global_stores(trees) -> Set[str]:
+    """Names declared global/nonlocal (and so changeable) inside functions."""
+    names = set()
+    for _, tree in trees:
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.Global, ast.Nonlocal)):
+                names.update(node.names)
+    return names
+
+
+def _is_generator(func: ast.AST) -> bool:
+    for node in _own_nodes(func.body, skip_loops=False):
+        if isinstance(node, (ast.Yield, ast.YieldFrom)):
+            return True
+    return False
+
+
+def _call_name(node: ast.AST) -> Optional[str]:
+    """Dotted name of a call target: `sys.exit`, `self.quit` -> "self.quit"."""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if isinstance(node, ast.Name):
+        parts.append(node.id)
+        return ".".join(reversed(parts))
+    return None
@@ -0,0 +1,465 @@
+import ast
+import builtins
+import difflib
+import importlib
+import sys
+from typing import Dict, List, Optional, Set, Tuple
+from runtime.config import PRELOAD_MODULES
+from utils.artifacts import ParsedCodeSet
+
+
+BUILTINS = set(dir(builtins))
+MODULE_NAMES = {"__name__", "__file__", "__doc__", "__builtins__", "__spec__",
+                "__loader__", "__package__", "__annotations__", "__path__"}
+CLASS_NAMES = {"__qualname__", "__module__"}
+
+# Handlers that make a missing name or attribute in the `try` body deliberate
+GUARD_EXCEPTIONS = {"NameError", "AttributeError", "ImportError", "Exception", "BaseException"}
+
+# Attributes are checked only on stdlib modules already loaded in this
+# process or preloaded by the sandbox workers anyway: importing anything
+# else could have side effects
+STDLIB_MODULES = set(getattr(sys, "stdlib_module_names", ()))
+
+Position = Tuple[int, int]
+
+
+class Scope:
+    def __init__(self, kind: str, parent: Optional["Scope"] = None):
+        self.kind = kind                          # module, function, class, comprehension
+        self.parent = parent
+        self.bindings: Dict[str, Position] = {}   # name -> first binding position
+        self.imports: Dict[str, Tuple[str, int]] = {}  # name -> (module, line)
+        self.globals: Set[str] = set()
+        self.nonlocals: Set[str] = set()
+        self.uses: List[Tuple[str, Position, bool, bool]] = []  # (name, position, in a loop, guarded)
+        self.star_import = False
+
+    def bind(self, name: str, pos: Position):
+        if name not in self.bindings or pos < self.bindings[name]:
+            self.bindings[name] = pos
+
+
+class _ScopeBuilder(ast.NodeVisitor):
+    """
+    Builds the scope tree of one module: what each scope binds and which
+    names it reads, in source order. Annotations are not visited (they
+    may be strings, or postponed by `from __future__ import annotations`).
+    """
+
+    def __init__(self):
+        self.module = Scope("module")
+        self.scopes: List[Scope] = [self.module]
+        self.scope = self.module
+        self.loop_depth = 0
+        self.guard_depth = 0
+        self.dynamic_globals = False
+        self.global_names: Set[str] = set()
+        self.attributes: List[Tuple[Scope, ast.Attribute, bool]] = []
+        self.stored_attributes: Set[Tuple[str, str]] = set()
+        self.loaded: Set[str] = set()
+        self.exported: Set[str] = set()
+        self._bind_at: Optional[Position] = None
+
+    # ----------------- Scopes -----------------
+
+    def _enter(self, kind: str) -> Tuple[Scope, int]:
+        previous = (self.scope, self.loop_depth)
+        self.scope = Scope(kind, self.scope)
+        self.scopes.append(self.scope)
+        if kind != "comprehension":
+            self.loop_depth = 0
+        return previous
+
+    def _leave(self, previous: Tuple[Scope, int]):
+        self.scope, self.loop_depth = previous
+
+    def _bind(self, name: str, node: ast.AST, scope: Optional[Scope] = None):
+        pos = self._bind_at or (node.lineno, node.col_offset)
+        (scope or self.scope).bind(name, pos)
+
+    def _use(self, name: str, node: ast.AST):
+        self.scope.uses.append((name, (node.lineno, node.col_offset), self.loop_depth > 0, self.guard_depth > 0))
+        self.loaded.add(name)
+
+    def _visit_arguments(self, args: ast.arguments):
+        """Defaults belong to the enclosing scope."""
+        for default in args.defaults + [d for d in args.kw_defaults if d is not None]:
+            self.visit(default)
+
+    def _bind_arguments(self, args: ast.arguments):
+        for arg in args.posonlyargs + args.args + args.kwonlyargs + [args.vararg, args.kwarg]:
+            if arg is not None:
+                self._bind(arg.arg, arg)
+
+    def visit_FunctionDef(self, node):
+        for decorator in node.decorator_list:
+            self.visit(decorator)
+        self._visit_arguments(node.args)
+        self._bind(node.name, node)
+
+        previous = self._enter("function")
+        self._bind_arguments(node.args)
+        if previous[0].kind == "class":
+            self.scope.bind("__class__", (node.lineno, node.col_offset))
+        for stmt in node.body:
+            self.visit(stmt)
+        self._leave(previous)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_Lambda(self, node):
+        self._visit_arguments(node.args)
+        previous = self._enter("function")
+        self._bind_arguments(node.args)
+        self.visit(node.body)
+        self._leave(previous)
+
+    def visit_ClassDef(self, node):
+        for expr in node.decorator_list + node.bases + [k.value for k in node.keywords]:
+            self.visit(expr)
+
+        previous = self._enter("class")
+        for name in CLASS_NAMES:
+            self.scope.bind(name, (node.lineno, node.col_offset))
+        for stmt in node.body:
+            self.visit(stmt)
+        self._leave(previous)
+        self._bind(node.name, node)
+
+    def _visit_comprehension(self, node, elements):
+        previous = self._enter("comprehension")
+        for generator in node.generators:
+            self.visit(generator.iter)
+            self.visit(generator.target)
+            for condition in generator.ifs:
+                self.visit(condition)
+        for element in elements:
+            self.visit(element)
+        self._leave(previous)
+
+    def visit_ListComp(self, node):
+        self._visit_comprehension(node, [node.elt])
+
+    visit_SetComp = visit_GeneratorExp = visit_ListComp
+
+    def visit_DictComp(self, node):
+        self._visit_comprehension(node, [node.key, node.value])
+
+    # ----------------- Bindings -----------------
+
+    def visit_Name(self, node):
+        if isinstance(node.ctx, ast.Load):
+            self._use(node.id, node)
+        else:
+            self._bind(node.id, node)
+
+    def visit_Assign(self, node):
+        # The targets are bound only once the value has been evaluated
+        self.visit(node.value)
+        self._bind_at = (node.end_lineno, node.end_col_offset)
+        for target in node.targets:
+            self.visit(target)
+        self._bind_at = None
+        self._note_attribute_stores(node.targets)
+
+        # Names listed in __all__ count as used
+        if any(isinstance(t, ast.Name) and t.id == "__all__" for t in node.targets):
+            if isinstance(node.value, (ast.List, ast.Tuple)):
+                self.exported.update(
+                    e.value for e in node.value.elts if isinstance(e, ast.Constant) and isinstance(e.value, str)
+                )
+
+    def visit_AugAssign(self, node):
+        self.visit(node.value)
+        if isinstance(node.target, ast.Name):
+            self._use(node.target.id, node.target)
+        self._bind_at = (node.end_lineno, node.end_col_offset)
+        self.visit(node.target)
+        self._bind_at = None
+        self._note_attribute_stores([node.target])
+
+    def visit_AnnAssign(self, node):
+        if node.value is not None:
+            self.visit(node.value)
+        self._bind_at = (node.end_lineno, node.end_col_offset)
+        self.visit(node.target)
+        self._bind_at = None
+        self._note_attribute_stores([node.target])
+
+    def visit_NamedExpr(self, node):
+        self.visit(node.value)
+        # Binds in the enclosing non-comprehension scope
+        scope = self.scope
+        while scope.kind == "comprehension" and scope.parent is not None:
+            scope = scope.parent
+        self._bind(node.target.id, node.target, scope)
+
+    def visit_arg(self, node):
+        # Annotations are skipped
+        pass
+
+    def visit_Global(self, node):
+        self.scope.globals.update(node.names)
+        self.global_names.update(node.names)
+
+    def visit_Nonlocal(self, node):
+        self.scope.nonlocals.update(node.names)
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            name = alias.asname or alias.name.split(".")[0]
+            self._bind(name, node)
+            module = alias.name if alias.asname else alias.name.split(".")[0]
+            self.scope.imports.setdefault(name, (module, node.lineno))
+
+    def visit_ImportFrom(self, node):
+        for alias in node.names:
+            if alias.name == "*":
+                self.scope.star_import = True
+                continue
+            name = alias.asname or alias.name
+            self._bind(name, node)
+            if node.module != "__future__":
+                self.scope.imports.setdefault(name, ("", node.lineno))
+
+    def visit_ExceptHandler(self, node):
+        if node.type is not None:
+            self.visit(node.type)
+        if node.name:
+            self._bind(node.name, node)
+        for stmt in node.body:
+            self.visit(stmt)
+
+    def visit_MatchAs(self, node):
+        if node.pattern is not None:
+            self.visit(node.pattern)
+        if node.name:
+            self._bind(node.name, node)
+
+    def visit_MatchStar(self, node):
+        if node.name:
+            self._bind(node.name, node)
+
+    def visit_MatchMapping(self, node):
+        self.generic_visit(node)
+        if node.rest:
+            self._bind(node.rest, node)
+
+    # ----------------- Loops, guards and attributes -----------------
+
+    def _visit_loop(self, node):
+        self.loop_depth += 1
+        self.generic_visit(node)
+        self.loop_depth -= 1
+
+    visit_For = visit_AsyncFor = visit_While = _visit_loop
+
+    def visit_Try(self, node):
+        # `try: WindowsError / except NameError:` and the like
+        caught = set()
+        for handler in node.handlers:
+            if handler.type is None:
+                caught.add("BaseException")
+            for t in ast.walk(handler.type) if handler.type is not None else []:
+                if isinstance(t, ast.Name):
+                    caught.add(t.id)
+        guarded = bool(caught & GUARD_EXCEPTIONS)
+
+        self.guard_depth += guarded
+        for stmt in node.body:
+            self.visit(stmt)
+        self.guard_depth -= guarded
+        for part in node.handlers + node.orelse + node.finalbody:
+            self.visit(part)
+
+    visit_TryStar = visit_Try
+
+    def visit_If(self, node):
+        # `if hasattr(os, "startfile"):`, `if sys.platform == "win32":`
+        self.visit(node.test)
+        guarded = any(
+            (isinstance(n, ast.Name) and n.id in ("hasattr", "getattr"))
+            or (isinstance(n, ast.Attribute) and n.attr in ("platform", "name"))
+            for n in ast.walk(node.test)
+        )
+        self.guard_depth += guarded
+        for stmt in node.body + node.orelse:
+            self.visit(stmt)
+        self.guard_depth -= guarded
+
+    def visit_Call(self, node):
+        if isinstance(node.func, ast.Name) and node.func.id in ("globals", "vars"):
+            self.dynamic_globals = True
+        self.generic_visit(node)
+
+    def visit_Attribute(self, node):
+        if isinstance(node.value, ast.Name) and isinstance(node.ctx, ast.Load):
+            self.attributes.append((self.scope, node, self.guard_depth > 0))
+        self.visit(node.value)
+
+    def _note_attribute_stores(self, targets):
+        for target in targets:
+            for node in ast.walk(target):
+                if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name):
+                    self.stored_attributes.add((node.value.id, node.attr))
+
+
+def find_name_errors(parsed: ParsedCodeSet) -> List[Dict]:
+    """
+    Static name resolution over each parsed file, pyflakes-style.
+
+    Returns findings [{"file", "line", "kind", "name", "message",
+    "suggestion"}] where kind is one of:
+    - "undefined": name bound nowhere (NameError), with a close builtin
+      or defined name as suggestion when it looks misspelled
+    - "before_assignment": read before its first assignment in straight-line
+      code (UnboundLocalError, or NameError at module level)
+    - "attribute": attribute a loaded stdlib module does not have
+    - "unused_import": imported but never read (informational)
+    """
+    findings = []
+    for pf in parsed.python_files():
+        if pf.tree is None:
+            continue
+        builder = _ScopeBuilder()
+        builder.visit(pf.tree)
+        findings.extend(_resolve(pf.name, builder))
+    return findings
+
+
+# ----------------- Resolution -----------------
+
+def _resolve(fname: str, builder: _ScopeBuilder) -> List[Dict]:
+    module = builder.module
+    findings = []
+    reported = set()
+
+    def report(kind, name, line, message, suggestion=None):
+        if (kind, name, line) in reported:
+            return
+        reported.add((kind, name, line))
+        findings.append({
+            "file": fname,
+            "line": line,
+            "kind": kind,
+            "name": name,
+            "message": message,
+            "suggestion": suggestion
+        })
+
+    for scope in builder.scopes:
+        for name, pos, in_loop, guarded in scope.uses:
+            owner = _lookup(name, scope, module, builder.global_names)
+            if owner is None:
+                if module.star_import or builder.dynamic_globals or guarded:
+                    continue
+                if _in_enclosing_class(name, scope):
+                    suggestion = f"Class attributes are not visible inside methods: use 'self.{name}'"
+                else:
+                    closest = _closest(name, _visible_names(scope))
+                    suggestion = f"Did you mean '{closest}'?" if closest else None
+                report("undefined", name, pos[0], f"Name '{name}' is not defined", suggestion)
+                continue
+
+            if owner is scope and owner.kind in ("function", "module") and not in_loop and not guarded and name in owner.bindings:
+                if owner is module and (name in builder.global_names or name in BUILTINS or name in MODULE_NAMES):
+                    # Assigned by a function called earlier, or a builtin
+                    # until it is rebound
+                    continue
+                if pos < owner.bindings[name]:
+                    where = "local variable" if owner.kind == "function" else "name"
+                    report("before_assignment", name, pos[0],
+                           f"{where.capitalize()} '{name}' is used before it is assigned (line {owner.bindings[name][0]})",
+                           "Assign it before use, or move the definition above this line")
+
+    for scope, node, guarded in builder.attributes:
+        if guarded or node.attr.startswith("_"):
+            continue
+        name = node.value.id
+        owner = _lookup(name, scope, module, builder.global_names)
+        if owner is None or name not in owner.imports:
+            continue
+        module_name = owner.imports[name][0]
+        loaded = _stdlib_module(module_name)
+        if loaded is None:
+            continue
+        if hasattr(loaded, node.attr) or (name, node.attr) in builder.stored_attributes:
+            continue
+        suggestion = _closest(node.attr, set(dir(loaded)))
+        report("attribute", f"{name}.{node.attr}", node.lineno,
+               f"Module '{module_name}' has no attribute '{node.attr}'",
+               f"Did you mean '{name}.{suggestion}'?" if suggestion else None)
+
+    if not fname.endswith("__init__.py"):
+        for scope in builder.scopes:
+            for name, (_, line) in scope.imports.items():
+                if name not in builder.loaded and name not in builder.exported:
+                    report("unused_import", name, line, f"'{name}' is imported but never used")
+
+    findings.sort(key=lambda f: f["line"])
+    return findings
+
+
+def _lookup(name: str, scope: Scope, module: Scope, global_names: Set[str]) -> Optional[Scope]:
+    """
+    Scope that binds `name` as seen from `scope` (LEGB; class bodies are
+    not visible from nested functions). `module` stands in for builtins.
+    """
+    if name in scope.globals:
+        return module if name in module.bindings or name in global_names or name in BUILTINS else None
+
+    current = scope
+    while current is not None:
+        # A comprehension directly in a class body is evaluated there
+        if current is scope or current.kind != "class" or (scope.kind == "comprehension" and current is scope.parent):
+            if name in current.bindings and name not in current.globals and name not in current.nonlocals:
+                return current
+        current = current.parent
+
+    if name in global_names or name in BUILTINS or name in MODULE_NAMES:
+        return module
+    return None
+
+
+def _visible_names(scope: Scope) -> Set[str]:
+    names = set(BUILTINS)
+    current = scope
+    while current is not None:
+        if current is scope or current.kind != "class":
+            names.update(current.bindings)
+        current = current.parent
+    return {n for n in names if not n.startswith("_")}
+
+
+def _in_enclosing_class(name: str, scope: Scope) -> bool:
+    current = scope.parent
+    while current is not None:
+        if current.kind == "class" and name in current.bindings:
+            return True
+        current = current.parent
+    return False
+
+
+def _stdlib_module(name: str):
+    """
+    The loaded stdlib module `name`, if its attributes can be checked:
+    not packages (submodules appear as attributes only once imported) and
+    not `sys`, whose attributes are process state.
+    """
+    if name.split(".")[0] not in STDLIB_MODULES or name == "sys":
+        return None
+    module = sys.modules.get(name)
+    if module is None and name in PRELOAD_MODULES:
+        try:
+            module = importlib.import_module(name)
+        except ImportError:
+            return None
+    if module is None or hasattr(module, "__path__"):
+        return None
+    return module
+
+
+def _closest(name: str, candidates: Set[str]) -> Optional[str]:
+    matches = difflib.get_close_matches(name, sorted(candidates), n=1, cutoff=0.8)
+    return matches[0] if matches else None
@@ -0,0 +1,207 @@
+import ast
+import re
+from typing import Dict, List, Optional
+from utils.artifacts import ParsedCodeSet
+from utils.text import STOPWORDS, tokenize
+
+
+EXIT_WORDS = {"q", "quit", "exit", "x", "bye", "stop", "end", "done", "e"}
+EXIT_LABEL_WORDS = {"quit", "exit", "bye", "stop", "leave"}
+DEFAULT_EXITS = ["q", "quit", "exit"]
+
+CHOICE_HINTS = ("choice", "option", "command", "menu", "select", "action", "choose", "would you like")
+NUMBER_HINTS = ("number", "amount", "age", "guess", "how many", "quantity", "price", "num", "integer",
+                "float", "index", "id", "position", "operand", "first", "second", "value", "score", "count")
+YES_NO = re.compile(r"\(?\b(y/n|yes/no)\b\)?|again\?|continue\?")
+MENU_LINE = re.compile(r"^\s*[\[(]?([A-Za-z0-9]{1,6})[\]).:-]\s+(.+)$")
+RANGE = re.compile(r"(-?\d+)\s*(?:-|to|and)\s*(-?\d+)")
+MAX_COMMAND_LENGTH = 12
+
+
+class ScriptResponder:
+    """
+    Answers an interactive program's prompts from a command script.
+
+    Menu/choice prompts get the next command, then the exit commands;
+    number prompts get sample numbers (bisecting on "too high"/"too low"
+    hints, for guessing games); yes/no prompts get "n"; anything else gets
+    sample text (each value once, then the exit commands). Returns None
+    (EOF) once the exit commands are used up or `max_responses` is reached.
+    """
+
+    def __init__(self, commands: List[str], exits: List[str], text_values: List[str], max_responses: int = 25):
+        self.commands = list(commands)
+        self.exits = list(exits)
+        self.text_values = text_values or ["sample"]
+        self.max_responses = max_responses
+        self.responses = 0
+        self.exit_sent = False
+        self._numbers = ["5", "3", "2"]
+        self._number_index = 0
+        self._text_index = 0
+        self._range: Optional[List[int]] = None
+        self._last_guess: Optional[int] = None
+        self._seen = 0
+
+    def respond(self, output: str) -> Optional[str]:
+        if self.responses >= self.max_responses:
+            return None
+        # Only what the program wrote since the last answer: prompts
+        # without a newline run together with earlier ones
+        new_output = output[self._seen:]
+        self._seen = len(output)
+        prompt = _last_line(new_output).lower()
+
+        if any(hint in prompt for hint in CHOICE_HINTS) or not prompt:
+            answer = self._next_command()
+        elif YES_NO.search(prompt):
+            answer = "n"
+        elif any(hint in prompt for hint in NUMBER_HINTS):
+            answer = self._next_number(output, new_output)
+        elif self.commands:
+            answer = self._next_command()
+        else:
+            answer = self._next_text()
+            if answer is None:
+                answer = self._next_command()
+
+        if answer is not None:
+            self.responses += 1
+        return answer
+
+    def script(self) -> List[str]:
+        """
+        Static input for when prompts cannot be observed: each command
+        followed by sample values, then the exit commands.
+        """
+        lines = []
+        for command in self.commands:
+            lines.extend([command, self._numbers[0], self._numbers[1]])
+        return lines + self.exits
+
+    def _next_command(self) -> Optional[str]:
+        if self.commands:
+            return self.commands.pop(0)
+        if self.exits:
+            self.exit_sent = True
+            return self.exits.pop(0)
+        return None
+
+    def _next_text(self) -> Optional[str]:
+        """Each sample value once; after that free-text prompts get the exit commands."""
+        if self._text_index >= len(self.text_values):
+            return None
+        value = self.text_values[self._text_index]
+        self._text_index += 1
+        return value
+
+    def _next_number(self, output: str, new_output: str) -> str:
+        lowered = new_output.lower()
+        if self._last_guess is not None and self._range is not None:
+            if "high" in lowered or "lower" in lowered:
+                self._range[1] = self._last_guess - 1
+            elif "low" in lowered or "higher" in lowered:
+                self._range[0] = self._last_guess + 1
+
+        if self._range is None:
+            match = RANGE.search(output)
+            if match and "guess" in output.lower():
+                low, high = sorted(int(v) for v in match.groups())
+                self._range = [low, high]
+
+        if self._range is not None and self._range[0] <= self._range[1]:
+            self._last_guess = (self._range[0] + self._range[1]) // 2
+            return str(self._last_guess)
+
+        value = self._numbers[self._number_index % len(self._numbers)]
+        self._number_index += 1
+        return value
+
+
+def build_responders(plan, parsed: ParsedCodeSet, max_scripts: int = 2, max_responses: int = 25) -> List[ScriptResponder]:
+    """
+    Input scripts for an interactive program, derived from the commands
+    its code compares input against, the menu lines and prompts it
+    prints, and the plan's success_criteria. Every script ends with an
+    exit command.
+    """
+    commands, exits = _commands(parsed)
+    if not exits:
+        exits = list(DEFAULT_EXITS)
+    text_values = _text_values(plan)
+
+    scenarios = [[]]                      # straight to the exit command
+    if commands:
+        scenarios.append(commands)        # every command once, then exit
+
+    return [
+        ScriptResponder(scenario, exits, text_values, max_responses)
+        for scenario in scenarios[:max_scripts]
+    ]
+
+
+def _commands(parsed: ParsedCodeSet):
+    """
+    Returns: (commands, exit commands) in order of appearance.
+    """
+    compared: List[str] = []
+    menu: Dict[str, str] = {}
+
+    for pf in parsed.python_files():
+        if pf.tree is None:
+            continue
+        for node in ast.walk(pf.tree):
+            if isinstance(node, ast.Compare):
+                for operand in [node.left] + node.comparators:
+                    for value in _string_constants(operand):
+                        if value not in compared:
+                            compared.append(value)
+            elif isinstance(node, ast.Constant) and isinstance(node.value, str):
+                for line in node.value.split("\n"):
+                    match = MENU_LINE.match(line)
+                    if match and match.group(1) not in menu:
+                        menu[match.group(1)] = match.group(2)
+
+    candidates = []
+    for value in compared + list(menu):
+        value = value.strip()
+        if value and len(value) <= MAX_COMMAND_LENGTH and value != "__main__" and value not in candidates:
+            candidates.append(value)
+
+    commands, exits = [], []
+    for value in candidates:
+        label = menu.get(value, "").lower()
+        if value.lower() in EXIT_WORDS or any(word in label for word in EXIT_LABEL_WORDS):
+            exits.append(value)
+        elif value in menu or value.isdigit() or value.isalpha():
+            commands.append(value)
+    return commands, exits
+
+
+def _string_constants(node: ast.AST) -> List[str]:
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return [node.value]
+    if isinstance(node, (ast.Tuple, ast.List, ast.Set)):
+        return [e.value for e in node.elts if isinstance(e, ast.Constant) and isinstance(e.value, str)]
+    return []
+
+
+def _text_values(plan) -> List[str]:
+    """
+    Sample free-text answers taken from the plan's success criteria,
+    e.g. "User can add a task" -> "task".
+    """
+    values = []
+    criteria = getattr(plan, "success_criteria", None) or []
+    for criterion in criteria:
+        for word in tokenize(criterion):
+            if word not in STOPWORDS and len(word) > 3 and word not in values:
+                values.append(word)
+    return values[:5]
+
+
+def _last_line(output: str) -> str:
+    for line in reversed(output.split("\n")):
+        if line.strip():
+            return line.strip()
+    return ""
@@ -114,30 +114,53 @@
         
 #         return None
 
-import subprocess
-import tempfile
-import os
-from pathlib import Path
+import sys
+import threading
+from concurrent.futures import Future
+from typing import Dict, Optional, Tuple
+from agents.executor.cache import ExecutionCache
+from agents.executor.config import (
+    EXECUTION_TIMEOUT,
+    STALL_CPU_TIMEOUT,
+    STREAM_OUTPUT,
+    OUTPUT_BUFFER_BYTES,
+    EXECUTION_CACHE_ENABLED,
+    EXECUTION_CACHE_PATH,
+    EXECUTION_CACHE_MAX_ENTRIES
+)
+from agents.executor.determinism import find_nondeterminism
+from runtime.limits import describe_limit, rlimits
+from runtime.monitor import describe_stall
+from runtime.pool import get_pool
+from runtime.workspace import get_workspace
+from utils.artifacts import parse_files
 from utils.logger import setup_logger
 
 
 class ExecutorAgent:
     """
-    Agent 5: Executes code locally using subprocess
+    Agent 5: Executes code locally in the warm sandbox pool
     """
     
     def __init__(self):
         self.logger = setup_logger("ExecutorAgent", "executor.log")
+        self._console_lock = threading.Lock()
+        self.cache = ExecutionCache(EXECUTION_CACHE_PATH, EXECUTION_CACHE_MAX_ENTRIES) if EXECUTION_CACHE_ENABLED else None
     
-    def run(self, code) -> dict:
+    def run(self, code, scenarios=None) -> dict:
         """
         code: CodeOutput (Pydantic)
+        scenarios: optional stdin scenarios; when given, runs unattended
+                   through run_scenarios() instead of asking at the console
         Returns: {
             "success": bool,
             "stdout": str,
             "stderr": str
         }
         """
+        if scenarios is not None:
+            return self.run_scenarios(code, scenarios)
+
         self.logger.info("Starting code execution")
         
         main_file = self._find_main_file(code.files)
@@ -179,45 +202,84 @@ class ExecutorAgent:
         if stdin:
             self.logger.debug(f"Input: {stdin}")
         
-        return self._execute_locally(source_code, stdin)
+        return self._execute_locally(code.files, main_file, stdin)
     
-    def _execute_locally(self, source_code: str, stdin: str) -> dict:
-        """Execute code locally using subprocess"""
+    def _execute_locally(self, files: dict, main_file: str, stdin: str) -> dict:
+        """Execute code locally in a warm sandbox worker"""
         
         self.logger.info("Executing code locally")
         
-        # Create a temporary directory and file
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Write the code to a file
-            code_file = Path(tmpdir) / "main.py"
-            with open(code_file, 'w', encoding='utf-8') as f:
-                f.write(source_code)
-            
-            self.logger.debug(f"Code written to temporary file: {code_file}")
-            
-            try:
-                # Execute the code
-                result = subprocess.run(
-                    ["python", str(code_file)],
-                    input=stdin,
-                    capture_output=True,
-                    text=True,
-                    timeout=30,  # 30 second timeout
-                    cwd=tmpdir
+        try:
+            limits = {
+                "timeout": EXECUTION_TIMEOUT,
+                "cpu_timeout": STALL_CPU_TIMEOUT,
+                "output_buffer": OUTPUT_BUFFER_BYTES
+            }
+            if STREAM_OUTPUT:
+                limits["max_output"] = None
+                print("\n" + "="*50)
+                print("EXECUTION OUTPUT (live):")
+                print("="*50, flush=True)
+
+            key, result = self._cached(files, main_file, stdin, limits)
+            if result is not None:
+                if STREAM_OUTPUT:
+                    self._echo("stdout", result["stdout"])
+                    self._echo("stderr", result["stderr"])
+            else:
+                # Execute the code, with all generated files, in the workspace
+                # the debugger already materialized for it
+                result = get_pool().run(
+                    get_workspace(files),
+                    main=main_file,
+                    stdin=stdin,
+                    limits=limits,
+                    on_output=self._echo if STREAM_OUTPUT else None
                 )
+                self._remember(key, result)
+
+            if result["timed_out"]:
+                message = self._timeout_message(result)
+                self.logger.error(message)
+                print("\n" + "="*50)
+                print("EXECUTION FAILED - TIMEOUT")
+                print("="*50)
+                print(message)
+                print("="*50)
                 
-                exit_code = result.returncode
-                stdout = result.stdout
-                stderr = result.stderr
-                
-                self.logger.info(f"Execution completed with exit code: {exit_code}")
-                
-                if stdout:
-                    self.logger.debug(f"Stdout ({len(stdout)} chars): {stdout[:200]}...")
-                if stderr:
-                    self.logger.warning(f"Stderr ({len(stderr)} chars): {stderr[:200]}...")
-                
-                # Display output
+                return {
+                    "success": False,
+                    "error": message
+                }
+            
+            exit_code = result["exit_code"]
+            stdout = result["stdout"]
+            stderr = result["stderr"]
+            resources = result["resources"]
+            dropped = result["output_dropped"]
+            
+            self.logger.info(f"Execution completed with exit code: {exit_code} ({result['duration']:.2f}s)")
+            if resources:
+                self.logger.info(f"Peak memory {resources['peak_rss_mb']} MB, CPU time {resources['cpu_seconds']:.2f}s")
+            if result["limit"]:
+                message = describe_limit(result["limit"], rlimits({}, EXECUTION_TIMEOUT))
+                self.logger.error(message)
+                stderr = f"{stderr}\n{message}".strip()
+            
+            if stdout:
+                self.logger.debug(f"Stdout ({len(stdout)} chars): {stdout[:200]}...")
+            if stderr:
+                self.logger.warning(f"Stderr ({len(stderr)} chars): {stderr[:200]}...")
+            if dropped["stdout"] or dropped["stderr"]:
+                self.logger.info(f"Output beyond the last {OUTPUT_BUFFER_BYTES} bytes per stream not kept "
+                                 f"(dropped {dropped['stdout']} stdout, {dropped['stderr']} stderr bytes)")
+            
+            # Display output
+            if STREAM_OUTPUT:
+                # Already shown as it was written
+                if result["limit"]:
+                    print(f"\n{message}")
+            else:
                 print("\n" + "="*50)
                 print("EXECUTION OUTPUT:")
                 print("="*50)
@@ -230,45 +292,163 @@ class ExecutorAgent:
                 if stderr:
                     print("\n--- STDERR ---")
                     print(stderr)
-                
-                print("="*50)
-                print(f"Exit Code: {exit_code}")
-                print("="*50)
-                
-                return {
-                    "success": exit_code == 0,
-                    "stdout": stdout,
-                    "stderr": stderr,
-                    "output": stdout,
-                    "exit_code": exit_code
-                }
-                
-            except subprocess.TimeoutExpired:
-                self.logger.error("Execution timed out after 30 seconds")
-                print("\n" + "="*50)
-                print("EXECUTION FAILED - TIMEOUT")
-                print("="*50)
-                print("The code execution timed out after 30 seconds")
-                print("="*50)
-                
-                return {
-                    "success": False,
-                    "error": "Execution timed out after 30 seconds"
-                }
-                
-            except Exception as e:
-                self.logger.error(f"Execution error: {str(e)}", exc_info=True)
-                print("\n" + "="*50)
-                print("EXECUTION FAILED - ERROR")
-                print("="*50)
-                print(f"Error: {str(e)}")
-                print("="*50)
-                
-                return {
-                    "success": False,
-                    "error": str(e)
-                }
+            
+            print("="*50)
+            print(f"Exit Code: {exit_code}")
+            print("="*50)
+            
+            return {
+                "success": exit_code == 0 and not result["limit"],
+                "stdout": stdout,
+                "stderr": stderr,
+                "output": stdout,
+                "exit_code": exit_code,
+                "resources": resources,
+                "output_dropped": dropped,
+                "cached": result.get("cached", False)
+            }
+            
+        except Exception as e:
+            self.logger.error(f"Execution error: {str(e)}", exc_info=True)
+            print("\n" + "="*50)
+            print("EXECUTION FAILED - ERROR")
+            print("="*50)
+            print(f"Error: {str(e)}")
+            print("="*50)
+            
+            return {
+                "success": False,
+                "error": str(e)
+            }
     
+    def run_scenarios(self, code, scenarios) -> dict:
+        """
+        Run the program once per stdin scenario, in parallel sandboxes and
+        without touching the console, for batch and service callers.
+
+        scenarios: stdin strings, or {"name": str, "stdin": str, "argv": [...]}
+        Returns: {
+            "success": bool,  # every scenario exited 0 within its limits
+            "scenarios": [{"name", "success", "stdout", "stderr", "exit_code",
+                           "duration", "peak_rss_mb", "error" (if it did not finish)}]
+        }
+        """
+        main_file = self._find_main_file(code.files)
+        if not main_file:
+            self.logger.error("No main file found")
+            return {
+                "success": False,
+                "error": "No main file found to execute",
+                "scenarios": []
+            }
+
+        scenarios = [_scenario(i, s) for i, s in enumerate(scenarios, 1)]
+        self.logger.info(f"Running {len(scenarios)} scenario(s) of {main_file}")
+
+        runs = []
+        for scenario in scenarios:
+            limits = {
+                "timeout": EXECUTION_TIMEOUT,
+                "cpu_timeout": STALL_CPU_TIMEOUT,
+                "output_buffer": OUTPUT_BUFFER_BYTES,
+                "argv": scenario["argv"]
+            }
+            key, result = self._cached(code.files, main_file, scenario["stdin"], limits)
+            if result is not None:
+                future = Future()
+                future.set_result(result)
+            else:
+                # Plain file dicts, not the shared workspace: each run gets its
+                # own scratch directory, so scenarios do not wait for each other
+                future = get_pool().submit(code.files, main=main_file, stdin=scenario["stdin"], limits=limits)
+            runs.append((scenario, key, future))
+
+        results = []
+        for scenario, key, future in runs:
+            try:
+                result = future.result()
+                self._remember(key, result)
+                entry = self._scenario_result(scenario["name"], result)
+            except Exception as e:
+                self.logger.error(f"Scenario {scenario['name']}: execution error: {str(e)}", exc_info=True)
+                entry = {"name": scenario["name"], "success": False, "error": str(e)}
+            results.append(entry)
+
+        passed = sum(entry["success"] for entry in results)
+        self.logger.info(f"{passed}/{len(results)} scenario(s) succeeded")
+        return {
+            "success": passed == len(results),
+            "scenarios": results
+        }
+
+    def _scenario_result(self, name: str, result: dict) -> dict:
+        resources = result["resources"] or {}
+        entry = {
+            "name": name,
+            "success": result["exit_code"] == 0 and not result["timed_out"] and not result["limit"],
+            "stdout": result["stdout"],
+            "stderr": result["stderr"],
+            "exit_code": result["exit_code"],
+            "duration": round(result["duration"], 3),
+            "peak_rss_mb": resources.get("peak_rss_mb"),
+            "cached": result.get("cached", False)
+        }
+        if result["timed_out"]:
+            entry["error"] = self._timeout_message(result)
+        elif result["limit"]:
+            entry["error"] = describe_limit(result["limit"], rlimits({}, EXECUTION_TIMEOUT))
+
+        self.logger.info(f"Scenario {name}: exit code {entry['exit_code']} ({entry['duration']:.2f}s, "
+                         f"peak memory {entry['peak_rss_mb']} MB){' - ' + entry['error'] if 'error' in entry else ''}")
+        return entry
+
+    def _cached(self, files: dict, main_file: str, stdin: str, limits: Dict) -> Tuple[Optional[str], Optional[dict]]:
+        """
+        (cache key, cached result or None). The key is None when results
+        of this code must not be reused because it is not deterministic.
+        """
+        if not self.cache:
+            return None, None
+        parsed = parse_files(files)
+        nondeterministic = find_nondeterminism(parsed)
+        if nondeterministic:
+            first = nondeterministic[0]
+            self.logger.info(f"Not caching: {first['file']}:{first['line']} {first['reason']}")
+            return None, None
+
+        key = self.cache.key(parsed.hash, main_file, stdin, limits)
+        result = self.cache.get(key)
+        if result is not None:
+            self.logger.info("Using the result of an identical earlier run")
+            result["cached"] = True
+        return key, result
+
+    def _remember(self, key: Optional[str], result: dict):
+        # Timeouts and limits depend on machine load; a truncated result
+        # cannot be replayed in full
+        if (
+            key is None
+            or result.get("cached")
+            or result["timed_out"]
+            or result["cancelled"]
+            or result["limit"]
+            or any(result["output_dropped"].values())
+        ):
+            return
+        self.cache.put(key, result)
+
+    def _timeout_message(self, result: dict) -> str:
+        if result["stalled"]:
+            return describe_stall(result["stalled"], STALL_CPU_TIMEOUT)
+        return f"Execution timed out after {EXECUTION_TIMEOUT} seconds"
+
+    def _echo(self, stream: str, text: str):
+        """Show a piece of the program's output as soon as it is written."""
+        console = sys.stderr if stream == "stderr" else sys.stdout
+        with self._console_lock:
+            console.write(text)
+            console.flush()
+
     def _find_main_file(self, files: dict) -> str:
         """Find the main entry point file"""
         for candidate in ["main.py", "app.py", "run.py"]:
@@ -285,4 +465,15 @@ class ExecutorAgent:
             if fname.endswith('.py'):
                 return fname
         
-        return None
\ No newline at end of file
+        return None
+
+
+def _scenario(index: int, scenario) -> dict:
+    """Normalize a scenario given as a stdin string or a dict."""
+    if isinstance(scenario, str):
+        scenario = {"stdin": scenario}
+    return {
+        "name": str(scenario.get("name") or index),
+        "stdin": scenario.get("stdin", ""),
+        "argv": list(scenario.get("argv", []))
+    }
@@ -0,0 +1,31 @@
+import json
+import sys
+from typing import Dict, Optional
+from utils.artifacts import content_hash
+from utils.store import LRUStore
+
+
+class ExecutionCache:
+    """
+    Memoized runs of deterministic programs:
+    (file-set hash, entry file, stdin, limits) -> result dict.
+
+    Keys are salted with the interpreter version. Entries live in an
+    LRUStore, persisted to `path` if given; safe to use from several
+    threads (scenarios run in parallel).
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 128):
+        self.store = LRUStore(path, max_entries)
+        self.salt = "py{}.{}".format(*sys.version_info[:2])
+
+    def key(self, files_hash: str, main: str, stdin: str, limits: Dict) -> str:
+        run = json.dumps([main, stdin, limits], sort_keys=True)
+        return f"{self.salt}:{files_hash}:{content_hash(run)}"
+
+    def get(self, key: str) -> Optional[Dict]:
+        result = self.store.get(key)
+        return dict(result) if result is not None else None
+
+    def put(self, key: str, result: Dict):
+        self.store.put(key, result)
@@ -0,0 +1,22 @@
+EXECUTION_TIMEOUT = 30  # seconds
+
+# Stop a run early once it is clearly stuck (see runtime/monitor.py). More
+# generous than the debugger's defaults: this is the real run, and a slow
+# computation without output is legitimate here.
+STALL_CPU_TIMEOUT = 15.0  # seconds
+
+# Show the program's output live, as it is written, instead of after it
+# exits. Only the most recent OUTPUT_BUFFER_BYTES of each stream are kept
+# for the returned result, so a chatty program does not grow memory; a
+# streamed run is not stopped for the amount it prints.
+STREAM_OUTPUT = True
+OUTPUT_BUFFER_BYTES = 64_000
+
+# Results of deterministic programs are memoized by (code, stdin, limits),
+# so an identical run returns instantly. Programs that read the clock,
+# random numbers, the environment or the network are never cached (see
+# agents/executor/determinism.py). Set EXECUTION_CACHE_PATH to None to
+# keep the cache in memory only.
+EXECUTION_CACHE_ENABLED = True
+EXECUTION_CACHE_PATH = ".cache/execution.json"
+EXECUTION_CACHE_MAX_ENTRIES = 128
@@ -0,0 +1,102 @@
+import ast
+from typing import Dict, List, Optional
+from utils.artifacts import ParsedCodeSet
+
+
+# Modules whose use makes a run's output depend on more than code, stdin
+# and argv: the clock, randomness, the network, other processes or
+# thread scheduling
+NONDETERMINISTIC_MODULES = {
+    "time", "datetime", "random", "secrets", "uuid", "zoneinfo", "sched",
+    "socket", "ssl", "select", "selectors", "urllib", "http", "ftplib",
+    "smtplib", "requests", "subprocess", "threading", "multiprocessing",
+    "concurrent", "asyncio", "signal", "platform", "getpass", "tempfile"
+}
+
+# Environment readers in otherwise deterministic modules
+NONDETERMINISTIC_ATTRIBUTES = {
+    "os.environ", "os.getenv", "os.environb", "os.urandom", "os.getpid",
+    "os.getppid", "os.getlogin", "os.times", "os.cpu_count", "os.getcwd",
+    "os.path.abspath", "os.path.realpath", "os.path.expanduser",
+    "os.path.getmtime", "sys.flags", "Path.home",
+    "Path.cwd", "pathlib.Path.home", "pathlib.Path.cwd"
+}
+
+_OPENERS = {"open", "Path", "pathlib.Path", "os.listdir", "os.scandir", "os.walk"}
+
+
+def find_nondeterminism(parsed: ParsedCodeSet) -> List[Dict]:
+    """
+    What could make two runs of this code with the same stdin and argv
+    print different things, found without running it: the clock, random
+    numbers, environment variables, the network, other processes, files
+    outside the program's directory, or that directory's path (which
+    differs between runs).
+
+    Returns: [{"file", "line", "reason"}]; empty for a deterministic program.
+    """
+    findings = []
+    for pf in parsed.python_files():
+        if pf.tree is None:
+            continue
+        aliases = _module_aliases(pf.tree)
+        for node in ast.walk(pf.tree):
+            reason = _reason(node, aliases)
+            if reason:
+                findings.append({"file": pf.name, "line": getattr(node, "lineno", 0), "reason": reason})
+    return findings
+
+
+def _reason(node: ast.AST, aliases: Dict[str, str]) -> Optional[str]:
+    if isinstance(node, ast.Import):
+        for alias in node.names:
+            if alias.name.split(".")[0] in NONDETERMINISTIC_MODULES:
+                return f"imports {alias.name}"
+    elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+        if node.module.split(".")[0] in NONDETERMINISTIC_MODULES:
+            return f"imports {node.module}"
+        for alias in node.names:
+            if f"{node.module}.{alias.name}" in NONDETERMINISTIC_ATTRIBUTES:
+                return f"uses {node.module}.{alias.name}"
+    elif isinstance(node, ast.Name) and node.id == "__file__":
+        return "uses __file__"
+    elif isinstance(node, ast.Attribute):
+        name = _dotted(node, aliases)
+        if name in NONDETERMINISTIC_ATTRIBUTES:
+            return f"uses {name}"
+    elif isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == "id":
+        # Object addresses differ between runs (string hashes do not: the
+        # sandbox pins PYTHONHASHSEED, see runtime.pool.WORKER_FLAGS)
+        return "uses id()"
+    elif isinstance(node, ast.Call) and node.args:
+        name = _dotted(node.func, aliases)
+        path = node.args[0]
+        if name in _OPENERS and isinstance(path, ast.Constant) and isinstance(path.value, str):
+            if path.value.startswith(("/", "~", "\\")) or path.value[1:3] == ":\\":
+                return f"reads {path.value}"
+    return None
+
+
+def _module_aliases(tree: ast.Module) -> Dict[str, str]:
+    """`import os.path as p` -> {"p": "os.path"}; `from pathlib import Path` -> {"Path": "pathlib.Path"}."""
+    aliases = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.asname:
+                    aliases[alias.asname] = alias.name
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            for alias in node.names:
+                aliases[alias.asname or alias.name] = f"{node.module}.{alias.name}"
+    return aliases
+
+
+def _dotted(node: ast.AST, aliases: Dict[str, str]) -> Optional[str]:
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(aliases.get(node.id, node.id))
+    return ".".join(reversed(parts))
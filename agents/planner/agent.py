@@ -1,11 +1,29 @@
 import json
+import time
 from agents.planner.prompt import (
     PLANNER_SYSTEM_PROMPT,
-    PLANNER_FEW_SHOTS
+    PLANNER_FEW_SHOTS,
+    PLANNER_REPAIR_PROMPT
 )
 from agents.planner.schema import PlannerOutput
-from agents.planner.config import AGENT_NAME
+from agents.planner.cache import PlanCache
+from agents.planner.retrieval import FewShotIndex
+from agents.planner.repair import repair_json
+from agents.planner.config import (
+    AGENT_NAME,
+    PLAN_CACHE_ENABLED,
+    PLAN_CACHE_PATH,
+    PLAN_CACHE_MAX_ENTRIES,
+    FEW_SHOT_STORE_PATH,
+    FEW_SHOT_MAX_EXAMPLES,
+    FEW_SHOT_TOP_K,
+    FEW_SHOT_TOKEN_BUDGET,
+    FEW_SHOT_MIN_EXAMPLES,
+    PLANNER_MAX_REPAIRS,
+    PLANNER_REPAIR_TIME_BUDGET
+)
 from llm.registry import get_model
+from llm.prompt import PromptAssembler
 from utils.logger import setup_logger
 
 class PlannerAgent:
@@ -13,33 +31,122 @@ class PlannerAgent:
     def __init__(self):
         self.llm = get_model(AGENT_NAME)
         self.logger = setup_logger("PlannerAgent", "planner.log")
+        self.cache = PlanCache(PLAN_CACHE_PATH, PLAN_CACHE_MAX_ENTRIES) if PLAN_CACHE_ENABLED else None
+        self.few_shots = FewShotIndex(PLANNER_FEW_SHOTS, FEW_SHOT_STORE_PATH, FEW_SHOT_MAX_EXAMPLES)
 
     def run(self, user_prompt: str) -> PlannerOutput:
         self.logger.info(f"Starting planning for: {user_prompt[:100]}...")
 
-        messages = []
+        if self.cache:
+            cached = self.cache.get(user_prompt)
+            stats = self.cache.stats()
+            if cached is not None:
+                self.logger.info(
+                    f"Plan cache hit: {cached.project_name} "
+                    f"(hit rate {stats['hit_rate']:.0%} over {stats['hits'] + stats['misses']} lookups)"
+                )
+                return cached
+            self.logger.debug(f"Plan cache miss (hit rate {stats['hit_rate']:.0%})")
 
-        for example in PLANNER_FEW_SHOTS:
-            messages.append({"role": "user", "content": example["user"]})
-            messages.append({"role": "assistant", "content": example["assistant"]})
+        examples = self.few_shots.search(
+            user_prompt,
+            top_k=FEW_SHOT_TOP_K,
+            token_budget=FEW_SHOT_TOKEN_BUDGET,
+            min_examples=FEW_SHOT_MIN_EXAMPLES
+        )
+        self.logger.debug(f"Using {len(examples)} few-shot example(s)")
 
-        messages.append({"role": "user", "content": user_prompt})
+        prompt = self._prompt(user_prompt, examples)
+        system_prompt, messages = prompt.build()
+        self.logger.debug(f"Prompt size: {prompt.summary()}")
 
         self.logger.debug("Sending request to LLM")
         raw_output = self.llm.generate(
-            system_prompt=PLANNER_SYSTEM_PROMPT,
+            system_prompt=system_prompt,
             messages=messages
         )
+        repair_started = time.monotonic()
+
+        repairs = 0
+        while True:
+            result, error = self._parse(raw_output)
+            if result is not None:
+                break
+
+            remaining = PLANNER_REPAIR_TIME_BUDGET - (time.monotonic() - repair_started)
+            if repairs >= PLANNER_MAX_REPAIRS or remaining <= 0:
+                self._fail(error, raw_output)
+
+            repairs += 1
+            self.logger.warning(f"Planner output invalid ({error}), re-prompting ({repairs}/{PLANNER_MAX_REPAIRS})")
+            repair_prompt = (
+                self._prompt(user_prompt, examples)
+                .assistant("invalid_plan", raw_output)
+                .user("repair", PLANNER_REPAIR_PROMPT.format(
+                    error=error,
+                    schema=json.dumps(PlannerOutput.model_json_schema())
+                ))
+            )
+            system_prompt, messages = repair_prompt.build()
+            self.logger.debug(f"Repair prompt size: {repair_prompt.summary()}")
+            try:
+                # The re-prompt may only use what is left of the budget
+                raw_output = self.llm.generate(
+                    system_prompt=system_prompt,
+                    messages=messages,
+                    timeout=remaining
+                )
+            except RuntimeError as e:
+                self.logger.error(f"Planner re-prompt failed: {e}")
+                self._fail(error, raw_output)
+
+        self.logger.info(f"Plan generated: {result.project_name}")
+
+        if self.cache:
+            self.cache.put(user_prompt, result)
+
+        return result
+
+    def _prompt(self, user_prompt: str, examples: list) -> PromptAssembler:
+        prompt = PromptAssembler(AGENT_NAME).system("system", PLANNER_SYSTEM_PROMPT)
+        for example in examples:
+            prompt.user("few_shot_user", example["user"])
+            prompt.assistant("few_shot_plan", example["assistant"], minify=True)
+        return prompt.user("request", user_prompt)
 
+    def _fail(self, error: str, raw_output: str):
+        self.logger.error(f"Failed to parse planner output: {error}")
+        self.logger.debug(f"Raw output: {raw_output}")
+        raise ValueError(
+            f"Planner produced invalid JSON:\n{raw_output}"
+        )
+
+    def _parse(self, raw_output: str) -> tuple:
+        """
+        Parse planner output, falling back to local JSON repair.
+        Returns: (PlannerOutput or None, error message of the first failure)
+        """
         try:
-            parsed = json.loads(raw_output)
-            result = PlannerOutput(**parsed)
-            self.logger.info(f"Plan generated: {result.project_name}")
-            return result
-        
+            return PlannerOutput(**json.loads(raw_output)), None
         except Exception as e:
-            self.logger.error(f"Failed to parse planner output: {str(e)}")
-            self.logger.debug(f"Raw output: {raw_output}")
-            raise ValueError(
-                f"Planner produced invalid JSON:\n{raw_output}"
-            )
+            error = str(e)
+
+        try:
+            repaired = json.loads(repair_json(raw_output))
+        except Exception:
+            return None, error
+
+        try:
+            result = PlannerOutput(**repaired)
+            self.logger.info("Planner output repaired locally")
+            return result, None
+        except Exception as e:
+            # Valid JSON after repair, so the schema error is the useful one
+            return None, str(e)
+
+    def record_success(self, user_prompt: str, plan: PlannerOutput):
+        """
+        Add a plan that led to a successful run to the few-shot index.
+        """
+        self.few_shots.add(user_prompt, plan.model_dump_json())
+        self.logger.debug(f"Recorded few-shot example: {plan.project_name}")
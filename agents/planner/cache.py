@@ -0,0 +1,45 @@
+import hashlib
+from typing import Dict, Optional
+from agents.planner.schema import PlannerOutput
+from utils.store import LRUStore
+from utils.text import normalize_request
+
+
+class PlanCache:
+    """
+    Cache of PlannerOutput keyed on a hash of the normalized user request,
+    kept in an LRUStore (in-memory when `path` is None).
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 256):
+        self.store = LRUStore(path, max_entries)
+
+    def key(self, user_prompt: str) -> Optional[str]:
+        """
+        Hash of the normalized request, or None when nothing meaningful
+        is left after normalization (such requests are never cached).
+        """
+        normalized = normalize_request(user_prompt)
+        if not normalized:
+            return None
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    def get(self, user_prompt: str) -> Optional[PlannerOutput]:
+        key = self.key(user_prompt)
+        if key is None:
+            self.store.misses += 1
+            return None
+        entry = self.store.get(key)
+        return PlannerOutput(**entry["plan"]) if entry else None
+
+    def put(self, user_prompt: str, plan: PlannerOutput):
+        key = self.key(user_prompt)
+        if key is None:
+            return
+        self.store.put(key, {
+            "request": normalize_request(user_prompt),
+            "plan": plan.model_dump()
+        })
+
+    def stats(self) -> Dict:
+        return self.store.stats()
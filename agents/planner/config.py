@@ -1 +1,22 @@
 AGENT_NAME = "planner"
+
+# Plan cache: repeated requests (after normalization) reuse the stored plan.
+# Set PLAN_CACHE_PATH to None for an in-memory cache.
+PLAN_CACHE_ENABLED = True
+PLAN_CACHE_PATH = ".cache/plans.json"
+PLAN_CACHE_MAX_ENTRIES = 256
+
+# Dynamic few-shot selection: the most similar past request -> plan pairs
+# (BM25 over the request text) are sent instead of a fixed set.
+FEW_SHOT_STORE_PATH = ".cache/planner_examples.json"
+FEW_SHOT_MAX_EXAMPLES = 500
+FEW_SHOT_TOP_K = 2
+FEW_SHOT_TOKEN_BUDGET = 800
+FEW_SHOT_MIN_EXAMPLES = 1
+
+# Repair loop for malformed plans: local JSON repair first, then up to
+# PLANNER_MAX_REPAIRS re-prompts with the parse error, all within the time
+# budget (measured from the first output): each re-prompt's LLM call gets
+# only the time that is left.
+PLANNER_MAX_REPAIRS = 2
+PLANNER_REPAIR_TIME_BUDGET = 120  # seconds
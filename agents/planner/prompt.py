@@ -115,4 +115,14 @@ PLANNER_FEW_SHOTS = [
 }
 """
     }
-]
\ No newline at end of file
+]
+
+PLANNER_REPAIR_PROMPT = """
+Your previous output could not be used:
+{error}
+
+Return the SAME plan as corrected JSON that matches this schema exactly:
+{schema}
+
+Output ONLY the JSON object. No markdown, no explanations.
+"""
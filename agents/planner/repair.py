@@ -0,0 +1,63 @@
+import re
+
+
+def repair_json(raw_output: str) -> str:
+    """
+    Best-effort local repair of near-valid JSON from the planner:
+    - drops markdown fences and any text around the outermost object
+    - replaces typographic quotes
+    - removes trailing commas before } or ]
+    - closes brackets left open at the end of a truncated output
+    """
+    text = raw_output.strip()
+
+    # Markdown fences
+    text = re.sub(r"^```(?:json)?\s*", "", text)
+    text = re.sub(r"\s*```$", "", text)
+
+    # Text around the outermost object
+    start = text.find("{")
+    end = text.rfind("}")
+    if start == -1:
+        return text
+    text = text[start:end + 1] if end > start else text[start:]
+
+    text = (
+        text.replace("“", '"').replace("”", '"')
+            .replace("‘", "'").replace("’", "'")
+    )
+
+    # Trailing commas
+    text = re.sub(r",\s*([}\]])", r"\1", text)
+
+    return _close_brackets(text)
+
+
+def _close_brackets(text: str) -> str:
+    """
+    Append the closers for any brackets still open outside strings.
+    """
+    stack = []
+    in_string = False
+    escaped = False
+
+    for ch in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            continue
+
+        if ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+        elif ch in "}]" and stack:
+            stack.pop()
+
+    if in_string:
+        text += '"'
+    return text + "".join(reversed(stack))
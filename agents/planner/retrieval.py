@@ -0,0 +1,92 @@
+import math
+from collections import Counter
+from typing import Dict, List, Optional
+from utils.store import LRUStore
+from utils.text import STOPWORDS, tokenize, normalize_request, estimate_tokens
+from llm.prompt import minify_json
+
+
+class FewShotIndex:
+    """
+    Local BM25 index over past successful request -> plan pairs.
+
+    Examples are dicts in the same shape as PLANNER_FEW_SHOTS
+    ({"user": str, "assistant": str}). Seed examples are always indexed;
+    recorded examples are kept in an LRUStore keyed on the normalized
+    request, persisted to `path` when one is given.
+    """
+
+    K1 = 1.5
+    B = 0.75
+
+    def __init__(self, seed_examples: List[Dict], path: Optional[str] = None, max_examples: int = 500):
+        self.store = LRUStore(path, max_examples)
+        self.seed_examples = list(seed_examples)
+        self._build()
+
+    def search(self, query: str, top_k: int = 2, token_budget: int = 800, min_examples: int = 1) -> List[Dict]:
+        """
+        Most similar examples for `query`, best first, whose combined size
+        fits in `token_budget`. At least `min_examples` are returned (the
+        best-ranked ones) so the model always sees the output format.
+        """
+        query_terms = self._terms(query)
+        scored = [(self._score(query_terms, i), i) for i in range(len(self.examples))]
+        scored.sort(key=lambda pair: (-pair[0], pair[1]))
+
+        selected = []
+        used = 0
+        for score, i in scored:
+            if len(selected) >= top_k:
+                break
+            if score <= 0 and len(selected) >= min_examples:
+                break
+
+            example = self.examples[i]
+            cost = estimate_tokens(example["user"]) + estimate_tokens(minify_json(example["assistant"].strip()))
+            if used + cost > token_budget and len(selected) >= min_examples:
+                continue
+
+            selected.append(example)
+            used += cost
+
+        return selected
+
+    def add(self, user_prompt: str, plan_json: str):
+        """
+        Record a successful request -> plan pair. A later plan for the
+        same normalized request replaces the earlier one.
+        """
+        self.store.put(normalize_request(user_prompt), {"user": user_prompt, "assistant": plan_json})
+        self._build()
+
+    # ----------------- BM25 -----------------
+
+    def _terms(self, text: str) -> List[str]:
+        return [t for t in tokenize(text) if t not in STOPWORDS]
+
+    def _build(self):
+        self.examples = self.seed_examples + self.store.values()
+        self.doc_terms = [Counter(self._terms(e["user"])) for e in self.examples]
+        self.doc_lengths = [sum(terms.values()) for terms in self.doc_terms]
+        self.avg_length = (sum(self.doc_lengths) / len(self.doc_lengths)) if self.doc_lengths else 0.0
+
+        doc_freq = Counter()
+        for terms in self.doc_terms:
+            doc_freq.update(terms.keys())
+
+        n = len(self.examples)
+        self.idf = {
+            term: math.log(1 + (n - df + 0.5) / (df + 0.5))
+            for term, df in doc_freq.items()
+        }
+
+    def _score(self, query_terms: List[str], i: int) -> float:
+        terms = self.doc_terms[i]
+        length_norm = 1 - self.B + self.B * (self.doc_lengths[i] / self.avg_length if self.avg_length else 0)
+        score = 0.0
+        for term in query_terms:
+            tf = terms.get(term, 0)
+            if tf:
+                score += self.idf[term] * tf * (self.K1 + 1) / (tf + self.K1 * length_norm)
+        return score
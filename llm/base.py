@@ -4,5 +4,5 @@ from abc import ABC, abstractmethod
 class BaseLLM(ABC):
 
     @abstractmethod
-    def generate(self, system_prompt: str, messages: list) -> str:
+    def generate(self, system_prompt: str, messages: list, timeout: float = None) -> str:
         pass
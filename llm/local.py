@@ -1,11 +1,13 @@
 import subprocess
 
 
+DEFAULT_TIMEOUT = 120  # seconds
+
 class OllamaLLM:
     def __init__(self, model_name: str):
         self.model_name = model_name
 
-    def generate(self, system_prompt: str, messages: list) -> str:
+    def generate(self, system_prompt: str, messages: list, timeout: float = None) -> str:
         prompt = self._build_prompt(system_prompt, messages)
 
         process = subprocess.Popen(
@@ -20,7 +22,7 @@ class OllamaLLM:
         )
 
         try:
-            stdout, stderr = process.communicate(prompt, timeout=120)
+            stdout, stderr = process.communicate(prompt, timeout=timeout or DEFAULT_TIMEOUT)
         except subprocess.TimeoutExpired:
             process.kill()
             raise RuntimeError("Ollama LLM timed out and was killed")
@@ -0,0 +1,126 @@
+import json
+from collections import defaultdict
+from typing import Dict, List, Tuple
+from utils.text import estimate_tokens
+
+
+# Accumulated prompt sizes per agent: {agent: {"calls": n, "sections": {name: tokens}}}
+PROMPT_STATS: Dict[str, Dict] = defaultdict(lambda: {"calls": 0, "sections": defaultdict(int)})
+
+
+def minify_json(text: str) -> str:
+    """
+    Re-serialize embedded JSON without indentation. Text that is not
+    valid JSON is returned unchanged.
+    """
+    try:
+        return json.dumps(json.loads(text), separators=(",", ":"), ensure_ascii=False)
+    except (TypeError, ValueError):
+        return text
+
+
+def compact_whitespace(text: str) -> str:
+    """
+    Strip trailing spaces and collapse runs of blank lines.
+    """
+    lines = [line.rstrip() for line in text.strip().split("\n")]
+    compacted = []
+    for line in lines:
+        if not line and compacted and not compacted[-1]:
+            continue
+        compacted.append(line)
+    return "\n".join(compacted)
+
+
+class PromptAssembler:
+    """
+    Builds an LLM prompt from named sections and accounts for its size.
+
+    - Sections added with minify=True have embedded JSON minified
+    - Consecutive sections for the same role share one message
+    - report() gives estimated tokens per section
+    """
+
+    def __init__(self, agent_name: str):
+        self.agent_name = agent_name
+        self.system_sections: List[Tuple[str, str]] = []
+        self.messages: List[Dict] = []
+        self._sizes: Dict[str, int] = defaultdict(int)
+
+    def system(self, name: str, text: str, minify: bool = False):
+        self.system_sections.append((name, self._prepare(name, text, minify)))
+        return self
+
+    def user(self, name: str, text: str, minify: bool = False):
+        return self._add("user", name, text, minify)
+
+    def assistant(self, name: str, text: str, minify: bool = False):
+        return self._add("assistant", name, text, minify)
+
+    def build(self) -> Tuple[str, List[Dict]]:
+        """
+        Returns: (system_prompt, messages) in the shape BaseLLM.generate takes.
+        """
+        system_prompt = "\n\n".join(text for _, text in self.system_sections if text)
+        messages = [
+            {
+                "role": message["role"],
+                "content": "\n\n".join(text for _, text in message["sections"] if text)
+            }
+            for message in self.messages
+        ]
+        self._record()
+        return system_prompt, messages
+
+    def report(self) -> Dict:
+        return {
+            "agent": self.agent_name,
+            "sections": dict(self._sizes),
+            "total": sum(self._sizes.values())
+        }
+
+    def summary(self) -> str:
+        report = self.report()
+        parts = ", ".join(f"{name} {tokens}" for name, tokens in report["sections"].items())
+        return f"~{report['total']} tokens ({parts})"
+
+    # ----------------- Helpers -----------------
+
+    def _add(self, role: str, name: str, text: str, minify: bool):
+        prepared = self._prepare(name, text, minify)
+        if self.messages and self.messages[-1]["role"] == role:
+            self.messages[-1]["sections"].append((name, prepared))
+        else:
+            self.messages.append({"role": role, "sections": [(name, prepared)]})
+        return self
+
+    def _prepare(self, name: str, text: str, minify: bool) -> str:
+        if not text:
+            return ""
+        if minify:
+            text = minify_json(text.strip())
+        text = compact_whitespace(text)
+        self._sizes[name] += estimate_tokens(text)
+        return text
+
+    def _record(self):
+        stats = PROMPT_STATS[self.agent_name]
+        stats["calls"] += 1
+        for name, tokens in self._sizes.items():
+            stats["sections"][name] += tokens
+
+
+def prompt_size_report() -> Dict[str, Dict]:
+    """
+    Average prompt size per agent and per section since process start.
+    """
+    report = {}
+    for agent, stats in PROMPT_STATS.items():
+        calls = stats["calls"] or 1
+        sections = {name: tokens // calls for name, tokens in stats["sections"].items()}
+        report[agent] = {
+            "calls": stats["calls"],
+            "avg_tokens": sum(sections.values()),
+            "avg_sections": sections
+        }
+    return report
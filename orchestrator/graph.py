@@ -1,21 +1,27 @@
+import json
 from typing import TypedDict, Optional
 from langgraph.graph import StateGraph, END
 from utils.logger import setup_logger
+from llm.prompt import prompt_size_report
+from orchestrator.validator import validate_plan
 
 from agents.planner.agent import PlannerAgent
 from agents.coder.agent import CoderAgent
 from agents.checker.agent import RequirementCheckerAgent
 from agents.debugger.agent import DebuggerAgent
 from agents.executor.agent import ExecutorAgent
+from agents.planner.schema import PlannerOutput
 
 class AgentState(TypedDict):
     user_input: str
     plan: Optional[object]
+    plan_source: Optional[str]
     code: Optional[object]
     raw_coder_output: Optional[str]
     check_result: Optional[dict]
     debug_result: Optional[dict]
     execution_result: Optional[dict]
+    scenarios: Optional[list]
     iteration: int
 
 planner = PlannerAgent()
@@ -26,14 +32,57 @@ executor = ExecutorAgent()
 
 graph_logger = setup_logger("GraphOrchestrator", "graph.log")
 
+def intake_node(state: AgentState):
+    """
+    Accept a ready-made plan so the planner can be skipped.
+
+    An explicit `plan` (PlannerOutput, dict or JSON string) must validate.
+    A `user_input` that is itself a plan-shaped JSON object is used when it
+    validates, otherwise it is planned as normal text.
+    """
+    graph_logger.info("=== INTAKE NODE ===")
+    plan = state.get("plan")
+
+    if plan is not None:
+        plan = _coerce_plan(plan)
+        validate_plan({"plan": plan})
+        graph_logger.info(f"Using supplied plan: {plan.project_name}")
+        return {"plan": plan, "plan_source": "input", "iteration": 0}
+
+    user_input = state.get("user_input", "").strip()
+    if user_input.startswith("{"):
+        try:
+            plan = _coerce_plan(user_input)
+            validate_plan({"plan": plan})
+            graph_logger.info(f"User input is a structured plan: {plan.project_name}")
+            return {"plan": plan, "plan_source": "input", "iteration": 0}
+        except Exception as e:
+            graph_logger.warning(f"User input looks like JSON but is not a valid plan ({e}), planning from text")
+
+    return {"plan": None}
+
+def _coerce_plan(plan):
+    if isinstance(plan, PlannerOutput):
+        return plan
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    if isinstance(plan, dict):
+        return PlannerOutput(**plan)
+    raise TypeError(f"Expected PlannerOutput, dict or JSON string, got {type(plan)}")
+
 def planner_node(state: AgentState):
     graph_logger.info("=== PLANNER NODE ===")
     plan = planner.run(state["user_input"])
-    return {"plan": plan, "iteration": 0}
+    return {"plan": plan, "plan_source": "planner", "iteration": 0}
 
 def coder_node(state: AgentState):
     graph_logger.info(f"=== CODER NODE (Iteration {state.get('iteration', 0)}) ===")
-    code, raw_output = coder.run(state["plan"], state.get("debug_result"))
+    code, raw_output = coder.run(
+        state["plan"],
+        state.get("debug_result"),
+        state.get("check_result"),
+        state.get("iteration", 0)
+    )
     return {"code": code, "raw_coder_output": raw_output}
 
 def checker_node(state: AgentState):
@@ -44,16 +93,28 @@ def checker_node(state: AgentState):
 
 def debugger_node(state: AgentState):
     graph_logger.info("=== DEBUGGER NODE ===")
-    result = debugger.run(state["code"], state.get("raw_coder_output"))
+    result = debugger.run(state["code"], state.get("raw_coder_output"), state.get("plan"))
     graph_logger.info(f"Debug result: {'PASS' if result['correct'] else 'FAIL'}")
+    if result["correct"]:
+        coder.record_validated(state["plan"], state["code"])
     return {"debug_result": result}
 
 def executor_node(state: AgentState):
     graph_logger.info("=== EXECUTOR NODE ===")
-    result = executor.run(state["code"])
+    # With stdin scenarios the executor runs unattended
+    result = executor.run(state["code"], state.get("scenarios"))
     graph_logger.info(f"Execution: {'SUCCESS' if result['success'] else 'FAILED'}")
+    if result["success"] and state.get("plan_source") == "planner":
+        planner.record_success(state["user_input"], state["plan"])
+    for agent, sizes in prompt_size_report().items():
+        graph_logger.info(f"Prompt size [{agent}]: ~{sizes['avg_tokens']} tokens avg over {sizes['calls']} call(s) {sizes['avg_sections']}")
     return {"execution_result": result}
 
+def should_plan(state: AgentState):
+    next_node = "planner" if state.get("plan") is None else "coder"
+    graph_logger.info(f"Routing to: {next_node}")
+    return next_node
+
 def should_check_or_debug(state: AgentState):
     next_node = "debugger" if state["code"] is None else "checker"
     graph_logger.info(f"Routing to: {next_node}")
@@ -69,13 +130,19 @@ def should_continue_after_checker(state: AgentState):
         raise RuntimeError("Failed to satisfy requirements after retries")
 
     graph_logger.warning(f"Requirements incomplete, retry {state['iteration'] + 1}")
-    state["iteration"] += 1
-    return "coder"
+    return "prepare_check_retry"
+
+def prepare_check_retry_node(state: AgentState):
+    """Increment iteration counter before a retry for missing requirements"""
+    graph_logger.warning(f"Preparing requirements retry, iteration {state['iteration']} -> {state['iteration'] + 1}")
+    # The checker's missing requirements are the coder's feedback now
+    return {"iteration": state["iteration"] + 1, "debug_result": None}
 
 def prepare_retry_node(state: AgentState):
     """Increment iteration counter before retry"""
     graph_logger.warning(f"Preparing retry, iteration {state['iteration']} -> {state['iteration'] + 1}")
-    return {"iteration": state["iteration"] + 1}
+    # The debugger's errors are the coder's feedback now
+    return {"iteration": state["iteration"] + 1, "check_result": None}
 
 
 def should_continue_after_debugger(state: AgentState):
@@ -94,14 +161,25 @@ def build_graph():
 
     graph = StateGraph(AgentState)
 
+    graph.add_node("intake", intake_node)
     graph.add_node("planner", planner_node)
     graph.add_node("coder", coder_node)
     graph.add_node("checker", checker_node)
     graph.add_node("debugger", debugger_node)
     graph.add_node("executor", executor_node)
     graph.add_node("prepare_retry", prepare_retry_node)  
+    graph.add_node("prepare_check_retry", prepare_check_retry_node)
 
-    graph.set_entry_point("planner")
+    graph.set_entry_point("intake")
+
+    graph.add_conditional_edges(
+        "intake",
+        should_plan,
+        {
+            "planner": "planner",
+            "coder": "coder",
+        },
+    )
 
     graph.add_edge("planner", "coder")
     
@@ -118,7 +196,7 @@ def build_graph():
         "checker",
         should_continue_after_checker,
         {
-            "coder": "coder",
+            "prepare_check_retry": "prepare_check_retry",
             "debugger": "debugger",
         },
     )
@@ -133,5 +211,6 @@ def build_graph():
     )
 
     graph.add_edge("prepare_retry", "coder")  
+    graph.add_edge("prepare_check_retry", "coder")
 
     return graph.compile()
\ No newline at end of file
@@ -54,17 +54,39 @@
 
 
 from orchestrator.graph import build_graph
+from runtime.workspace import release_workspaces
 import json
+import sys
 
 def main():
     print("=== Agentic Builder (LangGraph) ===\n")
-    user_input = input("Describe what you want to build:\n> ")
+
+    args = sys.argv[1:]
+    # Stdin scenarios run the program unattended instead of asking for input:
+    # python -m orchestrator.run plan.json --scenarios scenarios.json
+    # (a JSON list of stdin strings or {"name", "stdin", "argv"} objects)
+    scenarios = None
+    if "--scenarios" in args:
+        i = args.index("--scenarios")
+        with open(args[i + 1], "r", encoding="utf-8") as f:
+            scenarios = json.load(f)
+        del args[i:i + 2]
+
+    # A plan file skips the planner: python -m orchestrator.run plan.json
+    if args:
+        with open(args[0], "r", encoding="utf-8") as f:
+            initial_state = {"user_input": "", "plan": json.load(f)}
+    else:
+        user_input = input("Describe what you want to build:\n> ")
+        initial_state = {"user_input": user_input}
+    initial_state["scenarios"] = scenarios
 
     graph = build_graph()
 
-    final_state = graph.invoke(
-        {"user_input": user_input}
-    )
+    try:
+        final_state = graph.invoke(initial_state)
+    finally:
+        release_workspaces()
 
     plan = final_state["plan"]
     code = final_state["code"]
@@ -79,7 +101,20 @@ def main():
         print(content)
 
     print("\n--- EXECUTION RESULT ---")
-    if execution_result["success"]:
+    if "scenarios" in execution_result:
+        if execution_result.get("error"):
+            print(f"Error: {execution_result['error']}")
+        for scenario in execution_result["scenarios"]:
+            status = "ok" if scenario["success"] else "FAILED"
+            print(f"[{scenario['name']}] {status}: exit code {scenario.get('exit_code')}, "
+                  f"{scenario.get('duration', 0):.2f}s, peak memory {scenario.get('peak_rss_mb')} MB")
+            if scenario.get("error"):
+                print(f"Error: {scenario['error']}")
+            if scenario.get("stdout"):
+                print(scenario["stdout"])
+            if scenario.get("stderr"):
+                print(f"Stderr: {scenario['stderr']}")
+    elif execution_result["success"]:
         print("Execution successful\n")
         print("Output:")
         print(execution_result["stdout"])
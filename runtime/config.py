@@ -0,0 +1,42 @@
+import os
+
+# Warm interpreter pool used by the debugger and the executor
+POOL_SIZE = min(4, os.cpu_count() or 2)
+
+# Imported by every worker before it receives a job, so generated programs
+# find them already loaded
+PRELOAD_MODULES = [
+    "os", "sys", "json", "math", "random", "datetime", "time", "re",
+    "collections", "itertools", "functools", "string", "typing",
+    "dataclasses", "enum", "csv", "statistics", "traceback", "runpy"
+]
+
+DEFAULT_TIMEOUT = 5  # seconds
+
+# Stall detection (runtime/monitor.py, Linux only): a job is stopped as soon
+# as it blocks reading stdin that has run out, or spins a CPU for
+# STALL_CPU_TIMEOUT seconds without output (overridable per job through
+# `limits`). A sleeping program is only stopped by the job's timeout.
+# Sandboxed programs run unbuffered (-u), so their output is seen as it is
+# written.
+MONITOR_INTERVAL = 0.02  # seconds between samples
+STALL_CPU_TIMEOUT = 2.0  # seconds
+
+# Resource limits applied to every sandboxed program (Linux/macOS rlimits,
+# set by the worker just before it runs the job). Each can be overridden
+# per job through `limits`. The CPU-seconds limit defaults to the job's
+# wall-clock timeout.
+SANDBOX_MEMORY_MB = 512        # address space
+SANDBOX_FILE_SIZE_MB = 16      # largest file the program may write
+SANDBOX_OPEN_FILES = 64
+SANDBOX_PROCESSES = 16         # beyond those the user already runs
+MAX_OUTPUT_BYTES = 1_000_000   # per stream; the run is stopped beyond this
+
+# Output kept per stream for a job's result: the most recent bytes, in a
+# ring buffer (runtime/output.py)
+OUTPUT_BUFFER_BYTES = 1_000_000
+
+# Where generated code is materialized for runs (runtime/workspace.py).
+# None picks /dev/shm (tmpfs) when available, else the system temp dir.
+WORKSPACE_ROOT = None
+MAX_WORKSPACES = 4  # file sets kept materialized at once
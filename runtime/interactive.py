@@ -0,0 +1,232 @@
+import json
+import os
+import select
+import shutil
+import subprocess
+import sys
+import time
+import threading
+from typing import Dict, List, Optional, Union
+from runtime.config import (
+    PRELOAD_MODULES,
+    DEFAULT_TIMEOUT,
+    MONITOR_INTERVAL,
+    STALL_CPU_TIMEOUT,
+    MAX_OUTPUT_BYTES
+)
+from runtime.limits import kill_group, limit_exceeded, reap, rlimits
+from runtime.monitor import AWAITING_INPUT, StallMonitor
+from runtime.pool import WORKER_FLAGS, WORKER_PATH, get_pool, read_report, worker_env
+from runtime.workspace import Workspace, run_directory
+
+try:
+    import pty
+    import termios
+except ImportError:  # Windows
+    pty = None
+
+
+# Consecutive EOFs sent to a program that keeps reading before it is killed
+MAX_EOFS = 2
+
+
+def run_interactive(files: Union[Workspace, Dict[str, str]], main: str, responder, read_timeout: float = 0.5,
+                    timeout: float = DEFAULT_TIMEOUT, cancel: Optional[threading.Event] = None) -> Dict:
+    """
+    Run an interactive program under a pseudo-terminal, answering its
+    prompts as they appear.
+
+    As soon as the program blocks reading the terminal (see
+    runtime.monitor), `responder.respond(output_so_far)` supplies the next
+    input line (None sends EOF). Where /proc is not available, a program
+    silent for `read_timeout` seconds is assumed to be waiting instead.
+    Without pty support the responder's static `script()` is piped in
+    through the warm pool.
+
+    Returns the pool result dict plus:
+        {"inputs": [lines sent], "transcript": str,
+         "input_exhausted": bool}  # still reading after repeated EOFs
+    """
+    if pty is None:
+        lines = responder.script()
+        result = get_pool().run(files, main=main, stdin="\n".join(lines) + "\n", limits={"timeout": timeout}, cancel=cancel)
+        result["inputs"] = lines
+        result["transcript"] = result["stdout"]
+        result["input_exhausted"] = False
+        return result
+
+    with run_directory(files) as workdir:
+        try:
+            return _run_pty(workdir, main, responder, read_timeout, timeout, cancel)
+        finally:
+            shutil.rmtree(workdir + ".tmp", ignore_errors=True)
+
+
+def _run_pty(workdir: str, main: str, responder, read_timeout: float, timeout: float,
+             cancel: Optional[threading.Event]) -> Dict:
+    master, slave = pty.openpty()
+
+    # No echo: the transcript records inputs itself
+    attrs = termios.tcgetattr(slave)
+    attrs[3] &= ~termios.ECHO
+    termios.tcsetattr(slave, termios.TCSANOW, attrs)
+
+    report = workdir + ".exception.json"
+    job = json.dumps({
+        "cwd": workdir,
+        "main": main,
+        "argv": [],
+        "report": report,
+        "tmp": workdir + ".tmp",
+        "rlimits": rlimits({}, timeout)
+    })
+    proc = subprocess.Popen(
+        [sys.executable, *WORKER_FLAGS, WORKER_PATH, json.dumps(PRELOAD_MODULES), job],
+        env=worker_env(),
+        stdin=slave,
+        stdout=slave,
+        stderr=subprocess.PIPE,
+        cwd=workdir,
+        start_new_session=True
+    )
+    os.close(slave)
+
+    # On a terminal, input() writes its prompt to stderr, so both streams
+    # count as program output when deciding what it is asking for
+    err = proc.stderr.fileno()
+    streams = [master, err]
+    stdout_chunks: List[str] = []
+    stderr_chunks: List[str] = []
+    output: List[str] = []
+    transcript: List[str] = []
+    inputs: List[str] = []
+
+    def pump(wait: float) -> bool:
+        """Read whatever the program has written; False once the terminal closed."""
+        ready, _, _ = select.select(streams, [], [], wait)
+        for fd in ready:
+            try:
+                data = os.read(fd, 4096)
+            except OSError:
+                # EIO: the program closed the terminal (exited)
+                data = b""
+            if not data:
+                streams.remove(fd)
+                continue
+            text = data.decode("utf-8", errors="replace").replace("\r\n", "\n")
+            (stderr_chunks if fd == err else stdout_chunks).append(text)
+            output.append(text)
+            transcript.append(text)
+        return master in streams
+
+    monitor = StallMonitor(proc.pid, cpu_timeout=STALL_CPU_TIMEOUT)
+    interval = MONITOR_INTERVAL if monitor.available else read_timeout
+    consumed = -1          # rchar after the last answer was sent
+    eofs = 0
+    usage = None
+    overflow = False
+    timed_out = False
+    cancelled = False
+    stalled = None
+    input_exhausted = False
+    started = time.monotonic()
+    deadline = started + timeout
+    last_activity = started
+
+    try:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                timed_out = True
+                break
+            if cancel is not None and cancel.is_set():
+                cancelled = True
+                break
+
+            size = sum(map(len, output))
+            if not pump(min(interval, remaining)):
+                break
+            if sum(map(len, output)) != size:
+                if size > MAX_OUTPUT_BYTES:
+                    overflow = True
+                    break
+                last_activity = time.monotonic()
+                continue
+
+            usage = reap(proc, block=False)
+            if usage is not None:
+                break
+
+            silent = time.monotonic() - last_activity
+            if monitor.available:
+                verdict = monitor.check(sum(map(len, output)))
+                if verdict == AWAITING_INPUT:
+                    # Blocked in read(): a new prompt once it has consumed the
+                    # previous answer (an EOF is not counted by rchar)
+                    if monitor.read_chars() <= consumed and silent < read_timeout:
+                        continue
+                elif verdict:
+                    timed_out = True
+                    stalled = verdict
+                    break
+                else:
+                    continue
+            elif silent < read_timeout:
+                continue
+
+            # Catch a prompt written just before the program blocked
+            if not pump(0):
+                break
+            line = responder.respond("".join(output))
+            # Sampled before answering: the program may read the answer
+            # before this loop looks again
+            consumed = monitor.read_chars() if monitor.available else -1
+            if line is None:
+                if eofs >= MAX_EOFS:
+                    input_exhausted = True
+                    break
+                eofs += 1
+                os.write(master, b"\x04")
+                transcript.append("<EOF>\n")
+            else:
+                os.write(master, (line + "\n").encode("utf-8"))
+                inputs.append(line)
+                transcript.append(f"> {line}\n")
+            last_activity = time.monotonic()
+    finally:
+        if usage is None:
+            # Harmless if it has exited but not been reaped yet
+            proc.kill()
+            usage = reap(proc)
+        kill_group(proc)
+        stderr_chunks.append(_drain(err))
+        proc.stderr.close()
+        os.close(master)
+
+    exception = read_report(report)
+    return {
+        "exit_code": proc.returncode,
+        "stdout": "".join(stdout_chunks),
+        "stderr": "".join(stderr_chunks),
+        "timed_out": timed_out,
+        "duration": time.monotonic() - started,
+        "stalled": stalled,
+        "exception": exception,
+        "limit": "output" if overflow else limit_exceeded(proc.returncode, exception),
+        "resources": usage,
+        "inputs": inputs,
+        "transcript": "".join(transcript),
+        "input_exhausted": input_exhausted,
+        "cancelled": cancelled
+    }
+
+
+def _drain(fd: int) -> str:
+    """Whatever is left in a pipe once the process has exited."""
+    chunks = []
+    while select.select([fd], [], [], 0)[0]:
+        data = os.read(fd, 4096)
+        if not data:
+            break
+        chunks.append(data)
+    return b"".join(chunks).decode("utf-8", errors="replace")
@@ -0,0 +1,109 @@
+import math
+import os
+import signal
+import subprocess
+from typing import Dict, Optional
+from runtime.config import (
+    SANDBOX_MEMORY_MB,
+    SANDBOX_FILE_SIZE_MB,
+    SANDBOX_OPEN_FILES,
+    SANDBOX_PROCESSES
+)
+
+
+def rlimits(limits: Dict, timeout: float) -> Dict:
+    """
+    Resource limits for one job, as sent to the worker in its header:
+        {"memory_mb", "cpu_seconds", "file_size_mb", "open_files", "processes"}
+    """
+    return {
+        "memory_mb": limits.get("memory_mb", SANDBOX_MEMORY_MB),
+        "cpu_seconds": limits.get("cpu_seconds", math.ceil(timeout) + 1),
+        "file_size_mb": limits.get("file_size_mb", SANDBOX_FILE_SIZE_MB),
+        "open_files": limits.get("open_files", SANDBOX_OPEN_FILES),
+        "processes": limits.get("processes", SANDBOX_PROCESSES)
+    }
+
+
+def reap(proc: subprocess.Popen, block: bool = True) -> Optional[Dict]:
+    """
+    Collect a finished child together with its resource usage:
+        {"peak_rss_mb", "cpu_seconds"}
+    Returns None if `block` is False and the child is still running.
+    Usage is empty where wait4() is not available.
+    """
+    if not hasattr(os, "wait4") or proc.returncode is not None:
+        if block:
+            proc.wait()
+        elif proc.poll() is None:
+            return None
+        return {}
+
+    try:
+        pid, status, usage = os.wait4(proc.pid, 0 if block else os.WNOHANG)
+    except ChildProcessError:
+        # Already collected elsewhere
+        proc.wait()
+        return {}
+    if pid == 0:
+        return None
+
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    return {
+        # ru_maxrss is in kilobytes on Linux, bytes on macOS
+        "peak_rss_mb": round(usage.ru_maxrss / (1024 * 1024 if os.uname().sysname == "Darwin" else 1024), 1),
+        "cpu_seconds": round(usage.ru_utime + usage.ru_stime, 3)
+    }
+
+
+def kill_group(proc: subprocess.Popen):
+    """
+    Kill whatever the program left behind in its process group (workers
+    start their own session); the worker itself has been reaped already.
+    """
+    if hasattr(os, "killpg"):
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except OSError:
+            pass
+
+
+def limit_exceeded(exit_code: Optional[int], exception: Optional[Dict]) -> Optional[str]:
+    """
+    Which resource limit ended the run, if any: "cpu", "file_size",
+    "memory", "open_files" or "processes" (output is detected while
+    reading it).
+    """
+    if exit_code == -getattr(signal, "SIGXCPU", -1):
+        return "cpu"
+    if exit_code == -getattr(signal, "SIGXFSZ", -1):
+        return "file_size"
+    if exception:
+        if exception["type"] == "MemoryError":
+            return "memory"
+        # Python ignores SIGXFSZ, so RLIMIT_FSIZE surfaces as EFBIG
+        if "File too large" in exception["message"]:
+            return "file_size"
+        if "Too many open files" in exception["message"]:
+            return "open_files"
+        # fork() hitting RLIMIT_NPROC: EAGAIN
+        if exception["type"] == "BlockingIOError" and "temporarily unavailable" in exception["message"]:
+            return "processes"
+    return None
+
+
+def describe_limit(limit: str, rlimit: Dict) -> str:
+    """Human-readable reason for a limit_exceeded() result."""
+    if limit == "cpu":
+        return f"Program exceeded the CPU time limit ({rlimit['cpu_seconds']} seconds)"
+    if limit == "memory":
+        return f"Program exceeded the memory limit ({rlimit['memory_mb']} MB)"
+    if limit == "file_size":
+        return f"Program tried to write a file larger than {rlimit['file_size_mb']} MB"
+    if limit == "open_files":
+        return f"Program opened too many files at once (limit {rlimit['open_files']})"
+    if limit == "processes":
+        return f"Program started too many processes (limit {rlimit['processes']})"
+    if limit == "output":
+        return "Program produced too much output and was stopped"
+    return limit
@@ -0,0 +1,144 @@
+import os
+import platform
+import time
+from typing import Optional
+
+
+# read(2) syscall numbers, for recognising a process blocked reading stdin
+READ_SYSCALLS = {"x86_64": {0, 17}, "aarch64": {63, 67}, "i686": {3, 180}, "armv7l": {3, 180}}
+
+# Kernel wait channels of a task sleeping in a terminal or pipe read, used
+# when /proc/<pid>/syscall is not readable
+READ_WCHANS = {"n_tty_read", "wait_woken", "pipe_read", "anon_pipe_read", "pipe_wait"}
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+# Verdicts returned by StallMonitor.check()
+AWAITING_INPUT = "awaiting_input"
+CPU_LOOP = "cpu_loop"
+
+
+class StallMonitor:
+    """
+    Watches a running program through /proc and classifies it as stuck
+    without waiting for the wall-clock timeout:
+
+    - AWAITING_INPUT: blocked in read() on stdin
+    - CPU_LOOP: using a full CPU for `cpu_timeout` seconds without
+      producing any output
+
+    A program that is merely asleep (time.sleep, a lock, a socket) is
+    never called stuck: only the job's own timeout ends it.
+
+    On systems without /proc, `available` is False and check() always
+    returns None.
+    """
+
+    def __init__(self, pid: int, cpu_timeout: Optional[float] = None):
+        self.pid = pid
+        self.cpu_timeout = cpu_timeout
+        self.available = os.path.exists(f"/proc/{pid}/stat")
+        self._read_syscalls = READ_SYSCALLS.get(platform.machine(), set())
+
+        now = time.monotonic()
+        cpu = self._cpu_time()
+        self._output_size = 0
+        self._window_start = now      # last time output grew
+        self._window_cpu = cpu
+
+    def check(self, output_size: int = 0) -> Optional[str]:
+        """
+        Take a sample; `output_size` is the number of bytes the program
+        has written so far.
+        """
+        if not self.available:
+            return None
+
+        now = time.monotonic()
+        state = self._state()
+        if state is None or state in "ZX":
+            return None
+
+        cpu = self._cpu_time()
+        if output_size != self._output_size:
+            self._output_size = output_size
+            self._window_start = now
+            self._window_cpu = cpu
+
+        if state == "S" and self.waiting_on_stdin():
+            return AWAITING_INPUT
+
+        elapsed = now - self._window_start
+        if self.cpu_timeout is not None and elapsed >= self.cpu_timeout:
+            # Tick resolution is coarse; "busy" means at least 90% of a CPU
+            if cpu - self._window_cpu >= 0.9 * elapsed:
+                return CPU_LOOP
+        return None
+
+    def waiting_on_stdin(self) -> bool:
+        """
+        Whether the program is blocked in read() on file descriptor 0.
+        """
+        syscall = _read_proc(self.pid, "syscall")
+        if syscall:
+            fields = syscall.split()
+            if fields[0].isdigit() and len(fields) > 1:
+                try:
+                    return int(fields[0]) in self._read_syscalls and int(fields[1], 16) == 0
+                except ValueError:
+                    return False
+            # "running" or "-1 ...": not inside a syscall
+            return False
+        return _read_proc(self.pid, "wchan") in READ_WCHANS
+
+    def read_chars(self) -> int:
+        """
+        Bytes the program has read so far (rchar); grows when it consumes
+        a line of input.
+        """
+        for line in _read_proc(self.pid, "io").splitlines():
+            if line.startswith("rchar:"):
+                return int(line.split()[1])
+        return 0
+
+    # ----------------- /proc -----------------
+
+    def _stat_fields(self):
+        stat = _read_proc(self.pid, "stat")
+        if not stat:
+            return None
+        # The command name may contain spaces; fields resume after ")"
+        return stat[stat.rfind(")") + 2:].split()
+
+    def _state(self) -> Optional[str]:
+        fields = self._stat_fields()
+        return fields[0] if fields else None
+
+    def _cpu_time(self) -> float:
+        """User + system CPU seconds used by the process."""
+        fields = self._stat_fields()
+        if not fields or len(fields) < 13:
+            return 0.0
+        return (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+
+
+def monitoring_available() -> bool:
+    """Whether StallMonitor can watch programs on this system."""
+    return os.path.exists(f"/proc/{os.getpid()}/stat")
+
+
+def _read_proc(pid: int, name: str) -> str:
+    try:
+        with open(f"/proc/{pid}/{name}") as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+
+def describe_stall(verdict: str, cpu_timeout: float) -> str:
+    """Human-readable reason for a StallMonitor verdict."""
+    if verdict == AWAITING_INPUT:
+        return "Program is waiting for more input than was provided"
+    if verdict == CPU_LOOP:
+        return f"Program used a full CPU for {cpu_timeout} seconds without producing output (likely an infinite loop)"
+    return verdict
@@ -0,0 +1,71 @@
+import codecs
+from collections import deque
+from typing import Callable, Optional
+
+
+class RingBuffer:
+    """
+    The most recent `capacity` bytes written to one output stream, plus a
+    count of everything written. Older output is dropped as new output
+    arrives, so memory stays flat however much a program prints.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.total = 0
+        self._chunks = deque()
+        self._size = 0
+
+    def write(self, data: bytes):
+        self.total += len(data)
+        if len(data) >= self.capacity:
+            self._chunks.clear()
+            self._size = 0
+            data = data[len(data) - self.capacity:]
+        self._chunks.append(data)
+        self._size += len(data)
+        while self._size > self.capacity:
+            excess = self._size - self.capacity
+            head = self._chunks[0]
+            if len(head) <= excess:
+                self._chunks.popleft()
+                self._size -= len(head)
+            else:
+                self._chunks[0] = head[excess:]
+                self._size -= excess
+
+    @property
+    def dropped(self) -> int:
+        """Bytes written but no longer kept."""
+        return self.total - self._size
+
+    def getvalue(self) -> str:
+        data = b"".join(self._chunks)
+        if self.dropped:
+            # The cut may have split a multi-byte character
+            start = 0
+            while start < min(len(data), 3) and data[start] & 0xC0 == 0x80:
+                start += 1
+            data = data[start:]
+        return data.decode("utf-8", errors="replace")
+
+
+class StreamDecoder:
+    """
+    Passes chunks of a byte stream on to `callback(stream, text)` as text,
+    holding back a multi-byte character split across chunks.
+    """
+
+    def __init__(self, stream: str, callback: Callable[[str, str], None]):
+        self.stream = stream
+        self.callback = callback
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    def feed(self, data: bytes, final: bool = False):
+        text = self._decoder.decode(data, final)
+        if text:
+            self.callback(self.stream, text)
+
+
+def stream_decoder(stream: str, callback: Optional[Callable[[str, str], None]]) -> Optional[StreamDecoder]:
+    return StreamDecoder(stream, callback) if callback else None
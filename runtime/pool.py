@@ -0,0 +1,287 @@
+import atexit
+import json
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Optional, Union
+from runtime.config import (
+    POOL_SIZE,
+    PRELOAD_MODULES,
+    DEFAULT_TIMEOUT,
+    MONITOR_INTERVAL,
+    STALL_CPU_TIMEOUT,
+    MAX_OUTPUT_BYTES,
+    OUTPUT_BUFFER_BYTES
+)
+from runtime.limits import kill_group, limit_exceeded, reap, rlimits
+from runtime.monitor import StallMonitor
+from runtime.output import RingBuffer, stream_decoder
+from runtime.workspace import Workspace, run_directory
+
+
+WORKER_PATH = str(Path(__file__).with_name("worker.py"))
+
+# Isolated like -I (no user site-packages, no PYTHON* variables), but with
+# string hashing pinned, which -I would ignore: set iteration order, and
+# so a program's output, is then the same on every run. Unbuffered, so
+# output is seen as it is written.
+WORKER_FLAGS = ["-s", "-u"]
+
+
+def worker_env() -> Dict[str, str]:
+    env = {name: value for name, value in os.environ.items() if not name.startswith("PYTHON")}
+    env["PYTHONHASHSEED"] = "0"
+    return env
+
+
+class WarmPool:
+    """
+    Pool of pre-started Python interpreters for running generated code.
+
+    Each idle worker has already paid interpreter start-up and imported
+    PRELOAD_MODULES; it runs exactly one job and exits, and a fresh worker
+    is started in its place, so no state leaks between jobs.
+
+    Jobs are (files, stdin, limits), where files is a file dict or a
+    runtime.workspace.Workspace, and results are dicts:
+        {"exit_code", "stdout", "stderr", "timed_out", "duration", "stalled",
+         "exception", "limit", "resources", "cancelled", "output_dropped"}
+
+    "stalled" is None, or the StallMonitor verdict ("awaiting_input",
+    "cpu_loop") that stopped the job early; "timed_out" is True in
+    that case too. "exception" is the worker's structured record of an
+    uncaught exception (runtime.worker.exception_record), or None.
+
+    Every job runs under rlimits (runtime.limits) with a private temp
+    directory; "limit" names the limit that ended it, if any, and
+    "resources" is {"peak_rss_mb", "cpu_seconds"} (empty off Unix).
+
+    Setting the optional `cancel` event kills a running job; its result
+    has "cancelled" True and should be discarded.
+
+    Output is kept in ring buffers (runtime.output), so "stdout"/"stderr"
+    are the most recent `output_buffer` bytes of each stream and
+    "output_dropped" counts what was cut from the front. `on_output`, if
+    given, is called as `on_output("stdout" | "stderr", text)` from reader
+    threads as the program writes; the program's stdout is line-buffered
+    for such runs.
+    """
+
+    def __init__(self, size: int = POOL_SIZE, python: str = sys.executable, preload=None):
+        self.size = size
+        self.python = python
+        self.preload = list(PRELOAD_MODULES if preload is None else preload)
+        self._idle: "queue.Queue[subprocess.Popen]" = queue.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=size)
+        self._closed = False
+        self._lock = threading.Lock()
+        for _ in range(size):
+            self._idle.put(self._spawn())
+
+    def run(self, files: Union[Workspace, Dict[str, str]], main: str = "main.py", stdin: str = "", limits: Optional[Dict] = None,
+            cancel: Optional[threading.Event] = None, on_output: Optional[Callable[[str, str], None]] = None) -> Dict:
+        """
+        Run `main` from `files` in a fresh worker and wait for the result.
+
+        limits: {"timeout": seconds, "argv": [...],
+                 "cpu_timeout": seconds or None,
+                 "max_output": bytes per stream (None: unlimited),
+                 "output_buffer": bytes per stream kept for the result,
+                 plus any runtime.limits.rlimits key}
+        """
+        limits = limits or {}
+        timeout = limits.get("timeout", DEFAULT_TIMEOUT)
+
+        with run_directory(files) as workdir:
+            # Side channel for the exception record and a private temp dir,
+            # both outside the program's directory
+            report = workdir + ".exception.json"
+            private_tmp = workdir + ".tmp"
+            try:
+                worker = self._acquire()
+                header = json.dumps({
+                    "cwd": workdir,
+                    "main": main,
+                    "argv": limits.get("argv", []),
+                    "report": report,
+                    "tmp": private_tmp,
+                    "rlimits": rlimits(limits, timeout),
+                    "line_buffered": on_output is not None
+                })
+                monitor = StallMonitor(
+                    worker.pid,
+                    cpu_timeout=limits.get("cpu_timeout", STALL_CPU_TIMEOUT)
+                )
+
+                buffer_size = limits.get("output_buffer", OUTPUT_BUFFER_BYTES)
+                stdout = RingBuffer(buffer_size)
+                stderr = RingBuffer(buffer_size)
+                max_output = limits.get("max_output", MAX_OUTPUT_BYTES)
+                overflow = threading.Event()
+                threads = [
+                    threading.Thread(target=_feed, args=(worker.stdin, (header + "\n" + stdin).encode("utf-8")), daemon=True),
+                    threading.Thread(target=_collect, args=(worker.stdout, stdout, max_output, overflow,
+                                                            stream_decoder("stdout", on_output)), daemon=True),
+                    threading.Thread(target=_collect, args=(worker.stderr, stderr, max_output, overflow,
+                                                            stream_decoder("stderr", on_output)), daemon=True)
+                ]
+                for thread in threads:
+                    thread.start()
+
+                started = time.monotonic()
+                deadline = started + timeout
+                stalled = None
+                usage = reap(worker, block=False)
+                try:
+                    while usage is None:
+                        if time.monotonic() >= deadline or overflow.is_set():
+                            break
+                        if cancel is not None and cancel.is_set():
+                            break
+                        time.sleep(MONITOR_INTERVAL)
+                        # Until stdin is fully written the worker may legitimately
+                        # be reading it
+                        if not threads[0].is_alive():
+                            stalled = monitor.check(stdout.total + stderr.total)
+                            if stalled:
+                                break
+                        usage = reap(worker, block=False)
+                except BaseException:
+                    # Ctrl-C while watching a long run: do not leave it behind
+                    worker.kill()
+                    reap(worker)
+                    kill_group(worker)
+                    raise
+
+                cancelled = usage is None and cancel is not None and cancel.is_set()
+                timed_out = usage is None and not overflow.is_set() and not cancelled
+                if usage is None:
+                    worker.kill()
+                    usage = reap(worker)
+                kill_group(worker)
+                for thread in threads:
+                    thread.join(timeout=1)
+                exception = read_report(report)
+
+                return {
+                    "exit_code": worker.returncode,
+                    "stdout": stdout.getvalue(),
+                    "stderr": stderr.getvalue(),
+                    "timed_out": timed_out,
+                    "duration": time.monotonic() - started,
+                    "stalled": stalled if timed_out else None,
+                    "exception": exception,
+                    "limit": "output" if overflow.is_set() else limit_exceeded(worker.returncode, exception),
+                    "resources": usage,
+                    "cancelled": cancelled,
+                    "output_dropped": {"stdout": stdout.dropped, "stderr": stderr.dropped}
+                }
+            finally:
+                shutil.rmtree(private_tmp, ignore_errors=True)
+
+    def submit(self, files: Union[Workspace, Dict[str, str]], main: str = "main.py", stdin: str = "", limits: Optional[Dict] = None,
+               cancel: Optional[threading.Event] = None, on_output: Optional[Callable[[str, str], None]] = None) -> Future:
+        """Run a job on the pool's threads; returns a Future of the result dict."""
+        return self._executor.submit(self.run, files, main, stdin, limits, cancel, on_output)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+        self._executor.shutdown(wait=False)
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            worker.kill()
+            worker.wait()
+
+    # ----------------- Workers -----------------
+
+    def _spawn(self) -> subprocess.Popen:
+        return subprocess.Popen(
+            [self.python, *WORKER_FLAGS, WORKER_PATH, json.dumps(self.preload)],
+            env=worker_env(),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            cwd=tempfile.gettempdir(),
+            # Own process group, so anything the program spawns can be killed with it
+            start_new_session=hasattr(os, "setsid")
+        )
+
+    def _acquire(self) -> subprocess.Popen:
+        """
+        Take a warm worker (or start a cold one if none is idle) and
+        immediately start its replacement.
+        """
+        try:
+            worker = self._idle.get_nowait()
+            if worker.poll() is not None:
+                worker = self._spawn()
+        except queue.Empty:
+            worker = self._spawn()
+
+        with self._lock:
+            if not self._closed:
+                self._idle.put(self._spawn())
+        return worker
+
+
+def read_report(path: str) -> Optional[Dict]:
+    """Exception record written by the worker, if any; removes the file."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _feed(stream, data: bytes):
+    try:
+        stream.write(data)
+        stream.close()
+    except (BrokenPipeError, OSError, ValueError):
+        # The program exited (or was killed) without reading all its input
+        pass
+
+
+def _collect(stream, buffer: RingBuffer, max_bytes: Optional[int], overflow: threading.Event, decoder=None):
+    # os.read returns as soon as anything is written, so output growth is
+    # visible to the stall monitor (and to `on_output`) right away
+    fd = stream.fileno()
+    for chunk in iter(lambda: os.read(fd, 4096), b""):
+        buffer.write(chunk)
+        if decoder:
+            decoder.feed(chunk)
+        if max_bytes is not None and buffer.total > max_bytes:
+            overflow.set()
+    if decoder:
+        decoder.feed(b"", final=True)
+    stream.close()
+
+
+_pool: Optional[WarmPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> WarmPool:
+    """Process-wide pool shared by the debugger and the executor."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = WarmPool()
+            atexit.register(_pool.close)
+        return _pool
@@ -0,0 +1,284 @@
+"""
+Warm sandbox worker.
+
+Started ahead of time by runtime.pool.WarmPool: imports PRELOAD_MODULES,
+then blocks on stdin for a single JSON job header line:
+
+    {"cwd": "/tmp/...", "main": "main.py", "argv": []}
+
+Everything after the header is the program's own stdin. The program runs
+as __main__ in this process and the worker exits with its exit code, so
+every job gets a fresh interpreter.
+
+Interactive runs (runtime.interactive) attach stdin to a terminal and pass
+the job header as the second argument instead.
+
+If the header names a "report" file, an uncaught exception is also written
+there as JSON (see exception_record) for callers that need more than the
+printed traceback.
+
+Optional header keys "rlimits" (see apply_limits) and "tmp" (a private
+temp directory) confine the program before it starts; "line_buffered"
+flushes its stdout at every newline, for callers streaming the output.
+
+When the entry file has an up-to-date hash-checked .pyc beside it
+(written by runtime.workspace.write_bytecode), the program is run from
+that code instead of being compiled again.
+"""
+import importlib
+import json
+import linecache
+import os
+import sys
+import traceback
+
+
+# Limits for the local variable summaries in exception records
+MAX_LOCALS = 12
+MAX_REPR = 120
+MAX_FRAMES = 20
+
+
+def preload(modules):
+    for name in modules:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+
+
+def apply_limits(limits: dict):
+    """
+    Lower this process's rlimits before running untrusted code:
+    {"memory_mb", "cpu_seconds", "file_size_mb", "open_files", "processes"}.
+    Unsupported platforms and limits are skipped.
+    """
+    try:
+        import resource
+    except ImportError:  # Windows
+        return
+
+    mb = 1024 * 1024
+    wanted = [
+        ("RLIMIT_AS", limits.get("memory_mb"), mb),
+        ("RLIMIT_CPU", limits.get("cpu_seconds"), 1),
+        ("RLIMIT_FSIZE", limits.get("file_size_mb"), mb),
+        ("RLIMIT_NOFILE", limits.get("open_files"), 1),
+        ("RLIMIT_NPROC", limits.get("processes"), 1),
+        ("RLIMIT_CORE", 0, 1)
+    ]
+    for name, value, unit in wanted:
+        if value is None or not hasattr(resource, name):
+            continue
+        which = getattr(resource, name)
+        value = int(value * unit)
+        if name == "RLIMIT_NPROC":
+            # Counted per user: allow this many more than already running
+            value += _user_process_count()
+        # CPU: SIGXCPU at the soft limit, SIGKILL a second later
+        limit = (value, value + 1 if name == "RLIMIT_CPU" else value)
+        _, hard = resource.getrlimit(which)
+        if hard != resource.RLIM_INFINITY:
+            limit = tuple(min(v, hard) for v in limit)
+        try:
+            resource.setrlimit(which, limit)
+        except (ValueError, OSError):
+            pass
+
+
+def use_private_tmp(path: str):
+    import tempfile
+
+    os.makedirs(path, exist_ok=True)
+    for var in ("TMPDIR", "TEMP", "TMP"):
+        os.environ[var] = path
+    tempfile.tempdir = path
+
+
+def _user_process_count() -> int:
+    uid = str(os.getuid())
+    count = 0
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return 0
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/status") as f:
+                for line in f:
+                    if line.startswith("Uid:"):
+                        count += line.split()[1] == uid
+                        break
+        except OSError:
+            continue
+    return count
+
+
+def run_job(job):
+    import runpy
+
+    cwd = job["cwd"]
+    main_path = os.path.join(cwd, job["main"])
+    os.chdir(cwd)
+    sys.path.insert(0, cwd)
+    sys.argv = [main_path] + list(job.get("argv", []))
+    if job.get("tmp"):
+        use_private_tmp(job["tmp"])
+    if job.get("rlimits"):
+        apply_limits(job["rlimits"])
+    if job.get("line_buffered"):
+        sys.stdout.reconfigure(line_buffering=True)
+
+    try:
+        code = load_bytecode(main_path)
+        if code is not None:
+            run_code(code, main_path)
+        else:
+            runpy.run_path(main_path, run_name="__main__")
+    except SystemExit:
+        raise
+    except BaseException as e:
+        # Print the traceback as a plain `python main.py` would, without
+        # the worker and runpy frames
+        tb = e.__traceback__
+        while tb is not None and tb.tb_frame.f_code.co_filename != main_path:
+            tb = tb.tb_next
+        traceback.print_exception(type(e), e, tb or e.__traceback__)
+        if job.get("report"):
+            write_report(job["report"], exception_record(e, tb or e.__traceback__, cwd))
+        sys.exit(1)
+
+
+def load_bytecode(path: str):
+    """
+    Code object of `path` from its hash-checked .pyc in __pycache__, or
+    None unless that exists and matches the source.
+    """
+    import importlib.util
+    import marshal
+
+    directory, filename = os.path.split(path)
+    cfile = os.path.join(directory, "__pycache__", f"{filename.rsplit('.', 1)[0]}.{sys.implementation.cache_tag}.pyc")
+    try:
+        with open(cfile, "rb") as f:
+            data = f.read()
+        with open(path, "rb") as f:
+            source = f.read()
+    except OSError:
+        return None
+    if data[:4] != importlib.util.MAGIC_NUMBER or data[8:16] != importlib.util.source_hash(source):
+        return None
+    try:
+        code = marshal.loads(data[16:])
+    except (EOFError, ValueError, TypeError):
+        return None
+    return code if code.co_filename == path else None
+
+
+def run_code(code, path: str):
+    """Run compiled entry-file code as __main__, as runpy.run_path would."""
+    import types
+
+    module = types.ModuleType("__main__")
+    module.__dict__.update({
+        "__file__": path,
+        "__cached__": None,
+        "__loader__": None,
+        "__package__": "",
+        "__spec__": None
+    })
+    sys.modules["__main__"] = module
+    exec(code, module.__dict__)
+
+
+def exception_record(e: BaseException, tb, cwd: str) -> dict:
+    """
+    Machine-readable form of an uncaught exception:
+
+        {"type", "message", "frames": [{"file", "line", "function",
+         "source", "locals": {name: repr}}]}
+
+    Only frames in the program's own files are listed (paths relative to
+    its directory), innermost last. A SyntaxError raised while importing
+    one of them is listed as a frame at the offending line.
+    """
+    frames = []
+    for frame, line in traceback.walk_tb(tb):
+        filename = frame.f_code.co_filename
+        if not _is_program_file(filename, cwd):
+            continue
+        frames.append({
+            "file": os.path.relpath(filename, cwd).replace(os.sep, "/"),
+            "line": line,
+            "function": frame.f_code.co_name,
+            "source": linecache.getline(filename, line).strip(),
+            "locals": _summarize_locals(frame.f_locals) if frame.f_code.co_name != "<module>" else {}
+        })
+
+    if isinstance(e, SyntaxError) and e.filename and _is_program_file(e.filename, cwd):
+        frames.append({
+            "file": os.path.relpath(e.filename, cwd).replace(os.sep, "/"),
+            "line": e.lineno,
+            "function": "<module>",
+            "source": (e.text or "").strip(),
+            "locals": {}
+        })
+
+    return {
+        "type": type(e).__name__,
+        "message": str(e),
+        "frames": frames[-MAX_FRAMES:]
+    }
+
+
+def write_report(path: str, record: dict):
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(record, f)
+    except (OSError, TypeError, ValueError):
+        # The printed traceback is still there
+        pass
+
+
+def _is_program_file(filename: str, cwd: str) -> bool:
+    return os.path.abspath(filename).startswith(os.path.abspath(cwd) + os.sep)
+
+
+def _summarize_locals(f_locals: dict) -> dict:
+    summary = {}
+    for name, value in f_locals.items():
+        if name.startswith("__") or callable(value) or type(value).__name__ == "module":
+            continue
+        try:
+            text = repr(value)
+        except Exception:
+            text = f"<{type(value).__name__}>"
+        if len(text) > MAX_REPR:
+            text = text[:MAX_REPR - 3] + "..."
+        summary[name] = text
+        if len(summary) >= MAX_LOCALS:
+            break
+    return summary
+
+
+def main():
+    # Not started with -I (see runtime.pool.WORKER_FLAGS): keep the runtime
+    # package's own modules out of the program's import path
+    if sys.path and sys.path[0] == os.path.dirname(os.path.abspath(__file__)):
+        sys.path.pop(0)
+
+    for stream in (sys.stdin, sys.stdout, sys.stderr):
+        stream.reconfigure(encoding="utf-8", errors="replace")
+
+    preload(json.loads(sys.argv[1]) if len(sys.argv) > 1 else [])
+
+    header = sys.argv[2] if len(sys.argv) > 2 else sys.stdin.readline()
+    if not header:
+        return
+    run_job(json.loads(header))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+import atexit
+import importlib.util
+import marshal
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import types
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterable, Optional, Tuple, Union
+from runtime.config import WORKSPACE_ROOT, MAX_WORKSPACES
+from utils.artifacts import files_hash, parse_files
+
+# Flags of a hash-based .pyc that the importer checks against its source
+# (PEP 552)
+CHECKED_HASH_PYC = 0b11
+
+
+class Workspace:
+    """
+    A generated file set materialized once in a memory-backed directory
+    (tmpfs where available) and reused by every run of that code: the
+    debugger's validation runs and the executor's final run.
+
+    Runs must hold `lease()`: it serializes them and first restores the
+    directory to the generated files, so files a previous run created or
+    modified (a saved todo list, a log) do not leak into the next one.
+    Restoring only rewrites what changed.
+
+    Python files are written with their bytecode (see write_bytecode), so
+    the sandbox neither parses nor compiles them again.
+    """
+
+    def __init__(self, files: Dict[str, str], root: Optional[str] = None):
+        self.files = dict(files)
+        self.hash = files_hash(files)
+        self.path = tempfile.mkdtemp(prefix="agentic-ws-", dir=root or workspace_root())
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Tuple[int, int]] = {}
+        self.closed = False
+        write_files(self.path, self.files)
+        write_bytecode(self.path, self.files)
+        self._snapshot()
+
+    @contextmanager
+    def lease(self):
+        """Exclusive use of the (restored) directory for one run."""
+        with self._lock:
+            if self.closed:
+                raise RuntimeError(f"Workspace {self.path} is closed")
+            self.reset()
+            yield self.path
+
+    def reset(self):
+        """
+        Remove files the program created and rewrite generated files it
+        changed or deleted (detected by size and mtime).
+        """
+        expected = {os.path.normpath(os.path.join(self.path, name)): name for name in self.files}
+        for dirpath, dirnames, filenames in os.walk(self.path, topdown=False):
+            if os.path.basename(dirpath) == "__pycache__":
+                # Bytecode of the generated modules; invalidated by the
+                # interpreter itself when a source file is rewritten
+                continue
+            for filename in filenames:
+                full = os.path.join(dirpath, filename)
+                if full not in expected:
+                    _remove(full)
+            for dirname in dirnames:
+                full = os.path.join(dirpath, dirname)
+                if os.path.islink(full):
+                    _remove(full)
+                elif dirname != "__pycache__" and not os.listdir(full):
+                    os.rmdir(full)
+
+        changed = {}
+        for full, name in expected.items():
+            try:
+                st = os.stat(full)
+                if (st.st_size, st.st_mtime_ns) == self._stats.get(name):
+                    continue
+            except OSError:
+                pass
+            changed[name] = self.files[name]
+        if changed:
+            write_files(self.path, changed)
+            write_bytecode(self.path, self.files, changed)
+            self._snapshot(changed)
+
+    def close(self):
+        with self._lock:
+            self.closed = True
+            shutil.rmtree(self.path, ignore_errors=True)
+
+    def _snapshot(self, names=None):
+        for name in names or self.files:
+            st = os.stat(os.path.join(self.path, name))
+            self._stats[name] = (st.st_size, st.st_mtime_ns)
+
+
+def workspace_root() -> str:
+    """
+    Directory for workspaces and scratch run directories: WORKSPACE_ROOT,
+    else /dev/shm (tmpfs on Linux), else the system temp dir.
+    """
+    for candidate in (WORKSPACE_ROOT, "/dev/shm"):
+        if candidate and os.path.isdir(candidate) and os.access(candidate, os.W_OK | os.X_OK):
+            return candidate
+    return tempfile.gettempdir()
+
+
+@contextmanager
+def run_directory(files: Union[Workspace, Dict[str, str]]):
+    """
+    Directory to run a program in: a leased Workspace, or for a plain
+    file dict a scratch directory under workspace_root() that is removed
+    afterwards.
+    """
+    if isinstance(files, Workspace):
+        with files.lease() as path:
+            yield path
+        return
+
+    path = tempfile.mkdtemp(prefix="agentic-run-", dir=workspace_root())
+    try:
+        write_files(path, files)
+        write_bytecode(path, files)
+        yield path
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def write_files(workdir: str, files: Dict[str, str]):
+    """Write a file set, creating directories for nested paths (pkg/mod.py)."""
+    for fname, content in files.items():
+        path = os.path.normpath(os.path.join(workdir, fname))
+        if not path.startswith(os.path.normpath(workdir) + os.sep):
+            raise ValueError(f"File path escapes the workspace: {fname}")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+
+def write_bytecode(workdir: str, files: Dict[str, str], names: Optional[Iterable[str]] = None):
+    """
+    Write the hash-checked .pyc of each Python file (or of `names`) into
+    __pycache__ beside it, from the code compiled once per file set
+    (utils.artifacts.ParsedFile.code). Imports in the sandbox load it
+    instead of compiling, and the worker runs the entry file from it.
+    Files that do not compile are left to the interpreter.
+    """
+    parsed = parse_files(files)
+    for name in names or files:
+        pf = parsed.files.get(name)
+        if pf is None or not pf.is_python or pf.code is None:
+            continue
+        path = os.path.normpath(os.path.join(workdir, name))
+        data = bytearray(importlib.util.MAGIC_NUMBER)
+        data.extend(CHECKED_HASH_PYC.to_bytes(4, "little"))
+        data.extend(pf.source_hash)
+        data.extend(marshal.dumps(_relocate(pf.code, path)))
+
+        cfile = bytecode_path(path)
+        os.makedirs(os.path.dirname(cfile), exist_ok=True)
+        with open(cfile, "wb") as f:
+            f.write(data)
+
+
+def bytecode_path(path: str) -> str:
+    """
+    Where the interpreter looks for the .pyc of `path`. Not
+    importlib.util.cache_from_source: workers run with PYTHON* variables
+    scrubbed, so a PYTHONPYCACHEPREFIX in this process does not apply to them.
+    """
+    directory, filename = os.path.split(path)
+    stem = filename.rsplit(".", 1)[0]
+    return os.path.join(directory, "__pycache__", f"{stem}.{sys.implementation.cache_tag}.pyc")
+
+
+def _relocate(code: types.CodeType, filename: str) -> types.CodeType:
+    """The same code with `filename` as co_filename, as the importer would."""
+    consts = tuple(
+        _relocate(const, filename) if isinstance(const, types.CodeType) else const
+        for const in code.co_consts
+    )
+    return code.replace(co_filename=filename, co_consts=consts)
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+# ----------------- Registry -----------------
+
+_workspaces: "OrderedDict[str, Workspace]" = OrderedDict()
+_registry_lock = threading.Lock()
+
+
+def get_workspace(files: Dict[str, str]) -> Workspace:
+    """
+    The workspace for this exact file set, materializing it on first use.
+    Only the MAX_WORKSPACES most recently used are kept; older iterations'
+    code is cleaned up as new code arrives.
+    """
+    key = files_hash(files)
+    with _registry_lock:
+        workspace = _workspaces.get(key)
+        if workspace is None or workspace.closed:
+            workspace = Workspace(files)
+            _workspaces[key] = workspace
+            while len(_workspaces) > MAX_WORKSPACES:
+                _, evicted = _workspaces.popitem(last=False)
+                evicted.close()
+        else:
+            _workspaces.move_to_end(key)
+        return workspace
+
+
+def release_workspaces():
+    """Remove every workspace; called when a pipeline run ends."""
+    with _registry_lock:
+        while _workspaces:
+            _, workspace = _workspaces.popitem()
+            workspace.close()
+
+
+atexit.register(release_workspaces)
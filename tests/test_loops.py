@@ -0,0 +1,157 @@
+from agents.debugger.loops import find_endless_loops
+from utils.artifacts import parse_files
+
+
+def endless(source: str):
+    return [f["line"] for f in find_endless_loops(parse_files({"main.py": source}))]
+
+
+def test_print_loop_is_endless():
+    assert endless("while True:\n    print('x')\n") == [1]
+
+
+def test_input_loop_without_exit_is_endless():
+    findings = find_endless_loops(parse_files({"main.py": "while True:\n    cmd = input().strip()\n    print(cmd)\n"}))
+    assert [(f["line"], f["reads_input"]) for f in findings] == [(1, True)]
+
+
+def test_break_in_loop_body():
+    assert endless("while True:\n    if input() == 'q':\n        break\n") == []
+
+
+def test_break_of_nested_for_does_not_leave_outer_loop():
+    source = (
+        "while True:\n"
+        "    for i in range(3):\n"
+        "        if i == 2:\n"
+        "            break\n"
+    )
+    assert endless(source) == [1]
+
+
+def test_break_of_nested_while_does_not_leave_outer_loop():
+    source = (
+        "while True:\n"
+        "    while True:\n"
+        "        break\n"
+    )
+    assert endless(source) == [1]
+
+
+def test_break_in_nested_for_else_leaves_outer_loop():
+    source = (
+        "while True:\n"
+        "    for i in range(3):\n"
+        "        pass\n"
+        "    else:\n"
+        "        break\n"
+    )
+    assert endless(source) == []
+
+
+def test_command_table_lookup():
+    source = (
+        "import sys\n"
+        "def quit_app():\n"
+        "    sys.exit(0)\n"
+        "def show():\n"
+        "    print('hi')\n"
+        "COMMANDS = {'q': quit_app, 's': show}\n"
+        "while True:\n"
+        "    cmd = input('> ')\n"
+        "    COMMANDS.get(cmd, show)()\n"
+    )
+    assert endless(source) == []
+
+
+def test_command_table_subscript_through_variable():
+    source = (
+        "def show():\n"
+        "    print('hi')\n"
+        "COMMANDS = {'s': show}\n"
+        "while True:\n"
+        "    action = COMMANDS[input('> ')]\n"
+        "    action()\n"
+    )
+    assert endless(source) == []
+
+
+def test_lambda_alias_of_exit():
+    source = (
+        "import sys\n"
+        "q = lambda: sys.exit(0)\n"
+        "while True:\n"
+        "    if input() == 'q':\n"
+        "        q()\n"
+    )
+    assert endless(source) == []
+
+
+def test_imported_exit_alias():
+    source = (
+        "from sys import exit as bye\n"
+        "while True:\n"
+        "    if input() == 'q':\n"
+        "        bye()\n"
+    )
+    assert endless(source) == []
+
+
+def test_module_alias_exit():
+    source = (
+        "import sys as system\n"
+        "while True:\n"
+        "    if input() == 'q':\n"
+        "        system.exit()\n"
+    )
+    assert endless(source) == []
+
+
+def test_exit_function_referenced_as_value():
+    source = (
+        "import sys\n"
+        "def quit_app():\n"
+        "    sys.exit(0)\n"
+        "def dispatch(commands, cmd):\n"
+        "    print(commands, cmd)\n"
+        "while True:\n"
+        "    dispatch({'q': quit_app}, input())\n"
+    )
+    assert endless(source) == []
+
+
+def test_raising_callee_caught_around_loop():
+    source = (
+        "class Done(Exception):\n"
+        "    pass\n"
+        "def step(i):\n"
+        "    if i > 3:\n"
+        "        raise Done()\n"
+        "i = 0\n"
+        "try:\n"
+        "    while True:\n"
+        "        step(i)\n"
+        "        i += 1\n"
+        "except Done:\n"
+        "    pass\n"
+    )
+    assert endless(source) == []
+
+
+def test_method_calls_on_computed_values_do_not_count_as_exits():
+    source = (
+        "while True:\n"
+        "    cmd = input('> ').strip().lower()\n"
+        "    print(', '.join(cmd.split()))\n"
+    )
+    assert endless(source) == [1]
+
+
+def test_call_of_non_exiting_function_is_endless():
+    source = (
+        "def show():\n"
+        "    print('hi')\n"
+        "while True:\n"
+        "    show()\n"
+    )
+    assert endless(source) == [3]
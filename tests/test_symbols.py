@@ -0,0 +1,105 @@
+from agents.checker.symbols import SymbolTable
+from utils.artifacts import parse_files
+
+
+def symbols(source: str) -> SymbolTable:
+    return SymbolTable(parse_files({"main.py": source}))
+
+
+def test_top_level_function_reachable_from_module_code():
+    table = symbols("def add_task():\n    pass\n\nadd_task()\n")
+    assert table.find("addTask")["line"] == 1
+    assert table.is_reachable("add_task")
+
+
+def test_uncalled_function_is_not_reachable():
+    table = symbols("def add_task():\n    pass\n")
+    assert table.find("add_task") is not None
+    assert not table.is_reachable("add_task")
+
+
+def test_method_reachable_through_its_class():
+    table = symbols("class Store:\n    def save(self):\n        pass\n\nStore()\n")
+    assert table.is_reachable("save")
+
+
+def test_nested_function_is_defined_and_reachable_through_parent():
+    source = (
+        "def main():\n"
+        "    def show_menu():\n"
+        "        print('menu')\n"
+        "    show_menu()\n"
+        "\n"
+        "main()\n"
+    )
+    table = symbols(source)
+    assert table.find("show_menu")["line"] == 2
+    assert table.is_reachable("show_menu")
+
+
+def test_function_nested_in_a_method():
+    source = (
+        "class Game:\n"
+        "    def play(self):\n"
+        "        def check_guess(n):\n"
+        "            return n == 3\n"
+        "        return check_guess(3)\n"
+        "\n"
+        "Game().play()\n"
+    )
+    assert symbols(source).is_reachable("check_guess")
+
+
+def test_nested_function_unreachable_when_parent_is_unused():
+    source = (
+        "def main():\n"
+        "    def show_menu():\n"
+        "        print('menu')\n"
+        "    show_menu()\n"
+    )
+    table = symbols(source)
+    assert table.find("show_menu") is not None
+    assert not table.is_reachable("show_menu")
+
+
+def test_nested_function_only_reachable_through_its_own_parent():
+    source = (
+        "def helper():\n"
+        "    def render():\n"
+        "        print('x')\n"
+        "    return 1\n"
+        "\n"
+        "def main():\n"
+        "    render()\n"
+        "    helper()\n"
+        "\n"
+        "main()\n"
+    )
+    assert not symbols(source).is_reachable("render")
+
+
+def test_terms_of_nested_function_bodies():
+    source = (
+        "def main():\n"
+        "    def count_guesses(guesses):\n"
+        "        return len(guesses)\n"
+        "    print(count_guesses([1]))\n"
+        "\n"
+        "main()\n"
+    )
+    assert symbols(source).has_terms("guess")
+
+
+def test_nested_name_does_not_hide_top_level_function():
+    source = (
+        "def main():\n"
+        "    def show():\n"
+        "        print('inner')\n"
+        "    show()\n"
+        "\n"
+        "def show():\n"
+        "    print('outer')\n"
+        "\n"
+        "show()\n"
+    )
+    assert symbols(source).is_reachable("show")
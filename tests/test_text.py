@@ -0,0 +1,46 @@
+import pytest
+
+from utils.text import normalize_request, split_identifier, stem
+
+
+@pytest.mark.parametrize("singular, plural", [
+    ("number", "numbers"),
+    ("guess", "guesses"),
+    ("player", "players"),
+    ("answer", "answers"),
+    ("filter", "filters"),
+    ("task", "tasks"),
+    ("key", "keys"),
+    ("entry", "entries"),
+    ("box", "boxes"),
+    ("match", "matches"),
+    ("cache", "caches"),
+    ("class", "classes"),
+    ("size", "sizes"),
+    ("setting", "settings"),
+    ("user", "users"),
+])
+def test_singular_and_plural_share_a_stem(singular, plural):
+    assert stem(singular) == stem(plural)
+
+
+@pytest.mark.parametrize("words", [
+    ("remove", "removes", "removed", "removing"),
+    ("add", "adds", "added", "adding"),
+    ("calculation", "calculations"),
+])
+def test_word_forms_share_a_stem(words):
+    assert len({stem(w) for w in words}) == 1
+
+
+@pytest.mark.parametrize("word", ["status", "this", "yes", "bus"])
+def test_words_ending_in_s_that_are_not_plurals(word):
+    assert stem(word) == word
+
+
+def test_split_identifier():
+    assert split_identifier("addTask") == split_identifier("add_task") == ["add", "task"]
+
+
+def test_normalize_request():
+    assert normalize_request("Create a simple Calculator!") == normalize_request("calculator app")
@@ -0,0 +1,171 @@
+import ast
+import hashlib
+import importlib.util
+import io
+import threading
+import tokenize
+import types
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+
+ENTRY_CANDIDATES = ["main.py", "app.py", "run.py"]
+
+# Bounded process-wide caches: content hash -> ParsedFile, file-set hash -> ParsedCodeSet.
+# Shared by the debugger's concurrent stages and the executor's scenario
+# threads, so each is guarded by a lock (parsing itself happens outside it).
+MAX_CACHED_FILES = 256
+MAX_CACHED_SETS = 64
+
+_file_cache: "OrderedDict[str, ParsedFile]" = OrderedDict()
+_set_cache: "OrderedDict[str, ParsedCodeSet]" = OrderedDict()
+_file_cache_lock = threading.Lock()
+_set_cache_lock = threading.Lock()
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ParsedFile:
+    """
+    One generated file, parsed once: source, content hash, AST (or the
+    SyntaxError that prevented it) and, on first use, its token stream
+    and compiled code.
+    """
+
+    def __init__(self, name: str, source: str):
+        self.name = name
+        self.source = source
+        self.hash = content_hash(source)
+        self.is_python = name.endswith(".py")
+        self.tree: Optional[ast.Module] = None
+        self.syntax_error: Optional[SyntaxError] = None
+        self.parse_error: Optional[Exception] = None
+        self._tokens: Optional[List[tokenize.TokenInfo]] = None
+        self._code: Optional[types.CodeType] = None
+
+        if self.is_python:
+            try:
+                self.tree = ast.parse(source)
+            except SyntaxError as e:
+                self.syntax_error = e
+            except Exception as e:
+                self.parse_error = e
+
+    @property
+    def tokens(self) -> List[tokenize.TokenInfo]:
+        """
+        Token stream of a file that parsed; empty otherwise.
+        """
+        if self._tokens is None:
+            self._tokens = []
+            if self.tree is not None:
+                try:
+                    self._tokens = list(tokenize.generate_tokens(io.StringIO(self.source).readline))
+                except (tokenize.TokenError, SyntaxError):
+                    self._tokens = []
+        return self._tokens
+
+    @property
+    def code(self) -> Optional[types.CodeType]:
+        """
+        Module code compiled from the already-parsed AST, or None if the
+        file does not compile. Its co_filename is the file's relative name;
+        runtime.workspace relocates it to where the file is written.
+        """
+        if self._code is None and self.tree is not None:
+            try:
+                self._code = compile(self.tree, self.name, "exec", dont_inherit=True)
+            except (SyntaxError, ValueError):
+                # e.g. `return` outside a function: a compile-time error
+                pass
+        return self._code
+
+    @property
+    def source_hash(self) -> bytes:
+        """The hash a hash-based .pyc of this file records (PEP 552)."""
+        return importlib.util.source_hash(self.source.encode("utf-8"))
+
+    def has_main_guard(self) -> bool:
+        if self.tree is None:
+            return False
+        for node in self.tree.body:
+            if (
+                isinstance(node, ast.If)
+                and isinstance(node.test, ast.Compare)
+                and isinstance(node.test.left, ast.Name)
+                and node.test.left.id == "__name__"
+            ):
+                return True
+        return False
+
+
+class ParsedCodeSet:
+    """
+    All files of one coder output, shared by the validation stages of an
+    iteration (checker and debugger) so each file is parsed only once.
+    """
+
+    def __init__(self, files: Dict[str, str]):
+        self.files: Dict[str, ParsedFile] = {
+            name: _parsed_file(name, source) for name, source in files.items()
+        }
+        self.hash = files_hash(files)
+        self.entry_file = self._find_entry_file()
+
+    def python_files(self) -> List[ParsedFile]:
+        return [pf for pf in self.files.values() if pf.is_python]
+
+    def _find_entry_file(self) -> Optional[str]:
+        """
+        Priority: main.py > app.py > run.py > file with a __main__ guard
+        > first .py file.
+        """
+        for candidate in ENTRY_CANDIDATES:
+            if candidate in self.files:
+                return candidate
+        for pf in self.python_files():
+            if pf.has_main_guard():
+                return pf.name
+        for pf in self.python_files():
+            return pf.name
+        return None
+
+
+def files_hash(files: Dict[str, str]) -> str:
+    """Hash of a whole file set, independent of dict order."""
+    digest = hashlib.sha256()
+    for name in sorted(files):
+        digest.update(name.encode("utf-8") + b"\0")
+        digest.update(content_hash(files[name]).encode("ascii") + b"\0")
+    return digest.hexdigest()
+
+
+def parse_files(files: Dict[str, str]) -> ParsedCodeSet:
+    """
+    Parsed view of a file set, reused while the files are unchanged.
+    """
+    key = files_hash(files)
+    return _cached(_set_cache, _set_cache_lock, key, MAX_CACHED_SETS, lambda: ParsedCodeSet(files))
+
+
+def _parsed_file(name: str, source: str) -> ParsedFile:
+    key = name + ":" + content_hash(source)
+    return _cached(_file_cache, _file_cache_lock, key, MAX_CACHED_FILES, lambda: ParsedFile(name, source))
+
+
+def _cached(cache: OrderedDict, lock: threading.Lock, key: str, max_entries: int, build):
+    with lock:
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+            return value
+    value = build()
+    with lock:
+        # Another thread may have built it meanwhile: keep one instance
+        value = cache.setdefault(key, value)
+        cache.move_to_end(key)
+        while len(cache) > max_entries:
+            cache.popitem(last=False)
+    return value
@@ -0,0 +1,95 @@
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+class LRUStore:
+    """
+    Key -> JSON-serializable value, shared by the agents' caches and
+    example stores.
+
+    - In-memory when `path` is None, otherwise persisted as a JSON object
+      (rewritten atomically on every change)
+    - Least-recently-used entries are evicted beyond `max_entries`
+    - Tracks hits/misses for hit-rate reporting
+    - Safe to use from several threads
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 256):
+        self.path = Path(path) if path else None
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._load()
+
+    def get(self, key: str) -> Optional[Any]:
+        """The value for `key`, now most recently used; None if absent."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return value
+
+    def peek(self, key: str) -> Optional[Any]:
+        """Like get, but neither counted nor marked as used."""
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, key: str, value: Any):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._evict()
+            self._save()
+
+    def values(self) -> List[Any]:
+        """All values, least recently used first."""
+        with self._lock:
+            return list(self._entries.values())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+    # ----------------- Persistence -----------------
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _load(self):
+        if not self.path or not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            # A corrupt store file is treated as empty
+            return
+        if isinstance(data, dict):
+            self._entries.update(data)
+            self._evict()
+
+    def _save(self):
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f)
+        tmp.replace(self.path)
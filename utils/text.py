@@ -0,0 +1,75 @@
+import re
+from typing import List
+
+
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "to", "of", "for", "with", "in", "on",
+    "is", "it", "be", "can", "should", "that", "this", "me", "my", "i",
+    "please", "create", "make", "build", "write", "simple", "basic",
+    "app", "application", "program", "python", "using", "where", "which"
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase alphanumeric words in order of appearance."""
+    return re.findall(r"[a-z0-9]+", text.lower())
+
+
+def normalize_request(text: str) -> str:
+    """
+    Canonical form of a user request: case, punctuation, whitespace and
+    stopwords removed, so "Create a simple Calculator!" and
+    "calculator app" normalize to the same string.
+    """
+    words = [w for w in tokenize(text) if w not in STOPWORDS]
+    return " ".join(words)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count for budgeting prompts (~4 characters per token for
+    the local models we run). Cheap enough to call on every prompt piece.
+    """
+    return max(1, (len(text) + 3) // 4) if text else 0
+
+
+_STEM_SUFFIXES = ("ation", "ing", "ed", "er", "ly")
+_SIBILANT_ENDINGS = ("ss", "sh", "ch", "x")
+
+
+def split_identifier(identifier: str) -> List[str]:
+    """
+    Split snake_case and camelCase identifiers into lowercase words:
+    "addTask" and "add_task" both give ["add", "task"].
+    """
+    spaced = re.sub(r"([a-z0-9])([A-Z])", r"\1 \2", identifier)
+    return [w.lower() for w in re.split(r"[^A-Za-z0-9]+", spaced) if w]
+
+
+def stem(word: str) -> str:
+    """
+    Light suffix-stripping stemmer, enough to match "tasks"/"task",
+    "guesses"/"guess" and "removes"/"removed"/"remove" without a language
+    model. Plurals are reduced first, so a word and its plural always get
+    the same stem.
+    """
+    word = _singular(word)
+    for suffix in _STEM_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)]
+            break
+    if len(word) > 4 and word.endswith("e"):
+        word = word[:-1]
+    return word
+
+
+def _singular(word: str) -> str:
+    if len(word) < 4 or not word.endswith("s"):
+        return word
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-3] + "y"
+    if word.endswith("es") and word[:-2].endswith(_SIBILANT_ENDINGS):
+        return word[:-2]
+    if word.endswith(("ss", "us", "is")):
+        return word
+    return word[:-1]